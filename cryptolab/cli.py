@@ -0,0 +1,685 @@
+"""
+The cryptolab command line, run as `python -m cryptolab` or `cryptolab`.
+
+Every cipher is a subcommand, alongside `crack` and `analysis`. Each takes any
+number of input files or glob patterns (stdin if none, or "-") and processes
+them one at a time, or with a pool of worker processes (`--workers`). Results
+are written in input order, or as soon as they are done (`--unordered`), as
+plain text or as JSON lines (`--json`).
+
+Nothing but the argument parser is imported up front: a cipher module is
+imported when its subcommand runs, and the scoring models are loaded when a
+cracker first scores text, so `--help` and the ciphers start fast.
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser, Namespace, RawDescriptionHelpFormatter
+from collections.abc import Callable, Generator, Iterable, Iterator
+from dataclasses import dataclass
+from glob import glob
+from importlib import import_module
+from typing import IO, Any, AnyStr, TextIO
+
+# Module implementing each cipher subcommand
+CIPHERS = {
+    "affine": "cryptolab.substitution.affine",
+    "atbash": "cryptolab.substitution.atbash",
+    "caesar": "cryptolab.substitution.caesar",
+    "checkerboard": "cryptolab.substitution.straddling_checkerboard",
+    "columnar": "cryptolab.transposition.columnar",
+    "otp": "cryptolab.substitution.one_time_pad",
+    "rot13": "cryptolab.substitution.rot13",
+    "simple": "cryptolab.substitution.simple",
+    "vigenere": "cryptolab.substitution.vigenere",
+}
+
+# Cipher subcommands that only work on text, not bytes
+TEXT_CIPHERS = ("checkerboard",)
+
+# Ciphers that `crack` supports
+CRACKERS = ("affine", "caesar", "checkerboard", "columnar", "simple", "vigenere")
+
+# Crackers that score by their own models, so take no `--score`
+UNSCORED_CRACKERS = ("checkerboard", "columnar")
+
+# Module and function of each score accepted by `crack --score`
+SCORES = {
+    "monogram": ("cryptolab.scoring.ngram", "monogram_score"),
+    "bigram": ("cryptolab.scoring.ngram", "bigram_score"),
+    "trigram": ("cryptolab.scoring.ngram", "trigram_score"),
+    "quadgram": ("cryptolab.scoring.ngram", "quadgram_score"),
+    "quintgram": ("cryptolab.scoring.ngram", "quintgram_score"),
+    "word": ("cryptolab.scoring.words", "word_score"),
+}
+
+# Name of stdin in results
+STDIN = "-"
+
+
+@dataclass(frozen=True)
+class Job:
+    """
+    One input to process, in a form that can be sent to a worker process.
+
+    Parameters
+    ----------
+    command : str
+        The subcommand: a cipher, "crack" or "analysis".
+
+    input : str
+        Path to the input file, or STDIN.
+
+    options : dict[str, Any]
+        The options of the subcommand.
+    """
+
+    command: str
+    input: str
+    options: dict[str, Any]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Parse the command line arguments and run the subcommand on every input.
+
+    Parameters
+    ----------
+    argv : list[str] | None, default=None
+        The arguments. If None, uses sys.argv.
+
+    Returns
+    -------
+    int
+        Return code. 1 if any input failed; 0 on success.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "crack" and args.score and args.cipher in UNSCORED_CRACKERS:
+        parser.error(f"--score is not supported when cracking {args.cipher}")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+
+    try:
+        jobs = make_jobs(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if len(jobs) == 1 and jobs[0].command in CIPHERS and not args.json:
+        return stream_job(jobs[0])
+
+    ok = True
+    next_offset = getattr(args, "next_offset", None)
+    for result in run_all(jobs, workers=args.workers, ordered=not args.unordered):
+        ok &= "error" not in result
+        write_result(result, json_lines=args.json, header=len(jobs) > 1)
+        if len(jobs) == 1:
+            next_offset = result.get("next_offset")
+
+    if next_offset is not None:
+        print(f"pad offset: {next_offset}", file=sys.stderr)
+
+    return 0 if ok else 1
+
+
+def build_parser() -> ArgumentParser:
+    """
+    Build the parser of the command line arguments. The parser produces a
+    namespace suitable for make_jobs.
+
+    Returns
+    -------
+    ArgumentParser
+        The parser.
+    """
+    parser = ArgumentParser(
+        prog="cryptolab",
+        formatter_class=RawDescriptionHelpFormatter,
+        description=__doc__,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sub = commands.add_parser("affine", help="affine cipher")
+    sub.add_argument(
+        "key",
+        type=int,
+        nargs=2,
+        metavar=("a", "b"),
+        help="the key coefficients such that (a*x + b) %% 26",
+    )
+    add_cipher_arguments(sub)
+
+    add_cipher_arguments(commands.add_parser("atbash", help="Atbash cipher"))
+
+    sub = commands.add_parser("caesar", help="Caesar cipher")
+    sub.add_argument("key", type=int, help="the shift")
+    add_cipher_arguments(sub)
+
+    sub = commands.add_parser("checkerboard", help="straddling checkerboard")
+    sub.add_argument("digits", help="the two row digits, e.g. 14")
+    sub.add_argument("key", help="the 28 symbols of the board, in board order")
+    sub.add_argument(
+        "--digit-escape",
+        default="single",
+        help="how digits are escaped [default: %(default)s]",
+    )
+    add_cipher_arguments(sub)
+
+    sub = commands.add_parser("columnar", help="columnar transposition")
+    sub.add_argument("key", help="the keyword that orders the columns")
+    add_cipher_arguments(sub)
+
+    sub = commands.add_parser("otp", help="one-time pad")
+    sub.add_argument("key", metavar="pad", help="the pad file, one shift per byte")
+    sub.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="position of the first unused shift of the pad [default: %(default)s]",
+    )
+    add_cipher_arguments(sub)
+
+    add_cipher_arguments(commands.add_parser("rot13", help="ROT13"))
+
+    sub = commands.add_parser("simple", help="keyed alphabet")
+    sub.add_argument("key", help="the keyword of the cipher alphabet")
+    add_cipher_arguments(sub)
+
+    sub = commands.add_parser("vigenere", help="Vigenère cipher")
+    sub.add_argument("key", help="the keyword")
+    add_cipher_arguments(sub)
+
+    sub = commands.add_parser("crack", help="find the key and plaintext")
+    sub.add_argument("cipher", choices=CRACKERS, help="the cipher to crack")
+    sub.add_argument(
+        "--score",
+        choices=list(SCORES),
+        default=None,
+        help="the score of candidate plaintexts [default: the cipher's own]",
+    )
+    sub.add_argument(
+        "--max-period",
+        type=int,
+        default=None,
+        help="longest Vigenère key to try [default: 100, fewer on short texts]",
+    )
+    sub.add_argument(
+        "--max-width",
+        type=int,
+        default=20,
+        help="widest columnar key to try [default: %(default)s]",
+    )
+    sub.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="seed of the checkerboard, columnar and simple searches [default: random]",
+    )
+    sub.add_argument(
+        "--digit-escape",
+        default="single",
+        help="how checkerboard digits are escaped [default: %(default)s]",
+    )
+    add_input_arguments(sub)
+
+    sub = commands.add_parser("analysis", help="letter statistics of the text")
+    sub.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="number of autocorrelation shifts to report [default: %(default)s]",
+    )
+    add_input_arguments(sub)
+
+    return parser
+
+
+def add_input_arguments(parser: ArgumentParser):
+    """
+    Add the inputs, and the options of how they are processed, to the parser
+    of a subcommand. They come after the subcommand's own positionals.
+
+    Parameters
+    ----------
+    parser : ArgumentParser
+        The parser of the subcommand.
+    """
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        metavar="input",
+        help="text files or glob patterns to process, - for stdin [default: stdin]",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes, 0 for one per CPU [default: %(default)s]",
+    )
+    parser.add_argument(
+        "-u",
+        "--unordered",
+        action="store_true",
+        help="write results as they finish instead of in input order",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="write one JSON object per input",
+    )
+
+
+def add_cipher_arguments(parser: ArgumentParser):
+    """
+    Add the inputs and the encrypt/decrypt options to the parser of a cipher
+    subcommand.
+
+    Parameters
+    ----------
+    parser : ArgumentParser
+        The parser of the subcommand.
+    """
+    parser.add_argument(
+        "-d",
+        "--decrypt",
+        action="store_true",
+        help="decrypt the text [default: encrypt]",
+    )
+    parser.add_argument(
+        "-p",
+        "--preserve",
+        action="store_true",
+        help="preserve non-alphabeticals in the output",
+    )
+    add_input_arguments(parser)
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[str]:
+    """
+    Expand glob patterns into the files they match.
+
+    Parameters
+    ----------
+    patterns : Iterable[str]
+        The file names, glob patterns (** matches directories recursively) or
+        STDIN.
+
+    Returns
+    -------
+    list[str]
+        The files, in sorted order per pattern. A pattern that matches
+        nothing is kept as is, so it is reported as a missing file.
+    """
+    out: list[str] = []
+    for pattern in patterns:
+        if pattern == STDIN:
+            out.append(pattern)
+        else:
+            out.extend(sorted(glob(pattern, recursive=True)) or [pattern])
+
+    return out
+
+
+def make_jobs(args: Namespace) -> list[Job]:
+    """
+    Make one job per input of the parsed arguments.
+
+    Several one-time pad inputs are given consecutive windows of the pad, so
+    no two of them share a shift; the offset after the last one is stored in
+    args.next_offset.
+
+    Parameters
+    ----------
+    args : Namespace
+        The parsed arguments, see build_parser.
+
+    Raises
+    ------
+    ValueError
+        If stdin is one of several one-time pad inputs, as its window cannot
+        be sized in advance.
+
+    OSError
+        If a one-time pad input cannot be read to size its window.
+
+    Returns
+    -------
+    list[Job]
+        The jobs.
+    """
+    common = {"inputs", "workers", "unordered", "json", "command"}
+    options = {k: v for k, v in vars(args).items() if k not in common}
+    inputs = expand_inputs(args.inputs) or [STDIN]
+
+    if args.command != "otp":
+        return [Job(args.command, i, options) for i in inputs]
+
+    if len(inputs) == 1:
+        return [Job(args.command, inputs[0], options)]
+
+    if STDIN in inputs:
+        raise ValueError("stdin cannot share a pad with other inputs")
+
+    from cryptolab.substitution.polyalphabetic import count_letters
+    from cryptolab.utils.streaming import read_chunks
+
+    jobs: list[Job] = []
+    offset = args.offset
+    for i in inputs:
+        jobs.append(Job(args.command, i, options | {"offset": offset}))
+        with open(i, "r") as f:
+            offset += sum(map(count_letters, read_chunks(f)))
+
+    args.next_offset = offset
+    return jobs
+
+
+def cipher_chunks(
+    command: str, options: dict[str, Any], file: IO[AnyStr]
+) -> Generator[AnyStr, None, int | None]:
+    """
+    Encrypt or decrypt a file with a cipher subcommand.
+
+    Parameters
+    ----------
+    command : str
+        The cipher subcommand.
+
+    options : dict[str, Any]
+        The options of the subcommand.
+
+    file : IO[AnyStr]
+        The file to read, in text or binary mode.
+
+    Returns
+    -------
+    Generator[AnyStr, None, int | None]
+        The output chunks. Ciphers without streams give one chunk. For the
+        one-time pad, the generator returns the offset of the pad after the
+        input, i.e. where the next message must start; otherwise None.
+    """
+    module = import_module(CIPHERS[command])
+    decrypt = options["decrypt"]
+
+    match command:
+        case "checkerboard":
+            board = module.Board(tuple(options["digits"]), keyword=options["key"])
+            cipher = module.decrypt if decrypt else module.encrypt
+            yield cipher(file.read(), board, digit_escape=options["digit_escape"])
+            return None
+        case "columnar":
+            from cryptolab.utils.sequencing import sequence
+
+            cipher = module.decrypt if decrypt else module.encrypt
+            yield cipher(sequence(options["key"].upper()), file.read())
+            return None
+        case "affine":
+            key = (tuple(options["key"]),)
+        case "caesar" | "simple":
+            key = (options["key"],)
+        case "vigenere":
+            from cryptolab.utils.keys import keyword
+
+            key = (keyword(options["key"].upper()),)
+        case "otp":
+            pad = module.Pad.open(options["key"], offset=options["offset"])
+            key = (pad,)
+        case _:
+            key = ()
+
+    stream = module.decrypt_stream if decrypt else module.encrypt_stream
+    try:
+        yield from stream(file, *key, preserve_nonalpha=options["preserve"])
+    finally:
+        if command == "otp":
+            pad.close()
+
+    return pad.offset if command == "otp" else None
+
+
+def drain(
+    chunks: Generator[AnyStr, None, int | None], write: Callable[[AnyStr], Any]
+) -> int | None:
+    """
+    Write every chunk of a cipher_chunks generator.
+
+    Parameters
+    ----------
+    chunks : Generator[AnyStr, None, int | None]
+        The chunks, see cipher_chunks.
+
+    write : Callable[[AnyStr], Any]
+        The function to write a chunk with.
+
+    Returns
+    -------
+    int | None
+        The return value of the generator.
+    """
+    while True:
+        try:
+            write(next(chunks))
+        except StopIteration as stop:
+            return stop.value
+
+
+def crack(options: dict[str, Any], file: TextIO) -> dict[str, Any]:
+    """
+    Crack a file.
+
+    Parameters
+    ----------
+    options : dict[str, Any]
+        The options of the crack subcommand.
+
+    file : TextIO
+        The text file to read.
+
+    Returns
+    -------
+    dict[str, Any]
+        The key and the plaintext.
+    """
+    cipher = options["cipher"]
+    module = import_module(CIPHERS[cipher])
+    kwargs: dict[str, Any] = {}
+
+    if cipher == "checkerboard":
+        kwargs = {"digit_escape": options["digit_escape"], "rng": options["seed"]}
+    elif cipher == "columnar":
+        # the columnar search scores by ngram tables, not a score function
+        kwargs = {"max_width": options["max_width"], "rng": options["seed"]}
+    elif options["score"] is not None:
+        score_module, name = SCORES[options["score"]]
+        kwargs["score"] = getattr(import_module(score_module), name)
+
+    if cipher == "vigenere":
+        kwargs["max_period"] = options["max_period"]
+    elif cipher == "simple":
+        kwargs["rng"] = options["seed"]
+
+    plaintext, key = module.crack(file.read(), **kwargs)
+    if cipher == "checkerboard":
+        key = str(key)
+
+    return {"key": key, "output": plaintext}
+
+
+def analysis(options: dict[str, Any], file: TextIO) -> dict[str, Any]:
+    """
+    Compute the letter statistics of a file.
+
+    Parameters
+    ----------
+    options : dict[str, Any]
+        The options of the analysis subcommand.
+
+    file : TextIO
+        The text file to read.
+
+    Returns
+    -------
+    dict[str, Any]
+        The statistics.
+    """
+    from cryptolab.utils import analysis as stats
+
+    text = file.read()
+    return {
+        "length": len(text),
+        "index_of_coincidence": stats.index_of_coincidence(text),
+        "entropy": stats.entropy(text),
+        "chi_squared": stats.chi_squared(text),
+        "autocorrelation": stats.autocorrelation(text, options["top"]),
+    }
+
+
+def run(job: Job) -> dict[str, Any]:
+    """
+    Run a job. Runs in a worker process when there is a pool.
+
+    Parameters
+    ----------
+    job : Job
+        The job to run.
+
+    Returns
+    -------
+    dict[str, Any]
+        The input and the result fields, or the input and an "error" field
+        with the message of the I/O, decoding or value error that failed the
+        job.
+    """
+    try:
+        with open(job.input, "r") if job.input != STDIN else sys.stdin as f:
+            if job.command == "crack":
+                result = crack(job.options, f)
+            elif job.command == "analysis":
+                result = analysis(job.options, f)
+            else:
+                chunks: list[str] = []
+                offset = drain(
+                    cipher_chunks(job.command, job.options, f), chunks.append
+                )
+                result = {"output": "".join(chunks)}
+                if offset is not None:
+                    result["next_offset"] = offset
+    except (OSError, ValueError, UnicodeError) as e:
+        return {"input": job.input, "error": str(e)}
+
+    return {"input": job.input} | result
+
+
+def run_all(
+    jobs: list[Job], *, workers: int = 1, ordered: bool = True
+) -> Iterator[dict[str, Any]]:
+    """
+    Run the jobs, with a pool of worker processes if workers > 1.
+
+    Parameters
+    ----------
+    jobs : list[Job]
+        The jobs to run.
+
+    workers : int, default=1
+        The number of worker processes.
+
+    ordered : bool, default=True
+        Whether to yield the results in job order. If False, they are
+        yielded as they finish.
+
+    Returns
+    -------
+    Iterator[dict[str, Any]]
+        The results, see run.
+    """
+    if workers <= 1 or len(jobs) <= 1 or any(j.input == STDIN for j in jobs):
+        yield from map(run, jobs)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+        if ordered:
+            yield from pool.map(run, jobs)
+        else:
+            for future in as_completed([pool.submit(run, j) for j in jobs]):
+                yield future.result()
+
+
+def stream_job(job: Job) -> int:
+    """
+    Run a cipher job, writing its output to stdout as it is produced, so
+    arbitrarily large inputs use constant memory. The input is read and
+    enciphered as bytes, without decoding, unless the cipher only works on
+    text.
+
+    Parameters
+    ----------
+    job : Job
+        The cipher job.
+
+    Returns
+    -------
+    int
+        Return code. 1 if an I/O, decoding or value error occurred; 0 on
+        success.
+    """
+    text = job.command in TEXT_CIPHERS
+    stdin = sys.stdin if text else sys.stdin.buffer
+    stdout = sys.stdout if text else sys.stdout.buffer
+
+    try:
+        with (
+            open(job.input, "r" if text else "rb") if job.input != STDIN else stdin as f
+        ):
+            offset = drain(cipher_chunks(job.command, job.options, f), stdout.write)
+            stdout.write("\n" if text else b"\n")
+    except (OSError, ValueError, UnicodeError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if offset is not None:
+        stdout.flush()
+        print(f"pad offset: {offset}", file=sys.stderr)
+
+    return 0
+
+
+def write_result(result: dict[str, Any], *, json_lines: bool, header: bool):
+    """
+    Write a result to stdout, or its error to stderr.
+
+    Parameters
+    ----------
+    result : dict[str, Any]
+        The result, see run.
+
+    json_lines : bool
+        Whether to write the result as a line of JSON. Errors are then
+        written to stdout too.
+
+    header : bool
+        Whether to write a header naming the input before a plain result.
+    """
+    if json_lines:
+        print(json.dumps(result), flush=True)
+        return
+
+    if "error" in result:
+        print(f"{result['input']}: {result['error']}", file=sys.stderr)
+        return
+
+    if header:
+        print(f"==> {result['input']} <==")
+
+    for k, v in result.items():
+        if k not in ("input", "output", "next_offset"):
+            print(f"{k}: {v}")
+
+    if "output" in result:
+        print(result["output"])
+
+    sys.stdout.flush()
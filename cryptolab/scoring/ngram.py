@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from importlib.resources import files
+from itertools import repeat
 from math import log10
 from threading import Lock
 
@@ -59,6 +60,21 @@ class _NgramScorer:
             self._floor = log10(0.01 / n)
             self._loaded = True
 
+    def table(self) -> tuple[dict[str, float], float]:
+        """
+        Get the log probabilities of the ngram data.
+
+        Returns
+        -------
+        tuple[dict[str, float], float]
+            The mapping of each ngram to its log10 probability, and the floor
+            score of ngrams not in the data.
+        """
+        if not self._loaded:
+            self._load_data()
+
+        return self._data, self._floor
+
     def score(self, text: str) -> float:
         """
         Score the text using the ngram data.
@@ -76,12 +92,17 @@ class _NgramScorer:
         if not self._loaded:
             self._load_data()
 
-        total = 0.0
-        for i in range(len(text) - self._ngram_len + 1):
-            ngram = text[i : i + self._ngram_len]
-            total += self._data.get(ngram.upper(), self._floor)
+        # the ngrams are read off shifted copies of the text and looked up by
+        # map, so there is no Python-level loop over the text
+        n = self._ngram_len
+        if text.isascii():
+            text = text.upper()
+            ngrams = map("".join, zip(*(text[i:] for i in range(n))))
+        else:
+            # upper may change the length of non-ASCII text, so upper each ngram
+            ngrams = map(str.upper, map("".join, zip(*(text[i:] for i in range(n)))))
 
-        return total
+        return sum(map(self._data.get, ngrams, repeat(self._floor)), 0.0)
 
 
 _monogram = _NgramScorer("english_monograms.txt")
@@ -91,6 +112,43 @@ _quadgram = _NgramScorer("english_quadgrams.txt")
 _quintgram = _NgramScorer("english_quintgrams.txt")
 
 
+def ngram_table(n: int) -> tuple[dict[str, float], float]:
+    """
+    Get the log probabilities of the ngram data of the given length.
+
+    Scoring from the table lets callers that already have ngram counts skip
+    the pass over the text, since the score of a text is the sum over its
+    ngrams of count * log probability.
+
+    Parameters
+    ----------
+    n : int
+        The ngram length, 1 to 5.
+
+    Raises
+    ------
+    ValueError
+        If there is no ngram data of the given length.
+
+    Returns
+    -------
+    tuple[dict[str, float], float]
+        The mapping of each ngram to its log10 probability, and the floor
+        score of ngrams not in the data.
+
+    Examples
+    --------
+    >>> data, floor = ngram_table(1)
+    >>> round(data["E"], 3)
+    -0.917
+    """
+    scorers = (_monogram, _bigram, _trigram, _quadgram, _quintgram)
+    if not 1 <= n <= len(scorers):
+        raise ValueError(f"no ngram data of length {n}")
+
+    return scorers[n - 1].table()
+
+
 def monogram_score(text: str) -> float:
     """
     Score the text using monogram data.
@@ -0,0 +1,254 @@
+"""
+Word-pattern index for cracking substitution ciphers.
+
+A monoalphabetic substitution keeps the pattern of repeated letters in a
+word: "HELLO" and its encryption "XFQQZ" both have the pattern "ABCCD". The
+index maps every pattern to the dictionary words that have it, so the
+candidates for a ciphertext word are found with one lookup.
+
+The index is built from the first-order word frequency data the first time
+it is needed, and cached on disk under $XDG_CACHE_HOME/cryptolab (default
+~/.cache/cryptolab), keyed by a hash of the data, so later runs only load it.
+"""
+
+import json
+import os
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from hashlib import sha256
+from importlib.resources import files
+from pathlib import Path
+from string import ascii_uppercase
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+
+def word_pattern(word: str) -> str:
+    """
+    Get the pattern of repeated letters of a word.
+
+    Parameters
+    ----------
+    word : str
+        The word, case-insensitive.
+
+    Returns
+    -------
+    str
+        The word with its first distinct letter replaced by A, its second by
+        B, and so on.
+
+    Examples
+    --------
+    >>> word_pattern("hello")
+    'ABCCD'
+
+    >>> word_pattern("XFQQZ")
+    'ABCCD'
+    """
+    letters: dict[str, str] = {}
+    for c in word.upper():
+        letters.setdefault(c, ascii_uppercase[len(letters) % 26])
+
+    return "".join(letters[c] for c in word.upper())
+
+
+def cache_dir() -> Path:
+    """
+    Get the directory that cryptolab caches derived data in.
+
+    Returns
+    -------
+    Path
+        $XDG_CACHE_HOME/cryptolab, or ~/.cache/cryptolab if XDG_CACHE_HOME is
+        not set.
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "cryptolab"
+
+
+@dataclass(slots=True)
+class _PatternIndex:
+    """
+    Lazy loading word-pattern index data class.
+
+    Parameters
+    ----------
+    file_name : str
+        The file name of the word frequency data, one "word<TAB>count" line
+        per word.
+    """
+
+    _file_name: str
+    _loaded: bool = False
+    _lock: Lock = Lock()
+
+    # pattern -> words with that pattern, most frequent first
+    _data: dict[str, list[str]] = field(default_factory=dict[str, list[str]])
+
+    def _load_data(
+        self,
+        *,
+        module: str = "cryptolab.scoring.data",
+    ):
+        """
+        Load the index from the disk cache, or build it from the word
+        frequency data and cache it.
+
+        Parameters
+        ----------
+        module : str,default="cryptolab.scoring.data"
+            The module to find the data file.
+        """
+        with self._lock:
+            if self._loaded:
+                return
+
+            source = (files(module) / self._file_name).read_bytes()
+            digest = sha256(source).hexdigest()[:16]
+            path = cache_dir() / f"patterns-{digest}.json"
+
+            try:
+                self._data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                self._data = self._build(source.decode().splitlines())
+                self._write_cache(path)
+
+            self._loaded = True
+
+    def _build(self, lines: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Build the index from word frequency lines.
+
+        Parameters
+        ----------
+        lines : Iterable[str]
+            The "word<TAB>count" lines, most frequent first.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            The index.
+        """
+        index: dict[str, list[str]] = {}
+        seen: set[str] = set()
+        for line in lines:
+            word = line.split("\t", 1)[0].upper()
+            if word.isascii() and word.isalpha() and word not in seen:
+                seen.add(word)
+                index.setdefault(word_pattern(word), []).append(word)
+
+        return index
+
+    def _write_cache(self, path: Path):
+        """
+        Write the index to the cache file, atomically. Failures are ignored,
+        as the cache is only an optimization.
+
+        Parameters
+        ----------
+        path : Path
+            The cache file.
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile("w", dir=path.parent, delete=False) as f:
+                json.dump(self._data, f)
+            os.replace(f.name, path)
+        except OSError:
+            pass
+
+    def matches(self, word: str) -> list[str]:
+        """
+        Get the dictionary words with the same pattern as the word.
+
+        Parameters
+        ----------
+        word : str
+            The word, e.g. a ciphertext word.
+
+        Returns
+        -------
+        list[str]
+            The uppercase dictionary words, most frequent first. The list is
+            shared, and must not be modified.
+        """
+        if not self._loaded:
+            self._load_data()
+
+        return self._data.get(word_pattern(word), [])
+
+
+_index = _PatternIndex("count_1w.txt")
+
+
+def pattern_matches(word: str, *, limit: int | None = None) -> list[str]:
+    """
+    Get the dictionary words with the same pattern as the word.
+
+    Parameters
+    ----------
+    word : str
+        The word, e.g. a ciphertext word.
+
+    limit : int | None, default=None
+        The maximum number of words to return. If None, returns every match.
+
+    Returns
+    -------
+    list[str]
+        The uppercase dictionary words, most frequent first.
+    """
+    return _index.matches(word)[:limit]
+
+
+def letter_candidates(
+    words: Iterable[str], *, limit: int | None = 1000
+) -> dict[str, set[str]]:
+    """
+    Find the plaintext letters that each ciphertext letter can stand for,
+    given the ciphertext words of a monoalphabetic substitution.
+
+    Each word votes for the letters its letters can stand for, i.e. the
+    letters at the same places of its pattern matches. A letter's candidates
+    are the letters with the most votes, which are the letters allowed by
+    every word it occurs in unless some word has no true match in the
+    dictionary. When a letter is left with a single candidate, that candidate
+    is ruled out for every other letter, repeatedly.
+
+    Parameters
+    ----------
+    words : Iterable[str]
+        The ciphertext words, case-insensitive. Each is counted once.
+
+    limit : int | None, default=1000
+        The number of most frequent matches of each word to consider. Rare
+        words mostly add noise. If None, considers every match.
+
+    Returns
+    -------
+    dict[str, set[str]]
+        The uppercase candidates of each uppercase ciphertext letter that
+        occurs in a word with a match. Words without any match, e.g. names,
+        are ignored.
+    """
+    votes: dict[str, Counter[str]] = {}
+    for word in {w.upper() for w in words}:
+        matches = pattern_matches(word, limit=limit)
+        for i, c in enumerate(word):
+            if matches and word.index(c) == i:
+                votes.setdefault(c, Counter()).update({m[i] for m in matches})
+
+    candidates = {
+        c: {p for p, n in v.items() if n == max(v.values())} for c, v in votes.items()
+    }
+
+    solved: set[str] = set()
+    while new := {c for c, p in candidates.items() if len(p) == 1} - solved:
+        solved |= new
+        for c in new:
+            for other in candidates.keys() - solved:
+                candidates[other] -= candidates[c]
+
+    return candidates
@@ -4,11 +4,20 @@ https://en.wikipedia.org/wiki/Affine_cipher
 
 import sys
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from string import ascii_uppercase
 from textwrap import dedent
-from typing import Callable, Iterator
+from typing import AnyStr, Callable, Literal
 
-from cryptolab.scoring.ngram import monogram_score
+from cryptolab.scoring.ngram import monogram_score, ngram_table
+from cryptolab.substitution import monoalphabetic
+from cryptolab.utils.analysis import DEFAULT_FREQUENCIES, letter_counts
+from cryptolab.utils.buffers import Buffer
+from cryptolab.utils.streaming import Readable
+
+# The `a` coefficients coprime to 26
+COEFFICIENTS = (1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25)
 
 
 @dataclass
@@ -113,17 +122,13 @@ def execute(args: Arguments) -> int:
     int
         Return code. 1 if an error occurred; 0 on success.
     """
+    stream = decrypt_stream if args.decrypt else encrypt_stream
+
     try:
-        if args.input is not None:
-            with open(args.input, "r") as f:
-                text = f.read()
-        else:
-            text = sys.stdin.read()
-
-        if args.decrypt:
-            print(decrypt(text, args.key, preserve_nonalpha=args.preserve))
-        else:
-            print(encrypt(text, args.key, preserve_nonalpha=args.preserve))
+        with open(args.input, "r") if args.input is not None else sys.stdin as f:
+            for chunk in stream(f, args.key, preserve_nonalpha=args.preserve):
+                sys.stdout.write(chunk)
+            sys.stdout.write("\n")
     except Exception as e:
         print(e)
         return 1
@@ -131,6 +136,42 @@ def execute(args: Arguments) -> int:
     return 0
 
 
+def alphabet(key: tuple[int, int], *, decrypt: bool = False) -> str:
+    """
+    Get the cipher alphabet of the key, i.e. the letters that A-Z are
+    replaced with.
+
+    Parameters
+    ----------
+    key : tuple[int, int]
+        A tuple representing the (a, b) coefficients.
+
+    decrypt : bool, default=False
+        Whether to get the alphabet that decrypts instead.
+
+    Raises
+    ------
+    ValueError
+        If the `a` coefficient is not coprime to 26.
+
+    Returns
+    -------
+    str
+        The cipher alphabet.
+
+    Examples
+    --------
+    >>> alphabet((5, 8))
+    'INSXCHMRWBGLQVAFKPUZEJOTYD'
+    """
+    a, b = key
+    if a not in COEFFICIENTS:
+        raise ValueError("coefficient `a` must be coprime to 26")
+
+    enc = "".join(ascii_uppercase[(a * x + b) % 26] for x in range(26))
+    return monoalphabetic.invert(enc) if decrypt else enc
+
+
 def encrypt(
     plaintext: str,
     key: tuple[int, int],
@@ -165,24 +206,9 @@ def encrypt(
         The resultant ciphertext.
     """
 
-    a, b = key
-    if a not in (1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25):
-        raise ValueError("coefficient `a` must be coprime to 26")
-
-    ret = ""
-    for c in plaintext:
-        if not c.isalpha():
-            if preserve_nonalpha:
-                ret += c
-            continue
-
-        offset = ord("A") if c.isupper() else ord("a")
-
-        i = ord(c) - offset
-        new_i = (i * a + b) % 26
-        ret += chr(new_i + offset)
-
-    return ret
+    return monoalphabetic.substitute(
+        plaintext, alphabet(key), preserve_nonalpha=preserve_nonalpha
+    )
 
 
 def decrypt(
@@ -219,26 +245,156 @@ def decrypt(
     str
         The resultant plaintext.
     """
-    a, b = key
-    if a not in (1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25):
-        msg = "coefficient `a` must be coprime to 26"
-        raise ValueError(msg)
+    return monoalphabetic.substitute(
+        ciphertext, alphabet(key, decrypt=True), preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def encrypt_bytes(
+    plaintext: Buffer,
+    key: tuple[int, int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Encrypt the ASCII letters of the plaintext bytes using the affine cipher.
+
+    Parameters
+    ----------
+    plaintext : Buffer
+        The plaintext to encrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : tuple[int, int]
+        A tuple representing the (a, b) coefficients.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the ciphertext.
+
+    Raises
+    ------
+    ValueError
+        If the `a` coefficient is not coprime to 26.
+
+    Returns
+    -------
+    bytes
+        The resultant ciphertext.
+
+    Examples
+    --------
+    >>> encrypt_bytes(b"Attack at dawn!", (5, 8))
+    b'Izzisgizxiov'
+    """
+    return monoalphabetic.substitute_bytes(
+        plaintext, alphabet(key), preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def decrypt_bytes(
+    ciphertext: Buffer,
+    key: tuple[int, int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Decrypt the ASCII letters of the ciphertext bytes using the affine cipher.
+
+    Parameters
+    ----------
+    ciphertext : Buffer
+        The ciphertext to decrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : tuple[int, int]
+        A tuple representing the (a, b) coefficients.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the plaintext.
+
+    Raises
+    ------
+    ValueError
+        If the `a` coefficient is not coprime to 26.
+
+    Returns
+    -------
+    bytes
+        The resultant plaintext.
+    """
+    return monoalphabetic.substitute_bytes(
+        ciphertext, alphabet(key, decrypt=True), preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def encrypt_stream(
+    plaintext: Iterable[AnyStr] | Readable[AnyStr],
+    key: tuple[int, int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Encrypt a stream of plaintext using the affine cipher.
+
+    Parameters
+    ----------
+    plaintext : Iterable[AnyStr] | Readable[AnyStr]
+        The plaintext to encrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : tuple[int, int]
+        A tuple representing the (a, b) coefficients.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the ciphertext.
 
-    ret = ""
-    a_inv = pow(a, -1, 26)
+    Raises
+    ------
+    ValueError
+        If the `a` coefficient is not coprime to 26.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant ciphertext chunks.
+    """
+    return monoalphabetic.substitute_stream(
+        plaintext, alphabet(key), preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def decrypt_stream(
+    ciphertext: Iterable[AnyStr] | Readable[AnyStr],
+    key: tuple[int, int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Decrypt a stream of ciphertext using the affine cipher.
+
+    Parameters
+    ----------
+    ciphertext : Iterable[AnyStr] | Readable[AnyStr]
+        The ciphertext to decrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : tuple[int, int]
+        A tuple representing the (a, b) coefficients.
 
-    for c in ciphertext:
-        if not c.isalpha():
-            if preserve_nonalpha:
-                ret += c
-            continue
+    preserve_nonalpha : bool,default=False
+        Whether to preserve nonalphabetics in the output.
 
-        offset = ord("A") if c.isupper() else ord("a")
-        i = ord(c) - offset
-        new_i = (a_inv * (i - b)) % 26
-        ret += chr(new_i + offset)
+    Raises
+    ------
+    ValueError
+        If the `a` coefficient is not coprime to 26.
 
-    return ret
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant plaintext chunks.
+    """
+    return monoalphabetic.substitute_stream(
+        ciphertext, alphabet(key, decrypt=True), preserve_nonalpha=preserve_nonalpha
+    )
 
 
 def brute_force(ciphertext: str) -> Iterator[tuple[str, tuple[int, int]]]:
@@ -257,18 +413,135 @@ def brute_force(ciphertext: str) -> Iterator[tuple[str, tuple[int, int]]]:
         key. There are 312 possible decryptions.
     """
 
-    for a in (1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25):
+    for a in COEFFICIENTS:
         for b in range(26):
             key = (a, b)
             yield (decrypt(ciphertext, key), key)
 
 
+def rank_keys(
+    ciphertext: str,
+    *,
+    top: int = 312,
+    statistic: Literal["monogram", "chi_squared"] = "monogram",
+    coefficients: Iterable[int] = COEFFICIENTS,
+) -> list[tuple[tuple[int, int], float]]:
+    """
+    Rank the keys of the ciphertext without decrypting it.
+
+    Under a monogram model each key only permutes the ciphertext histogram:
+    plaintext letter p is encrypted as (a*p + b) % 26, so its count in the
+    decryption is the count of that ciphertext letter. Every key is scored
+    from one 26-bin histogram of the ciphertext, costing one counting pass
+    plus 26 operations per key, whatever the length of the ciphertext.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to rank the keys of.
+
+    top : int, default=312
+        The number of keys to return.
+
+    statistic : {"monogram", "chi_squared"}, default="monogram"
+        The statistic to rank by. "monogram" gives the same score as
+        monogram_score of the decryption. "chi_squared" gives the negated
+        chi-squared statistic against the English letter frequencies.
+
+    coefficients : Iterable[int], default=COEFFICIENTS
+        The `a` coefficients to rank the keys of.
+
+    Raises
+    ------
+    ValueError
+        If the statistic is unknown.
+
+    Returns
+    -------
+    list[tuple[tuple[int, int], float]]
+        The `top` best keys paired with their scores, best first. Higher
+        scores are better.
+
+    Examples
+    --------
+    >>> rank_keys("xchcvx zrc ciuz oill ah zrc siuzlc", top=1)[0][0]
+    (5, 8)
+    """
+    counts = letter_counts(ciphertext)
+
+    if statistic == "monogram":
+        data, floor = ngram_table(1)
+        logp = [data.get(c, floor) for c in ascii_uppercase]
+
+        def key_score(a: int, b: int) -> float:
+            """
+            Score a key by the monogram log probability of its decryption.
+
+            Parameters
+            ----------
+            a : int
+                The multiplicative coefficient of the key.
+
+            b : int
+                The additive coefficient of the key.
+
+            Returns
+            -------
+            float
+                The score. Higher is better.
+            """
+            return sum(counts[(a * p + b) % 26] * lp for p, lp in enumerate(logp))
+
+    elif statistic == "chi_squared":
+        total = sum(counts)
+        expected = [DEFAULT_FREQUENCIES[c] * total for c in ascii_uppercase]
+
+        def key_score(a: int, b: int) -> float:
+            """
+            Score a key by the negated chi-squared statistic of its decryption.
+
+            Parameters
+            ----------
+            a : int
+                The multiplicative coefficient of the key.
+
+            b : int
+                The additive coefficient of the key.
+
+            Returns
+            -------
+            float
+                The score. Higher is better.
+            """
+            return -sum(
+                (counts[(a * p + b) % 26] - e) ** 2 / e
+                for p, e in enumerate(expected)
+                if e > 0
+            )
+
+    else:
+        raise ValueError(f"unknown statistic {statistic!r}")
+
+    ranked = [((a, b), key_score(a, b)) for a in coefficients for b in range(26)]
+    ranked.sort(key=lambda ks: ks[1], reverse=True)
+    return ranked[:top]
+
+
 def crack(
-    ciphertext: str, *, score: Callable[[str], float] = monogram_score
+    ciphertext: str,
+    *,
+    score: Callable[[str], float] = monogram_score,
+    refine: Callable[[str], float] | None = None,
+    candidates: int = 10,
 ) -> tuple[str, tuple[int, int]]:
     """
     Crack the decryption of the ciphertext using the score function.
 
+    With the default monogram_score the keys are ranked from the ciphertext
+    histogram (see rank_keys) without decrypting. Any other score function is
+    applied to all 312 decryptions. With `refine`, the best `candidates` keys
+    by the score are then re-scored with it.
+
     Parameters
     ----------
     ciphertext : str
@@ -278,19 +551,38 @@ def crack(
         The score function which treats higher values as more likely to be a
         valid decryption.
 
+    refine : Callable[[str], float] | None, default=None
+        A second stage score function, e.g. quadgram_score. When given, the
+        best `candidates` keys by `score` are re-scored with it, and the best
+        of them by `refine` is returned.
+
+    candidates : int, default=10
+        The number of keys to re-score with `refine`.
+
     Returns
     -------
     tuple[str, tuple[int, int]]
         The best scoring decryption paired with its key.
-    """
-    top: tuple[str, tuple[int, int], float] = ("", (-1, -1), -float("inf"))
 
-    for text, key in brute_force(ciphertext):
-        sc = score(text)
-        if sc > top[2]:
-            top = (text, key, sc)
-
-    return top[0], top[1]
+    Examples
+    --------
+    >>> crack("xchcvx zrc ciuz oill ah zrc siuzlc")
+    ('defendtheeastwallofthecastle', (5, 8))
+    """
+    if score is monogram_score:
+        top = candidates if refine is not None else 1
+        ranked = [
+            (decrypt(ciphertext, key), key) for key, _ in rank_keys(ciphertext, top=top)
+        ]
+    else:
+        ranked = sorted(
+            brute_force(ciphertext), key=lambda tk: score(tk[0]), reverse=True
+        )
+
+    if refine is None:
+        return ranked[0]
+
+    return max(ranked[:candidates], key=lambda tk: refine(tk[0]))
 
 
 if __name__ == "__main__":
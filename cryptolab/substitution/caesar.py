@@ -2,10 +2,13 @@
 https://en.wikipedia.org/wiki/Caesar_cipher
 """
 
-from typing import Callable, Iterator
+from collections.abc import Iterable
+from typing import AnyStr, Callable, Iterator, Literal
 
 from cryptolab.scoring.ngram import monogram_score
 from cryptolab.substitution import affine
+from cryptolab.utils.buffers import Buffer
+from cryptolab.utils.streaming import Readable
 
 
 def encrypt(
@@ -73,6 +76,141 @@ def decrypt(ciphertext: str, key: int) -> str:
     return affine.decrypt(ciphertext, (1, key))
 
 
+def encrypt_bytes(
+    plaintext: Buffer,
+    key: int,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Encrypt the ASCII letters of the plaintext bytes using the Caesar cipher.
+
+    Parameters
+    ----------
+    plaintext : Buffer
+        The plaintext to encrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : int
+        The shift of the alphabet.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the ciphertext.
+
+    Returns
+    -------
+    bytes
+        The resultant ciphertext.
+
+    Examples
+    --------
+    >>> encrypt_bytes(b"Attack at dawn!", 3, preserve_nonalpha=True)
+    b'Dwwdfn dw gdzq!'
+    """
+    return affine.encrypt_bytes(
+        plaintext,
+        (1, key),
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
+def decrypt_bytes(
+    ciphertext: Buffer,
+    key: int,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Decrypt the ASCII letters of the ciphertext bytes using the Caesar cipher.
+
+    Parameters
+    ----------
+    ciphertext : Buffer
+        The ciphertext to decrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : int
+        The shift of the alphabet.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the plaintext.
+
+    Returns
+    -------
+    bytes
+        The resultant plaintext.
+    """
+    return affine.decrypt_bytes(
+        ciphertext,
+        (1, key),
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
+def encrypt_stream(
+    plaintext: Iterable[AnyStr] | Readable[AnyStr],
+    key: int,
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Encrypt a stream of plaintext using the Caesar cipher.
+
+    Parameters
+    ----------
+    plaintext : Iterable[AnyStr] | Readable[AnyStr]
+        The plaintext to encrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : int
+        The amount to shift each letter.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve non-alphebeticals in the ciphertext.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant ciphertext chunks.
+    """
+    return affine.encrypt_stream(
+        plaintext,
+        (1, key),
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
+def decrypt_stream(
+    ciphertext: Iterable[AnyStr] | Readable[AnyStr],
+    key: int,
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Decrypt a stream of ciphertext using the Caesar cipher.
+
+    Parameters
+    ----------
+    ciphertext : Iterable[AnyStr] | Readable[AnyStr]
+        The ciphertext to decipher, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : int
+        The amount to shift each letter.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve non-alphebeticals in the plaintext.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant plaintext chunks.
+    """
+    return affine.decrypt_stream(
+        ciphertext,
+        (1, key),
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
 def brute_force(ciphertext: str) -> Iterator[tuple[str, int]]:
     """
     Brute force decrypt the ciphertext.
@@ -92,18 +230,70 @@ def brute_force(ciphertext: str) -> Iterator[tuple[str, int]]:
         yield (decrypt(ciphertext, i), i)
 
 
+def rank_keys(
+    ciphertext: str,
+    *,
+    top: int = 26,
+    statistic: Literal["monogram", "chi_squared"] = "monogram",
+) -> list[tuple[int, float]]:
+    """
+    Rank the keys of the ciphertext without decrypting it.
+
+    Decrypting with key k maps letter x to (x - k) % 26, so each key's
+    statistic follows from one 26-bin histogram of the ciphertext rotated by
+    k. See affine.rank_keys.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to rank the keys of.
+
+    top : int, default=26
+        The number of keys to return.
+
+    statistic : {"monogram", "chi_squared"}, default="monogram"
+        The statistic to rank by. "monogram" gives the same score as
+        monogram_score of the decryption. "chi_squared" gives the negated
+        chi-squared statistic against the English letter frequencies.
+
+    Raises
+    ------
+    ValueError
+        If the statistic is unknown.
+
+    Returns
+    -------
+    list[tuple[int, float]]
+        The `top` best keys paired with their scores, best first. Higher
+        scores are better.
+
+    Examples
+    --------
+    >>> [key for key, _ in rank_keys("iq mdq pueoahqdqp rxqq mf azoq", top=3)]
+    [12, 23, 8]
+    """
+    ranked = affine.rank_keys(
+        ciphertext, top=top, statistic=statistic, coefficients=(1,)
+    )
+    return [(b, sc) for (_, b), sc in ranked]
+
+
 def crack(
     ciphertext: str, *, score: Callable[[str], float] = monogram_score
 ) -> tuple[str, int]:
     """
     Crack the decryption of the ciphertext using the score function.
 
+    With the default monogram_score the keys are ranked from the ciphertext
+    histogram (see rank_keys), and only the best key is decrypted. Any other
+    score function is applied to all 26 decryptions.
+
     Parameters
     ----------
     ciphertext : str
         The ciphertext to crack.
 
-    score : Callable[[str], float], default=chi_squared
+    score : Callable[[str], float], default=monogram_score
         The score function which treats higher values as more likely to be a
         valid decryption.
 
@@ -115,8 +305,12 @@ def crack(
     Examples
     --------
     >>> crack("iq mdq pueoahqdqp rxqq mf azoq")
-    'we are discovered flee at once'
+    ('wearediscoveredfleeatonce', 12)
     """
+    if score is monogram_score:
+        [(key, _)] = rank_keys(ciphertext, top=1)
+        return decrypt(ciphertext, key), key
+
     top: tuple[str, int, float] = ("", -1, -float("inf"))
 
     for text, key in brute_force(ciphertext):
@@ -144,6 +338,8 @@ if __name__ == "__main__":
     cracked = crack(enc)
     print(cracked, "\n")
 
+    print(rank_keys(enc, top=3), "\n")
+
     assert dec == plaintext
     assert dec == cracked[0]
     assert key == cracked[1]
@@ -0,0 +1,363 @@
+"""
+https://en.wikipedia.org/wiki/Substitution_cipher#Simple_substitution
+
+Compiled-key engine shared by the monoalphabetic ciphers (affine, Caesar,
+Atbash, ROT13 and simple substitution).
+
+Any monoalphabetic key is a cipher alphabet: the letter that each of A-Z is
+replaced with. The key is compiled once into a translation table covering
+both cases, which also deletes non-letters when they are not preserved, so a
+whole text is enciphered by a single `translate` call. Compiled tables are
+kept in an LRU cache, so keys that repeat in crack loops are only compiled
+once. Bytes are substituted the same way with a bytes table, without decoding
+to `str`.
+
+Only the ASCII letters A-Z and a-z are letters here; every other character is
+treated as a non-letter.
+"""
+
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from string import ascii_letters, ascii_lowercase, ascii_uppercase
+from typing import AnyStr
+
+from cryptolab.utils.buffers import Buffer, WritableBuffer, as_bytes, write_into
+from cryptolab.utils.streaming import Readable, iter_chunks
+
+# Every byte that is not an ASCII letter, for deletion with bytes.translate
+_NONLETTER_BYTES = bytes(
+    b for b in range(256) if b not in ascii_letters.encode("ascii")
+)
+
+
+class _DeletingTable(dict[int, int | None]):
+    """
+    Translation table that deletes every character it has no entry for.
+    """
+
+    def __missing__(self, key: int) -> None:
+        return None
+
+
+def check_alphabet(alphabet: str) -> str:
+    """
+    Check and normalize a cipher alphabet.
+
+    Parameters
+    ----------
+    alphabet : str
+        The cipher alphabet, case-insensitive.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z.
+
+    Returns
+    -------
+    str
+        The uppercase cipher alphabet.
+
+    Examples
+    --------
+    >>> check_alphabet("zyxwvutsrqponmlkjihgfedcba")
+    'ZYXWVUTSRQPONMLKJIHGFEDCBA'
+    """
+    upper = alphabet.upper()
+    if len(upper) != 26 or set(upper) != set(ascii_uppercase):
+        raise ValueError("alphabet must be a permutation of the letters A-Z")
+
+    return upper
+
+
+@lru_cache(maxsize=1024)
+def invert(alphabet: str) -> str:
+    """
+    Get the inverse of a cipher alphabet.
+
+    Parameters
+    ----------
+    alphabet : str
+        The cipher alphabet.
+
+    Returns
+    -------
+    str
+        The alphabet that undoes the substitution of the given one.
+
+    Examples
+    --------
+    >>> invert("BCDEFGHIJKLMNOPQRSTUVWXYZA")
+    'ZABCDEFGHIJKLMNOPQRSTUVWXY'
+    """
+    upper = alphabet.upper()
+    return "".join(ascii_uppercase[upper.index(c)] for c in ascii_uppercase)
+
+
+@lru_cache(maxsize=1024)
+def compile_key(
+    alphabet: str, *, preserve_nonalpha: bool = False
+) -> dict[int, int | None]:
+    """
+    Compile a cipher alphabet into a str.translate table.
+
+    Parameters
+    ----------
+    alphabet : str
+        The cipher alphabet, i.e. the letters that A-Z are replaced with.
+
+    preserve_nonalpha : bool, default=False
+        Whether the table keeps non-letters. If False they are deleted.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z.
+
+    Returns
+    -------
+    dict[int, int | None]
+        The translation table, mapping both cases of every letter.
+    """
+    upper = check_alphabet(alphabet)
+    table = str.maketrans(ascii_uppercase + ascii_lowercase, upper + upper.lower())
+    return table if preserve_nonalpha else _DeletingTable(table)
+
+
+@lru_cache(maxsize=1024)
+def compile_bytes_key(alphabet: str) -> bytes:
+    """
+    Compile a cipher alphabet into a bytes.translate table.
+
+    Parameters
+    ----------
+    alphabet : str
+        The cipher alphabet, i.e. the letters that A-Z are replaced with.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z.
+
+    Returns
+    -------
+    bytes
+        The 256 byte translation table, mapping both cases of every letter.
+    """
+    upper = check_alphabet(alphabet)
+    return bytes.maketrans(
+        (ascii_uppercase + ascii_lowercase).encode("ascii"),
+        (upper + upper.lower()).encode("ascii"),
+    )
+
+
+def substitute(
+    text: str,
+    alphabet: str,
+    *,
+    preserve_nonalpha: bool = False,
+) -> str:
+    """
+    Substitute the letters of the text using a cipher alphabet.
+
+    Parameters
+    ----------
+    text : str
+        The text to substitute.
+
+    alphabet : str
+        The cipher alphabet, i.e. the letters that A-Z are replaced with.
+        Case is preserved.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve non-alphabeticals in the output.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z.
+
+    Returns
+    -------
+    str
+        The substituted text.
+
+    Examples
+    --------
+    >>> substitute("Hello, world!", "DEFGHIJKLMNOPQRSTUVWXYZABC")
+    'Khoorzruog'
+
+    >>> substitute(
+    ...     "Hello, world!", "DEFGHIJKLMNOPQRSTUVWXYZABC", preserve_nonalpha=True
+    ... )
+    'Khoor, zruog!'
+    """
+    return text.translate(compile_key(alphabet, preserve_nonalpha=preserve_nonalpha))
+
+
+def substitute_stream(
+    source: Iterable[AnyStr] | Readable[AnyStr],
+    alphabet: str,
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Substitute the letters of a stream of text using a cipher alphabet.
+
+    Parameters
+    ----------
+    source : Iterable[AnyStr] | Readable[AnyStr]
+        The text, as an iterable of chunks or a file object. Bytes chunks,
+        e.g. from a file opened in binary mode, are substituted as bytes.
+
+    alphabet : str
+        The cipher alphabet, i.e. the letters that A-Z are replaced with.
+        Case is preserved.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve non-alphabeticals in the output.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The substituted chunks, one per input chunk.
+
+    Examples
+    --------
+    >>> list(substitute_stream(["Hello, ", "world!"], "DEFGHIJKLMNOPQRSTUVWXYZABC"))
+    ['Khoor', 'zruog']
+
+    >>> list(substitute_stream([b"Hello, ", b"world!"], "DEFGHIJKLMNOPQRSTUVWXYZABC"))
+    [b'Khoor', b'zruog']
+    """
+    table = compile_key(alphabet, preserve_nonalpha=preserve_nonalpha)
+    for chunk in iter_chunks(source):
+        if isinstance(chunk, str):
+            yield chunk.translate(table)
+        else:
+            yield substitute_bytes(chunk, alphabet, preserve_nonalpha=preserve_nonalpha)
+
+
+def substitute_bytes(
+    data: Buffer,
+    alphabet: str,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Substitute the ASCII letters of the data using a cipher alphabet.
+
+    Parameters
+    ----------
+    data : Buffer
+        The data to substitute.
+
+    alphabet : str
+        The cipher alphabet, i.e. the letters that A-Z are replaced with.
+        Case is preserved.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve bytes that are not ASCII letters in the output.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z.
+
+    Returns
+    -------
+    bytes
+        The substituted data.
+
+    Examples
+    --------
+    >>> substitute_bytes(b"Hello, world!", "DEFGHIJKLMNOPQRSTUVWXYZABC")
+    b'Khoorzruog'
+    """
+    table = compile_bytes_key(alphabet)
+    if preserve_nonalpha:
+        return bytes(as_bytes(data).translate(table))
+
+    return bytes(as_bytes(data).translate(table, _NONLETTER_BYTES))
+
+
+def substitute_into(
+    data: Buffer,
+    out: WritableBuffer,
+    alphabet: str,
+    *,
+    preserve_nonalpha: bool = False,
+) -> int:
+    """
+    Substitute the ASCII letters of the data using a cipher alphabet, writing
+    the result into an output buffer.
+
+    Parameters
+    ----------
+    data : Buffer
+        The data to substitute.
+
+    out : WritableBuffer
+        The buffer to write the result into, from its start. It may be the
+        data's own bytearray or mmap, substituting it in place.
+
+    alphabet : str
+        The cipher alphabet, i.e. the letters that A-Z are replaced with.
+        Case is preserved.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve bytes that are not ASCII letters in the output.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet is not a permutation of the letters A-Z, or if the
+        output buffer is too small.
+
+    Returns
+    -------
+    int
+        The number of bytes written.
+
+    Examples
+    --------
+    >>> buf = bytearray(b"Hello, world!")
+    >>> n = substitute_into(buf, buf, "DEFGHIJKLMNOPQRSTUVWXYZABC")
+    >>> buf[:n]
+    bytearray(b'Khoorzruog')
+    """
+    return write_into(
+        out, substitute_bytes(data, alphabet, preserve_nonalpha=preserve_nonalpha)
+    )
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    plaintext = "Flee at once. We are discovered!"
+    alphabet = "QWERTYUIOPASDFGHJKLZXCVBNM"
+
+    enc = substitute(plaintext, alphabet, preserve_nonalpha=True)
+    print(enc, "\n")
+
+    dec = substitute(enc, invert(alphabet), preserve_nonalpha=True)
+    print(dec, "\n")
+
+    assert dec == plaintext
+
+    big = plaintext * 300_000
+    start = perf_counter()
+    substitute(big, alphabet)
+    elapsed = perf_counter() - start
+    print(f"str:   {len(big) / elapsed / 1e6:.0f} MB/s")
+
+    big_bytes = big.encode("ascii")
+    start = perf_counter()
+    substitute_bytes(big_bytes, alphabet)
+    elapsed = perf_counter() - start
+    print(f"bytes: {len(big_bytes) / elapsed / 1e6:.0f} MB/s")
@@ -2,12 +2,195 @@
 https://en.wikipedia.org/wiki/One-time_pad
 """
 
-from cryptolab.substitution import vigenere
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from mmap import ACCESS_READ, mmap
+from typing import AnyStr, Self
+
+from cryptolab.substitution import polyalphabetic
+from cryptolab.substitution.polyalphabetic import Key
+from cryptolab.utils.buffers import Buffer
+from cryptolab.utils.streaming import Readable, iter_chunks
+
+
+@dataclass
+class Pad:
+    """
+    A one-time pad key that keeps track of how much of it has been used.
+
+    Every message enciphered with the pad uses the shifts from `offset` on and
+    advances `offset` past them, so one long pad, e.g. a memory-mapped pad
+    file, serves many messages without reusing any of it. Only the part of
+    the pad a message uses is ever read.
+
+    Parameters
+    ----------
+    buffer : Key
+        The shifts of the pad. Either a sequence of ints, or a byte buffer
+        (bytes, bytearray, memoryview, array("B") or mmap) with one shift per
+        byte. Shifts are taken modulo 26, so byte pads should hold values in
+        0-25 to avoid a bias.
+
+    offset : int, default=0
+        The position of the first unused shift.
+    """
+
+    buffer: Key
+    offset: int = 0
+
+    @staticmethod
+    def open(path: str, *, offset: int = 0) -> Pad:
+        """
+        Memory-map a pad file, read-only.
+
+        Parameters
+        ----------
+        path : str
+            The path to the pad file, with one shift per byte.
+
+        offset : int, default=0
+            The position of the first unused shift, e.g. as saved after the
+            last message.
+
+        Raises
+        ------
+        ValueError
+            If the file is empty.
+
+        Returns
+        -------
+        Pad
+            The pad. Close it, or use it as a context manager, to unmap the
+            file.
+        """
+        with open(path, "rb") as f:
+            return Pad(mmap(f.fileno(), 0, access=ACCESS_READ), offset)
+
+    @property
+    def remaining(self) -> int:
+        """
+        The number of unused shifts.
+
+        Returns
+        -------
+        int
+            The number of letters the pad can still encipher.
+        """
+        return len(self.buffer) - self.offset
+
+    def encipher(
+        self,
+        text: str,
+        *,
+        decrypt: bool = False,
+        preserve_nonalpha: bool = False,
+    ) -> str:
+        """
+        Encipher the text with the next unused shifts, and advance past them.
+
+        Parameters
+        ----------
+        text : str
+            The text to encrypt or decrypt.
+
+        decrypt : bool, default=False
+            Whether to decrypt the text.
+
+        preserve_nonalpha : bool, default=False
+            Whether to preserve nonalphabeticals in the output.
+
+        Raises
+        ------
+        ValueError
+            If the pad does not have enough unused shifts left. The offset is
+            not advanced.
+
+        Returns
+        -------
+        str
+            The resultant text.
+
+        Examples
+        --------
+        >>> pad = Pad(bytes(range(26)))
+        >>> pad.encipher("aaa"), pad.encipher("aaa"), pad.offset
+        ('abc', 'def', 6)
+        """
+        out = polyalphabetic.encipher(
+            text,
+            self.buffer,
+            decrypt=decrypt,
+            preserve_nonalpha=preserve_nonalpha,
+            offset=self.offset,
+            cyclic=False,
+        )
+        self.offset += polyalphabetic.count_letters(text)
+        return out
+
+    def encipher_bytes(
+        self,
+        data: Buffer,
+        *,
+        decrypt: bool = False,
+        preserve_nonalpha: bool = False,
+    ) -> bytes:
+        """
+        Encipher the ASCII letters of the data with the next unused shifts,
+        and advance past them.
+
+        Parameters
+        ----------
+        data : Buffer
+            The data to encrypt or decrypt.
+
+        decrypt : bool, default=False
+            Whether to decrypt the data.
+
+        preserve_nonalpha : bool, default=False
+            Whether to preserve bytes that are not ASCII letters in the
+            output.
+
+        Raises
+        ------
+        ValueError
+            If the pad does not have enough unused shifts left. The offset is
+            not advanced.
+
+        Returns
+        -------
+        bytes
+            The resultant data.
+        """
+        out = polyalphabetic.encipher_bytes(
+            data,
+            self.buffer,
+            decrypt=decrypt,
+            preserve_nonalpha=preserve_nonalpha,
+            offset=self.offset,
+            cyclic=False,
+        )
+        self.offset += polyalphabetic.count_letters(data)
+        return out
+
+    def close(self):
+        """
+        Unmap the pad file, if the pad is memory-mapped.
+        """
+        if isinstance(self.buffer, mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object):
+        self.close()
 
 
 def encrypt(
     plaintext: str,
-    key: list[int],
+    key: Key | Pad,
     *,
     preserve_nonalpha: bool = False,
 ) -> str:
@@ -19,8 +202,10 @@ def encrypt(
     plaintext : str
         The plaintext to encrypt.
 
-    key : list[int]
-        The one-time-pad key. It should be at least as long as the plaintext.
+    key : Key | Pad
+        The one-time-pad key. It should have at least one shift per letter of
+        the plaintext. A Pad is used from its offset on, and advanced past
+        the shifts used.
 
     preserve_nonalpha : bool,default=False
         Whether to preserve nonalphabeticals in the ciphertext.
@@ -35,15 +220,15 @@ def encrypt(
     str
         The resultant ciphertext.
     """
-    if len(key) < (s := sum(1 for i in plaintext if i.isalpha())):
-        msg = f"Key stream is too short: {len(key)} < {s}"
-        raise ValueError(msg)
-    return vigenere.encrypt(plaintext, key, preserve_nonalpha=preserve_nonalpha)
+    pad = key if isinstance(key, Pad) else Pad(key)
+    return pad.encipher(plaintext, preserve_nonalpha=preserve_nonalpha)
 
 
 def decrypt(
     ciphertext: str,
-    key: list[int],
+    key: Key | Pad,
+    *,
+    preserve_nonalpha: bool = False,
 ) -> str:
     """
     Decrypt the ciphertext using the given key as a one-time-pad.
@@ -53,8 +238,13 @@ def decrypt(
     ciphertext : str
         The ciphertext to decrypt.
 
-    key : list[int]
-        The one-time-pad key. It should be at least as long as the ciphertext.
+    key : Key | Pad
+        The one-time-pad key. It should have at least one shift per letter of
+        the ciphertext. A Pad is used from its offset on, and advanced past
+        the shifts used.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve nonalphabeticals in the plaintext.
 
     Raises
     ------
@@ -66,10 +256,164 @@ def decrypt(
     str
         The resultant plaintext.
     """
-    if len(key) < len(ciphertext):
-        msg = f"Key stream is too short: {len(key)} < {len(ciphertext)}"
-        raise ValueError(msg)
-    return vigenere.decrypt(ciphertext, key)
+    pad = key if isinstance(key, Pad) else Pad(key)
+    return pad.encipher(ciphertext, decrypt=True, preserve_nonalpha=preserve_nonalpha)
+
+
+def encrypt_bytes(
+    plaintext: Buffer,
+    key: Key | Pad,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Encrypt the ASCII letters of the plaintext bytes using the given key as a one-time-pad.
+
+    Parameters
+    ----------
+    plaintext : Buffer
+        The plaintext to encrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : Key | Pad
+        The one-time-pad key. It should have at least one shift per letter of
+        the plaintext. A Pad is used from its offset on, and advanced past
+        the shifts used.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the ciphertext.
+
+    Raises
+    ------
+    ValueError
+        If the key is too short to encrypt the plaintext.
+
+    Returns
+    -------
+    bytes
+        The resultant ciphertext.
+    """
+    pad = key if isinstance(key, Pad) else Pad(key)
+    return pad.encipher_bytes(plaintext, preserve_nonalpha=preserve_nonalpha)
+
+
+def decrypt_bytes(
+    ciphertext: Buffer,
+    key: Key | Pad,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Decrypt the ASCII letters of the ciphertext bytes using the given key as a one-time-pad.
+
+    Parameters
+    ----------
+    ciphertext : Buffer
+        The ciphertext to decrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : Key | Pad
+        The one-time-pad key. It should have at least one shift per letter of
+        the ciphertext. A Pad is used from its offset on, and advanced past
+        the shifts used.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the plaintext.
+
+    Raises
+    ------
+    ValueError
+        If the key is too short to decrypt the ciphertext.
+
+    Returns
+    -------
+    bytes
+        The resultant plaintext.
+    """
+    pad = key if isinstance(key, Pad) else Pad(key)
+    return pad.encipher_bytes(
+        ciphertext, decrypt=True, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def encrypt_stream(
+    plaintext: Iterable[AnyStr] | Readable[AnyStr],
+    key: Key | Pad,
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Encrypt a stream of plaintext using the given key as a one-time-pad. Each
+    chunk continues from where the previous one stopped in the key.
+
+    Parameters
+    ----------
+    plaintext : Iterable[AnyStr] | Readable[AnyStr]
+        The plaintext to encrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : Key | Pad
+        The one-time-pad key. It should have at least one shift per letter of
+        the plaintext. A Pad is used from its offset on, and advanced past
+        the shifts used.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve nonalphabeticals in the ciphertext.
+
+    Raises
+    ------
+    ValueError
+        If the key runs out. The chunks before the one it ran out on have
+        already been yielded.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant ciphertext chunks.
+    """
+    pad = key if isinstance(key, Pad) else Pad(key)
+    for chunk in iter_chunks(plaintext):
+        encipher = pad.encipher if isinstance(chunk, str) else pad.encipher_bytes
+        yield encipher(chunk, preserve_nonalpha=preserve_nonalpha)
+
+
+def decrypt_stream(
+    ciphertext: Iterable[AnyStr] | Readable[AnyStr],
+    key: Key | Pad,
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Decrypt a stream of ciphertext using the given key as a one-time-pad. Each
+    chunk continues from where the previous one stopped in the key.
+
+    Parameters
+    ----------
+    ciphertext : Iterable[AnyStr] | Readable[AnyStr]
+        The ciphertext to decrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : Key | Pad
+        The one-time-pad key. It should have at least one shift per letter of
+        the ciphertext. A Pad is used from its offset on, and advanced past
+        the shifts used.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve nonalphabeticals in the plaintext.
+
+    Raises
+    ------
+    ValueError
+        If the key runs out. The chunks before the one it ran out on have
+        already been yielded.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant plaintext chunks.
+    """
+    pad = key if isinstance(key, Pad) else Pad(key)
+    for chunk in iter_chunks(ciphertext):
+        encipher = pad.encipher if isinstance(chunk, str) else pad.encipher_bytes
+        yield encipher(chunk, decrypt=True, preserve_nonalpha=preserve_nonalpha)
 
 
 if __name__ == "__main__":
@@ -85,3 +429,24 @@ if __name__ == "__main__":
     print(dec, "\n")
 
     assert plaintext == dec
+
+    # one pad shared by several messages, each using the next unused shifts
+    import os
+    from secrets import randbelow
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pad.bin")
+        with open(path, "wb") as f:
+            f.write(bytes(randbelow(26) for _ in range(1 << 16)))
+
+        messages = ["Meet at noon.", "Bring the documents."]
+        with Pad.open(path) as pad:
+            sent = [encrypt(m, pad, preserve_nonalpha=True) for m in messages]
+            print(sent, pad.offset, "\n")
+
+        with Pad.open(path) as pad:
+            received = [decrypt(c, pad, preserve_nonalpha=True) for c in sent]
+            print(received, "\n")
+
+    assert received == messages
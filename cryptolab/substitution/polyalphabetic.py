@@ -0,0 +1,717 @@
+"""
+https://en.wikipedia.org/wiki/Polyalphabetic_cipher
+
+Bulk engine for the additive polyalphabetic ciphers (Vigenère and the
+one-time pad).
+
+The letters of the text are gathered into one byte string, the key is laid
+out against them as a byte string of shifts, and every letter is shifted at
+once with word-wide integer arithmetic (SWAR) over the whole buffer:
+
+- the letters are lowercased with a 0x20 mask, which is kept to restore the
+  case, and offset to 0-25,
+- the shifts are added, and
+- bytes that reached 26 or more are found by adding 0x66 and testing the
+  high bit (0x66 + 26 = 0x80), and have 26 subtracted.
+
+No byte ever overflows into its neighbour, so the arithmetic on one big
+integer is the same as on every byte separately. The key advances on letters
+only, and non-letters are either dropped or put back around the shifted
+letters. Text is encoded to UTF-8 for this, and bytes are processed as they
+are.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from io import BytesIO
+from mmap import mmap
+from string import ascii_letters, ascii_uppercase
+from typing import AnyStr
+
+from cryptolab.substitution import monoalphabetic
+from cryptolab.utils.buffers import Buffer, WritableBuffer, as_bytes, write_into
+from cryptolab.utils.streaming import Readable, iter_chunks
+
+# A key: a sequence of shifts, or a byte buffer of them such as a mapped pad file
+Key = Sequence[int] | mmap
+
+_LETTER_BYTES = ascii_letters.encode("ascii")
+
+# Every byte that is not an ASCII letter, for deletion with bytes.translate
+_NONLETTER_BYTES = bytes(b for b in range(256) if b not in _LETTER_BYTES)
+
+# Maps letters to 0xFF and everything else to 0x00
+_LETTER_MASK = bytes(0xFF if b in _LETTER_BYTES else 0 for b in range(256))
+
+# Maps non-letters to "a", so every byte can be shifted without borrows
+_AS_LETTER = bytes(b if b in _LETTER_BYTES else 0x61 for b in range(256))
+
+# Reduces a byte to a shift in 0-25
+_MOD26 = bytes(i % 26 for i in range(256))
+
+# Negates a shift in 0-25 modulo 26
+_NEGATE = bytes((26 - i) % 26 for i in range(26)) + bytes(230)
+
+# Reduces a byte to the negation of its shift, in one translate
+_NEGATED_MOD26 = _MOD26.translate(_NEGATE)
+
+# Keys at least this many times shorter than the text are applied per column
+_COLUMNS_RATIO = 64
+
+
+def _fill(byte: int, n: int) -> int:
+    """
+    Get the integer whose n little-endian bytes are all the given byte.
+    """
+    return int.from_bytes(bytes((byte,)) * n, "little")
+
+
+def key_shifts(key: Key, *, decrypt: bool = False) -> bytes:
+    """
+    Convert a key to a byte string of shifts in 0-25.
+
+    Parameters
+    ----------
+    key : Key
+        The shifts of the key. Byte buffers, such as bytes, bytearray,
+        memoryview, mmap or array("B"), are read directly with one shift per
+        byte.
+
+    decrypt : bool, default=False
+        Whether to negate the shifts, giving the shifts that decrypt.
+
+    Returns
+    -------
+    bytes
+        The shifts, one byte each.
+
+    Examples
+    --------
+    >>> key_shifts([2, 8, 27, -1])
+    b'\\x02\\x08\\x01\\x19'
+
+    >>> key_shifts([2, 8, 27, -1], decrypt=True)
+    b'\\x18\\x12\\x19\\x01'
+    """
+    table = _NEGATED_MOD26 if decrypt else _MOD26
+    try:
+        view = memoryview(key)  # type: ignore[arg-type]
+    except TypeError:
+        # not a buffer, e.g. a list of ints
+        try:
+            return bytes(key).translate(table)
+        except ValueError:
+            return bytes(k % 26 for k in key).translate(table)
+
+    with view:
+        if view.format != "B":
+            return bytes(k % 26 for k in view.tolist()).translate(table)
+
+        # translate needs bytes, so other buffers are read into bytes once
+        data = key if isinstance(key, bytes) else view.tobytes()
+        return data.translate(table)
+
+
+def pad_shifts(
+    key: Key, length: int, *, offset: int = 0, decrypt: bool = False
+) -> bytes:
+    """
+    Get the shifts of `length` letters from a one-time pad key, without
+    reading any of the key outside of them.
+
+    Parameters
+    ----------
+    key : Key
+        The one-time pad key.
+
+    length : int
+        The number of letters.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    decrypt : bool, default=False
+        Whether to negate the shifts, giving the shifts that decrypt.
+
+    Raises
+    ------
+    ValueError
+        If the key is too short.
+
+    Returns
+    -------
+    bytes
+        The shift of each letter.
+
+    Examples
+    --------
+    >>> pad_shifts(bytes(range(10)), 3, offset=4)
+    b'\\x04\\x05\\x06'
+    """
+    if len(key) - offset < length:
+        msg = f"Key stream is too short: {len(key) - offset} < {length}"
+        raise ValueError(msg)
+
+    try:
+        view = memoryview(key)  # type: ignore[arg-type]
+    except TypeError:
+        return key_shifts(key[offset : offset + length], decrypt=decrypt)
+
+    # slicing the view, unlike slicing an mmap or bytes, copies nothing
+    with view, view[offset : offset + length] as window:
+        return key_shifts(window, decrypt=decrypt)
+
+
+def count_letters(text: str | Buffer) -> int:
+    """
+    Count the letters of the text, i.e. the number of shifts it consumes.
+
+    Parameters
+    ----------
+    text : str | Buffer
+        The text, or bytes.
+
+    Returns
+    -------
+    int
+        The number of ASCII letters in the text.
+
+    Examples
+    --------
+    >>> count_letters("Attack at dawn!")
+    12
+    """
+    data = text.encode("utf-8") if isinstance(text, str) else as_bytes(text)
+    return len(data.translate(None, _NONLETTER_BYTES))
+
+
+def key_stream(shifts: bytes, length: int, *, offset: int = 0) -> bytes:
+    """
+    Lay out the shifts of a repeating key against `length` letters.
+
+    Parameters
+    ----------
+    shifts : bytes
+        The shifts of the key, see key_shifts.
+
+    length : int
+        The number of letters.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    Raises
+    ------
+    ValueError
+        If the key is empty.
+
+    Returns
+    -------
+    bytes
+        The shift of each letter.
+
+    Examples
+    --------
+    >>> key_stream(b"\\x00\\x01\\x02", 7, offset=1)
+    b'\\x01\\x02\\x00\\x01\\x02\\x00\\x01'
+    """
+    if not shifts:
+        raise ValueError("key must not be empty")
+
+    start = offset % len(shifts)
+    repeats = (start + length) // len(shifts) + 1
+    return (shifts * repeats)[start : start + length]
+
+
+def shift_letters(data: bytes, stream: bytes) -> bytes:
+    """
+    Shift every ASCII letter by the shift at the same position, preserving
+    case. Every other byte is left unchanged and its shift is ignored.
+
+    Parameters
+    ----------
+    data : bytes
+        The data to shift.
+
+    stream : bytes
+        The shift of each byte, in 0-25, see key_stream.
+
+    Returns
+    -------
+    bytes
+        The shifted data.
+
+    Examples
+    --------
+    >>> shift_letters(b"Attack Z!", b"\\x01" * 9)
+    b'Buubdl A!'
+    """
+    n = len(data)
+    if n == 0:
+        return b""
+
+    ones = _fill(0x01, n)
+    x = int.from_bytes(data.translate(_AS_LETTER), "little")
+    case = x & (ones * 0x20)
+    s = (x | (ones * 0x20)) - ones * 0x61 + int.from_bytes(stream, "little")
+    wrapped = ((s + ones * 0x66) & (ones * 0x80)) >> 7
+    shifted = s - wrapped * 26 + ones * 0x41 + case
+
+    mask = int.from_bytes(data.translate(_LETTER_MASK), "little")
+    if mask != ones * 0xFF:
+        shifted = (shifted & mask) | (int.from_bytes(data, "little") & ~mask)
+
+    return shifted.to_bytes(n, "little")
+
+
+def shift_columns(letters: bytes, shifts: bytes, *, offset: int = 0) -> bytes:
+    """
+    Shift the letters by a repeating key, one column of the key at a time.
+
+    The letters are reshaped by the period of the key: every column,
+    letters[j::period], has a single shift, and is substituted by one
+    translate call with that shift's Caesar table.
+
+    Parameters
+    ----------
+    letters : bytes
+        The letters to shift. Must only contain ASCII letters.
+
+    shifts : bytes
+        The shifts of the key, see key_shifts.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    Returns
+    -------
+    bytes
+        The shifted letters.
+
+    Examples
+    --------
+    >>> shift_columns(b"AttackZ", b"\\x00\\x01")
+    b'AutbclZ'
+    """
+    period = len(shifts)
+    out = bytearray(len(letters))
+    for j in range(min(period, len(letters))):
+        k = shifts[(offset + j) % period]
+        table = monoalphabetic.compile_bytes_key(
+            ascii_uppercase[k:] + ascii_uppercase[:k]
+        )
+        out[j::period] = letters[j::period].translate(table)
+
+    return bytes(out)
+
+
+def encipher(
+    text: str,
+    key: Key,
+    *,
+    decrypt: bool = False,
+    preserve_nonalpha: bool = False,
+    offset: int = 0,
+    cyclic: bool = True,
+) -> str:
+    """
+    Shift the letters of the text by the key.
+
+    Parameters
+    ----------
+    text : str
+        The text to encrypt or decrypt.
+
+    key : Key
+        The shifts of the key. A one-time pad key is only read where it is
+        used.
+
+    decrypt : bool, default=False
+        Whether to shift backwards, decrypting the text.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve non-alphabeticals in the output. The key only
+        advances on letters either way.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    cyclic : bool, default=True
+        Whether to repeat the key (Vigenère) or use each shift once
+        (one-time pad).
+
+    Raises
+    ------
+    ValueError
+        If the key is empty, or if it is not cyclic and too short.
+
+    Returns
+    -------
+    str
+        The resultant text.
+
+    Examples
+    --------
+    >>> encipher("Attack at dawn!", [11, 4, 12, 14, 13], preserve_nonalpha=True)
+    'Lxfopv ef rnhr!'
+
+    >>> encipher("Lxfopv ef rnhr!", [11, 4, 12, 14, 13], decrypt=True)
+    'Attackatdawn'
+    """
+    if cyclic:
+        shifts = key_shifts(key, decrypt=decrypt)
+    else:
+        shifts = pad_shifts(key, count_letters(text), offset=offset, decrypt=decrypt)
+
+    return _encipher(
+        text,
+        shifts,
+        preserve_nonalpha=preserve_nonalpha,
+        offset=offset if cyclic else 0,
+        cyclic=cyclic,
+    )[0]
+
+
+def encipher_bytes(
+    data: Buffer,
+    key: Key,
+    *,
+    decrypt: bool = False,
+    preserve_nonalpha: bool = False,
+    offset: int = 0,
+    cyclic: bool = True,
+) -> bytes:
+    """
+    Shift the ASCII letters of the data by the key.
+
+    Parameters
+    ----------
+    data : Buffer
+        The data to encrypt or decrypt.
+
+    key : Key
+        The shifts of the key. A one-time pad key is only read where it is
+        used.
+
+    decrypt : bool, default=False
+        Whether to shift backwards, decrypting the data.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve bytes that are not ASCII letters in the output.
+        The key only advances on letters either way.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    cyclic : bool, default=True
+        Whether to repeat the key (Vigenère) or use each shift once
+        (one-time pad).
+
+    Raises
+    ------
+    ValueError
+        If the key is empty, or if it is not cyclic and too short.
+
+    Returns
+    -------
+    bytes
+        The resultant data.
+
+    Examples
+    --------
+    >>> encipher_bytes(b"Attack at dawn!", [11, 4, 12, 14, 13])
+    b'Lxfopvefrnhr'
+    """
+    data = as_bytes(data)
+    if cyclic:
+        shifts = key_shifts(key, decrypt=decrypt)
+    else:
+        shifts = pad_shifts(key, count_letters(data), offset=offset, decrypt=decrypt)
+
+    return _encipher_bytes(
+        data,
+        shifts,
+        preserve_nonalpha=preserve_nonalpha,
+        offset=offset if cyclic else 0,
+        cyclic=cyclic,
+    )[0]
+
+
+def encipher_into(
+    data: Buffer,
+    out: WritableBuffer,
+    key: Key,
+    *,
+    decrypt: bool = False,
+    preserve_nonalpha: bool = False,
+    offset: int = 0,
+    cyclic: bool = True,
+) -> int:
+    """
+    Shift the ASCII letters of the data by the key, writing the result into
+    an output buffer.
+
+    Parameters
+    ----------
+    data : Buffer
+        The data to encrypt or decrypt.
+
+    out : WritableBuffer
+        The buffer to write the result into, from its start. It may be the
+        data's own bytearray or mmap, enciphering it in place.
+
+    key : Key
+        The shifts of the key. A one-time pad key is only read where it is
+        used.
+
+    decrypt : bool, default=False
+        Whether to shift backwards, decrypting the data.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve bytes that are not ASCII letters in the output.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    cyclic : bool, default=True
+        Whether to repeat the key (Vigenère) or use each shift once
+        (one-time pad).
+
+    Raises
+    ------
+    ValueError
+        If the key is empty, if it is not cyclic and too short, or if the
+        output buffer is too small.
+
+    Returns
+    -------
+    int
+        The number of bytes written.
+
+    Examples
+    --------
+    >>> buf = bytearray(b"Attack at dawn!")
+    >>> n = encipher_into(buf, buf, [11, 4, 12, 14, 13], preserve_nonalpha=True)
+    >>> buf[:n]
+    bytearray(b'Lxfopv ef rnhr!')
+    """
+    return write_into(
+        out,
+        encipher_bytes(
+            data,
+            key,
+            decrypt=decrypt,
+            preserve_nonalpha=preserve_nonalpha,
+            offset=offset,
+            cyclic=cyclic,
+        ),
+    )
+
+
+def encipher_stream(
+    source: Iterable[AnyStr] | Readable[AnyStr],
+    key: Key,
+    *,
+    decrypt: bool = False,
+    preserve_nonalpha: bool = False,
+    offset: int = 0,
+    cyclic: bool = True,
+) -> Iterator[AnyStr]:
+    """
+    Shift the letters of a stream of text by the key.
+
+    The position in the key is carried from one chunk to the next, so the
+    output is the same as enciphering the whole text at once.
+
+    Parameters
+    ----------
+    source : Iterable[AnyStr] | Readable[AnyStr]
+        The text, as an iterable of chunks or a file object. Bytes chunks,
+        e.g. from a file opened in binary mode, are enciphered as bytes.
+
+    key : Key
+        The shifts of the key. A one-time pad key is only read where it is
+        used.
+
+    decrypt : bool, default=False
+        Whether to shift backwards, decrypting the text.
+
+    preserve_nonalpha : bool, default=False
+        Whether to preserve non-alphabeticals in the output.
+
+    offset : int, default=0
+        The position in the key of the first letter.
+
+    cyclic : bool, default=True
+        Whether to repeat the key (Vigenère) or use each shift once
+        (one-time pad).
+
+    Raises
+    ------
+    ValueError
+        If the key is empty, or if it is not cyclic and runs out. The chunks
+        before the one the key ran out on have already been yielded.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant chunks, one per input chunk.
+
+    Examples
+    --------
+    >>> list(encipher_stream(["Attack ", "at dawn!"], [11, 4, 12, 14, 13]))
+    ['Lxfopv', 'efrnhr']
+
+    >>> list(encipher_stream([b"Attack ", b"at dawn!"], [11, 4, 12, 14, 13]))
+    [b'Lxfopv', b'efrnhr']
+    """
+    shifts = key_shifts(key, decrypt=decrypt) if cyclic else b""
+    for chunk in iter_chunks(source):
+        if not cyclic:
+            n = count_letters(chunk)
+            shifts = pad_shifts(key, n, offset=offset, decrypt=decrypt)
+
+        encipher_chunk = _encipher if isinstance(chunk, str) else _encipher_bytes
+        out, n = encipher_chunk(
+            chunk,
+            shifts,
+            preserve_nonalpha=preserve_nonalpha,
+            offset=offset if cyclic else 0,
+            cyclic=cyclic,
+        )
+        offset += n
+        yield out
+
+
+def _encipher(
+    text: str,
+    shifts: bytes,
+    *,
+    preserve_nonalpha: bool,
+    offset: int,
+    cyclic: bool,
+) -> tuple[str, int]:
+    """
+    Shift the letters of the text by the shifts of a key.
+
+    Parameters
+    ----------
+    text : str
+        The text to shift.
+
+    shifts : bytes
+        The shifts of the key, see key_shifts. If it is not cyclic, the shift
+        of every letter of the text, see pad_shifts.
+
+    preserve_nonalpha : bool
+        Whether to preserve non-alphabeticals in the output.
+
+    offset : int
+        The position in the key of the first letter.
+
+    cyclic : bool
+        Whether to repeat the key.
+
+    Returns
+    -------
+    tuple[str, int]
+        The resultant text and the number of letters in it.
+    """
+    out, n = _encipher_bytes(
+        text.encode("utf-8"),
+        shifts,
+        preserve_nonalpha=preserve_nonalpha,
+        offset=offset,
+        cyclic=cyclic,
+    )
+    return out.decode("utf-8"), n
+
+
+def _encipher_bytes(
+    data: bytes | bytearray,
+    shifts: bytes,
+    *,
+    preserve_nonalpha: bool,
+    offset: int,
+    cyclic: bool,
+) -> tuple[bytes, int]:
+    """
+    Shift the ASCII letters of the data by the shifts of a key.
+
+    Parameters
+    ----------
+    data : bytes | bytearray
+        The data to shift.
+
+    shifts : bytes
+        The shifts of the key, see key_shifts. If it is not cyclic, the shift
+        of every letter of the data, see pad_shifts.
+
+    preserve_nonalpha : bool
+        Whether to preserve bytes that are not ASCII letters in the output.
+
+    offset : int
+        The position in the key of the first letter.
+
+    cyclic : bool
+        Whether to repeat the key.
+
+    Returns
+    -------
+    tuple[bytes, int]
+        The resultant data and the number of letters in it.
+    """
+    if not preserve_nonalpha:
+        letters = bytes(data.translate(None, _NONLETTER_BYTES))
+        if cyclic and shifts and len(letters) >= _COLUMNS_RATIO * len(shifts):
+            out = shift_columns(letters, shifts, offset=offset)
+        else:
+            stream = (
+                key_stream(shifts, len(letters), offset=offset) if cyclic else shifts
+            )
+            out = shift_letters(letters, stream)
+        return out, len(letters)
+
+    # lay the key out over the letters only, with a 0 shift under every
+    # non-letter, by cutting the key stream at the non-letters
+    runs = data.translate(_LETTER_MASK).split(b"\x00")
+    n = len(data) - len(runs) + 1
+    stream = key_stream(shifts, n, offset=offset) if cyclic else shifts
+    stream = b"\x00".join(map(BytesIO(stream).read, map(len, runs)))
+    return shift_letters(data, stream), n
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    plaintext = "Attack at dawn!"
+    key = [11, 4, 12, 14, 13]
+
+    enc = encipher(plaintext, key, preserve_nonalpha=True)
+    print(enc, "\n")
+
+    dec = encipher(enc, key, decrypt=True, preserve_nonalpha=True)
+    print(dec, "\n")
+
+    assert dec == plaintext
+
+    big = "Defend the east wall of the castle. " * 300_000
+    for preserve in (False, True):
+        start = perf_counter()
+        encipher(big, key, preserve_nonalpha=preserve)
+        elapsed = perf_counter() - start
+        print(
+            f"vigenere preserve_nonalpha={preserve}: "
+            f"{len(big) / elapsed / 1e6:.0f} MB/s"
+        )
+
+    big_bytes = big.encode("ascii")
+    start = perf_counter()
+    encipher_bytes(big_bytes, key, preserve_nonalpha=True)
+    elapsed = perf_counter() - start
+    print(f"vigenere bytes: {len(big_bytes) / elapsed / 1e6:.0f} MB/s")
+
+    pad = key_stream(bytes(range(26)), len(big))
+    start = perf_counter()
+    encipher(big, pad, cyclic=False)
+    elapsed = perf_counter() - start
+    print(f"one-time pad: {len(big) / elapsed / 1e6:.0f} MB/s")
@@ -2,7 +2,12 @@
 https://en.wikipedia.org/wiki/ROT13
 """
 
+from collections.abc import Iterable, Iterator
+from typing import AnyStr
+
 from cryptolab.substitution import caesar
+from cryptolab.utils.buffers import Buffer
+from cryptolab.utils.streaming import Readable
 
 
 def encrypt(
@@ -63,6 +68,120 @@ def decrypt(ciphertext: str) -> str:
     return caesar.decrypt(ciphertext, 13)
 
 
+def encrypt_bytes(
+    plaintext: Buffer,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Encrypt the ASCII letters of the plaintext bytes using ROT13.
+
+    Parameters
+    ----------
+    plaintext : Buffer
+        The plaintext to encrypt, e.g. bytes, a bytearray or a memoryview.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the ciphertext.
+
+    Returns
+    -------
+    bytes
+        The resultant ciphertext.
+    """
+    return caesar.encrypt_bytes(
+        plaintext,
+        13,
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
+def decrypt_bytes(
+    ciphertext: Buffer,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Decrypt the ASCII letters of the ciphertext bytes using ROT13.
+
+    Parameters
+    ----------
+    ciphertext : Buffer
+        The ciphertext to decrypt, e.g. bytes, a bytearray or a memoryview.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the plaintext.
+
+    Returns
+    -------
+    bytes
+        The resultant plaintext.
+    """
+    return caesar.decrypt_bytes(
+        ciphertext,
+        13,
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
+def encrypt_stream(
+    plaintext: Iterable[AnyStr] | Readable[AnyStr],
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Encrypt a stream of plaintext using ROT13.
+
+    Parameters
+    ----------
+    plaintext : Iterable[AnyStr] | Readable[AnyStr]
+        The plaintext to encrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the ciphertext.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant ciphertext chunks.
+    """
+    return caesar.encrypt_stream(
+        plaintext,
+        13,
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
+def decrypt_stream(
+    ciphertext: Iterable[AnyStr] | Readable[AnyStr],
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Decrypt a stream of ciphertext using ROT13.
+
+    Parameters
+    ----------
+    ciphertext : Iterable[AnyStr] | Readable[AnyStr]
+        The ciphertext to decrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the plaintext.
+
+    Returns
+    -------
+    Iterator[str]
+        The decrypted chunks.
+    """
+    return caesar.decrypt_stream(
+        ciphertext,
+        13,
+        preserve_nonalpha=preserve_nonalpha,
+    )
+
+
 if __name__ == "__main__":
     plaintext = "Defend the east wall of the castle."
 
@@ -1,8 +1,27 @@
 """ """
 
+import re
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from random import Random
 from string import ascii_uppercase
+from typing import AnyStr
 
+from cryptolab.scoring.ngram import quadgram_score
+from cryptolab.scoring.patterns import letter_candidates
+from cryptolab.substitution import monoalphabetic
+from cryptolab.utils.analysis import DEFAULT_FREQUENCIES
+from cryptolab.utils.buffers import Buffer
+from cryptolab.utils.hill_climb import hill_climb
 from cryptolab.utils.keys import keyed_alphabet
+from cryptolab.utils.moves import random_swap, swap, swap_neighbours
+from cryptolab.utils.seeding import Seed, make_rng, spawn
+from cryptolab.utils.streaming import Readable
+
+# The letters A-Z from most to least frequent in English
+_ENGLISH_ORDER = "".join(
+    sorted(DEFAULT_FREQUENCIES, key=DEFAULT_FREQUENCIES.__getitem__, reverse=True)
+)
 
 
 def encrypt(
@@ -38,22 +57,10 @@ def encrypt(
     if not key.isalpha():
         raise ValueError("key must be alphabetical")
 
-    alphabet = keyed_alphabet(key)
-    trans = str.maketrans(ascii_uppercase, alphabet)
-
-    ret = ""
-    for c in plaintext:
-        if not c.isalpha():
-            if preserve_nonalpha:
-                ret += c
-            continue
-
-        if c.islower():
-            ret += c.upper().translate(trans).lower()
-        else:
-            ret += c.translate(trans)
-
-    return ret
+    alphabet = keyed_alphabet(key.upper())
+    return monoalphabetic.substitute(
+        plaintext, alphabet, preserve_nonalpha=preserve_nonalpha
+    )
 
 
 def decrypt(ciphertext: str, key: str) -> str:
@@ -81,21 +88,279 @@ def decrypt(ciphertext: str, key: str) -> str:
     if not key.isalpha():
         raise ValueError("key must be alphabetical")
 
-    alphabet = keyed_alphabet(key)
-    trans = str.maketrans(alphabet, ascii_uppercase)
+    alphabet = monoalphabetic.invert(keyed_alphabet(key.upper()))
+    return monoalphabetic.substitute(ciphertext, alphabet, preserve_nonalpha=True)
+
+
+def encrypt_bytes(
+    plaintext: Buffer,
+    key: str,
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Encrypt the ASCII letters of the plaintext bytes using a keyed alphabet.
+
+    Parameters
+    ----------
+    plaintext : Buffer
+        The plaintext to encrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : str
+        The key word to use in the alphabet construction.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the ciphertext.
+
+    Raises
+    ------
+    ValueError
+        If the key contains non-alphabetical characters.
+
+    Returns
+    -------
+    bytes
+        The resultant ciphertext.
+    """
+    if not key.isalpha():
+        raise ValueError("key must be alphabetical")
+
+    alphabet = keyed_alphabet(key.upper())
+    return monoalphabetic.substitute_bytes(
+        plaintext, alphabet, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def decrypt_bytes(
+    ciphertext: Buffer,
+    key: str,
+    *,
+    preserve_nonalpha: bool = True,
+) -> bytes:
+    """
+    Decrypt the ASCII letters of the ciphertext bytes using a keyed alphabet.
+
+    Parameters
+    ----------
+    ciphertext : Buffer
+        The ciphertext to decrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : str
+        The key word to use in the alphabet construction.
+
+    preserve_nonalpha : bool,default=True
+        Whether to preserve bytes that are not ASCII letters in the plaintext.
+
+    Raises
+    ------
+    ValueError
+        If the key contains non-alphabetical characters.
+
+    Returns
+    -------
+    bytes
+        The resultant plaintext.
+    """
+    if not key.isalpha():
+        raise ValueError("key must be alphabetical")
+
+    alphabet = monoalphabetic.invert(keyed_alphabet(key.upper()))
+    return monoalphabetic.substitute_bytes(
+        ciphertext, alphabet, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def encrypt_stream(
+    plaintext: Iterable[AnyStr] | Readable[AnyStr],
+    key: str,
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Encrypt a stream of plaintext using a keyed alphabet.
+
+    Parameters
+    ----------
+    plaintext : Iterable[AnyStr] | Readable[AnyStr]
+        The plaintext to encrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : str
+        The key word to use in the alphabet construction.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the ciphertext.
+
+    Raises
+    ------
+    ValueError
+        If the key contains non-alphabetical characters.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant ciphertext chunks.
+    """
+    if not key.isalpha():
+        raise ValueError("key must be alphabetical")
+
+    alphabet = keyed_alphabet(key.upper())
+    return monoalphabetic.substitute_stream(
+        plaintext, alphabet, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def decrypt_stream(
+    ciphertext: Iterable[AnyStr] | Readable[AnyStr],
+    key: str,
+    *,
+    preserve_nonalpha: bool = True,
+) -> Iterator[AnyStr]:
+    """
+    Decrypt a stream of ciphertext using a keyed alphabet.
+
+    Parameters
+    ----------
+    ciphertext : Iterable[AnyStr] | Readable[AnyStr]
+        The ciphertext to decrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
 
-    ret = ""
-    for c in ciphertext:
-        if not c.isalpha():
-            ret += c
+    key : str
+        The key word to use in the alphabet construction.
+
+    preserve_nonalpha : bool,default=True
+        Whether to preserve non-alphabeticals in the plaintext.
+
+    Raises
+    ------
+    ValueError
+        If the key contains non-alphabetical characters.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant plaintext chunks.
+    """
+    if not key.isalpha():
+        raise ValueError("key must be alphabetical")
+
+    alphabet = monoalphabetic.invert(keyed_alphabet(key.upper()))
+    return monoalphabetic.substitute_stream(
+        ciphertext, alphabet, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def seed_key(ciphertext: str) -> str:
+    """
+    Guess the key of a ciphertext from its word patterns and letter
+    frequencies, as a starting point for a search.
+
+    If the ciphertext has word boundaries, every ciphertext letter that its
+    words pin down to a single plaintext letter is mapped to it, see
+    cryptolab.scoring.patterns.letter_candidates. The other letters are
+    mapped by frequency: the most frequent ciphertext letter to the most
+    frequent English letter among its candidates, and so on. Without the word
+    frequency data the patterns are skipped, and every letter is mapped by
+    frequency.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext, with its non-alphabeticals.
+
+    Returns
+    -------
+    str
+        The guessed decryption alphabet, i.e. the plaintext letter of each of
+        the ciphertext letters A-Z.
+    """
+    upper = ciphertext.upper()
+    words = re.findall(r"[A-Z]+", upper)
+    try:
+        candidates = letter_candidates(words) if len(words) > 1 else {}
+    except FileNotFoundError:
+        candidates = {}
+    counts = Counter(monoalphabetic.substitute(upper, ascii_uppercase))
+
+    key: dict[str, str] = {}
+    for c, plain in candidates.items():
+        if len(plain) == 1 and not plain & set(key.values()):
+            key[c] = next(iter(plain))
+
+    for c in sorted(ascii_uppercase, key=lambda c: -counts[c]):
+        if c in key:
             continue
 
-        if c.islower():
-            ret += c.upper().translate(trans).lower()
-        else:
-            ret += c.translate(trans)
+        unused = [p for p in _ENGLISH_ORDER if p not in key.values()]
+        allowed = candidates.get(c, set())
+        key[c] = next((p for p in unused if p in allowed), unused[0])
+
+    return "".join(key[c] for c in ascii_uppercase)
+
+
+def crack(
+    ciphertext: str,
+    *,
+    score: Callable[[str], float] = quadgram_score,
+    restarts: int = 10,
+    rng: Seed = None,
+) -> tuple[str, str]:
+    """
+    Crack a simple substitution ciphertext.
+
+    The search starts from the key guessed by seed_key, which is much closer
+    to the answer than a random key when the ciphertext keeps its spaces, and
+    hill climbs over letter swaps. Later restarts start from the guess with a
+    few random swaps.
 
-    return ret
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    score : Callable[[str], float], default=quadgram_score
+        Scoring function to use.
+
+    restarts : int, default=10
+        The number of hill climbs.
+
+    rng : int | Random | None, default=None
+        Random number generator, or a seed for one. Passing the same seed
+        reproduces a run.
+
+    Returns
+    -------
+    tuple[str, str]
+        The highest scoring plaintext, with the ciphertext's
+        non-alphabeticals, and the cipher alphabet. A full cipher alphabet is
+        also a key word for encrypt and decrypt.
+    """
+    rng = make_rng(rng)
+    moves = spawn(rng, 1)[0]
+    seed = seed_key(ciphertext)
+
+    def gen_key(stream: Random) -> str:
+        key = seed
+        for _ in range(stream.randrange(4)):
+            key = "".join(swap(key, *random_swap(len(key), stream)))
+        return key
+
+    def mutate(key: str) -> Iterator[str]:
+        return map("".join, swap_neighbours(key, moves))
+
+    letters = monoalphabetic.substitute(ciphertext.upper(), ascii_uppercase)
+    _, key = hill_climb(
+        letters,
+        gen_key,
+        mutate,
+        monoalphabetic.substitute,
+        score,
+        restarts=restarts,
+        rng=rng,
+    )
+
+    alphabet = monoalphabetic.invert(key)
+    return decrypt(ciphertext, alphabet), alphabet
 
 
 if __name__ == "__main__":
@@ -107,3 +372,11 @@ if __name__ == "__main__":
 
     dec = decrypt(enc, key)
     print(dec, "\n")
+
+    plaintext = "Simulated annealing is a probabilistic technique for approximating the global optimum of a given function. Specifically, it is a metaheuristic to approximate global optimization in a large search space for an optimization problem."
+    enc = encrypt(plaintext, key, preserve_nonalpha=True)
+    print(enc, "\n")
+
+    dec, alphabet = crack(enc, rng=1)
+    print(dec)
+    print(alphabet, "\n")
@@ -4,16 +4,71 @@ https://en.wikipedia.org/wiki/Straddling_checkerboard
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterator
-from functools import partial
-from itertools import combinations
-from random import choice, randint, shuffle
+import re
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import cache, lru_cache, partial
+from itertools import chain, islice, repeat
+from math import inf
+from operator import mul
+from random import Random
 from string import ascii_uppercase
-
-from cryptolab.scoring.ngram import trigram_score
+from time import monotonic
+from typing import TypeVar
+
+from cryptolab.scoring.ngram import (
+    bigram_score,
+    monogram_score,
+    ngram_table,
+    quadgram_score,
+    quintgram_score,
+    trigram_score,
+)
 from cryptolab.scoring.words import word_score
 from cryptolab.utils.anneal import anneal
-from cryptolab.utils.hill_climb import hill_climb
+from cryptolab.utils.genetic import order_crossover
+from cryptolab.utils.hill_climb import SearchStats, hill_climb
+from cryptolab.utils.moves import random_swap, shuffled_range, unrank_pair
+from cryptolab.utils.schedules import Schedule
+from cryptolab.utils.seeding import Seed, make_rng
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Splits plaintext into the text between digit runs and the runs, see encrypt
+_DIGIT_RUNS = re.compile(r"([0-9]+)")
+
+# A decode table of a Board, indexed by digit: the code of each digit's symbol,
+# or 0 if it has none. See Board.decode_tables
+DecodeRow = tuple[int, ...]
+
+# A compiled board: its parse structure and the bytes.translate table from
+# code ids to symbols. See _compile
+_Compiled = tuple[bytes, bytearray]
+
+# The code id of the first code. The single digit codes d have ids 128 + d,
+# and the codes of digit d of the rows r = 0, 1 have ids 138 + 10 * r + d, so
+# they never clash with escaped digits, which are kept as ASCII
+_CODE_ID = 128
+
+# A move of a MutableBoard, as (kind, i, j). See MutableBoard.move
+Move = tuple[int, int, int]
+
+# The kinds of moves. Replacements are from digit i to digit j
+_REPLACE_FIRST, _REPLACE_SECOND, _SWAP_DIGITS, _SWAP_ALPHABET, _SWAP_KEY = range(5)
+
+_SLASH = ord("/")
+
+# The ngram length of each ngram score, whose neighbourhoods a steepest ascent
+# first crack stage ranks with rank_mutations. See _climb
+_NGRAM_LENGTHS = {
+    monogram_score: 1,
+    bigram_score: 2,
+    trigram_score: 3,
+    quadgram_score: 4,
+    quintgram_score: 5,
+}
 
 
 class Board:
@@ -45,6 +100,20 @@ class Board:
     _board : dict[str | None, list[str | None]]
         Mapping from row key (None, digits[0], digits[1]) to a list of 10 symbols.
 
+    _tables : tuple[DecodeRow, tuple[DecodeRow, DecodeRow]] | None
+        The decode tables, compiled on first use. See `decode_tables`.
+
+    _inverse : dict[str, str] | None
+        The code of each symbol, compiled on first use. See `invert`.
+
+    _encoding : dict[int, str] | None
+        The str.translate table of the codes, compiled on first use. See
+        `encode_table`.
+
+    _compiled : _Compiled | None
+        The parse structure and translate table, compiled on first use. See
+        `_compile`.
+
     Raises
     ------
     ValueError
@@ -98,6 +167,11 @@ class Board:
             digits[1]: [next(it) for _ in range(10)],
         }
 
+        self._tables: tuple[DecodeRow, tuple[DecodeRow, DecodeRow]] | None = None
+        self._inverse: dict[str, str] | None = None
+        self._encoding: dict[int, str] | None = None
+        self._compiled: _Compiled | None = None
+
     def __getitem__(self, key: str) -> str:
         """
         Retrieve a character from the board given its numeric code.
@@ -119,18 +193,144 @@ class Board:
         ValueError
             If the board does not contain a character for the given key
         """
+        if (d := self.get(key)) is None:
+            raise ValueError("invalid board for decryption")
+
+        return d
+
+    def get(self, key: str) -> str | None:
+        """
+        Retrieve a character from the board given its numeric code, without
+        raising if the board has no character for it.
+
+        Parameters
+        ----------
+        key : str
+            A one or two digit string. See `__getitem__`.
+
+        Returns
+        -------
+        str | None
+            The corresponding character, or None if there is none.
+        """
+        single, rows = self.decode_tables
+        if not key.isascii() or not key.isdigit() or not 0 < len(key) < 3:
+            return None
+
+        s = single[int(key[0])]
         if len(key) == 2:
-            row = self._board[key[0]]
-        else:
-            row = self._board[None]
+            s = rows[~s][int(key[1])] if s < 0 else 0
 
-        i = self._key.index(int(key[-1]))
-        d = row[i]
+        return chr(s) if s > 0 else None
 
-        if d is None:
-            raise ValueError("invalid board for decryption")
+    @property
+    def decode_tables(self) -> tuple[DecodeRow, tuple[DecodeRow, DecodeRow]]:
+        """
+        The decode tables of the board, compiled once on first use.
 
-        return d
+        Returns
+        -------
+        tuple[DecodeRow, tuple[DecodeRow, DecodeRow]]
+            The 10-entry single-digit table, indexed by digit, and the two
+            10-entry tables of the rows labelled by digits[0] and digits[1],
+            indexed by the second digit. Entries are symbol codes, or 0 where
+            the board has no symbol. A row digit's single-digit entry is the
+            negative row number, -1 or -2, so its row is `rows[~entry]`.
+        """
+        if self._tables is None:
+            # the column of each digit, the first if a key digit repeats
+            columns: list[int | None] = [None] * 10
+            for i in reversed(range(10)):
+                if 0 <= (j := self._key[i]) < 10:
+                    columns[j] = i
+
+            top, row_a, row_b = (
+                [ord(s) if s else 0 for s in self._board[d]]
+                for d in (None, *self._digits)
+            )
+            single, row_a, row_b = (
+                [0 if i is None else row[i] for i in columns]
+                for row in (top, row_a, row_b)
+            )
+
+            for r, d in enumerate(self._digits):
+                if len(d) == 1 and d.isdigit():
+                    single[int(d)] = ~r
+
+            self._tables = (tuple(single), (tuple(row_a), tuple(row_b)))
+
+        return self._tables
+
+    def canonical(self) -> bytes:
+        """
+        Get the canonical form of the board. Boards decrypt every ciphertext
+        the same, i.e. are equivalent (see `normalize`), exactly when their
+        canonical forms are equal. It is read off the decode tables, without
+        building a normalized board.
+
+        Returns
+        -------
+        bytes
+            The symbols of the single digits, with 0 for the row digits,
+            followed by the rows of the smaller and the larger row digit.
+
+        Examples
+        --------
+        >>> board = Board(("4", "1"), [3, 1, 4, 5, 9, 2, 6, 8, 7, 0], keyword="CODE")
+        >>> board.canonical() == board.normalize().canonical()
+        True
+        """
+        single, (row_a, row_b) = self.decode_tables
+        if -1 in single and -2 in single and single.index(-1) > single.index(-2):
+            row_a, row_b = row_b, row_a
+
+        return bytes(max(s, 0) for s in single + row_a + row_b)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Check whether two boards are equivalent. See `canonical`.
+
+        Parameters
+        ----------
+        other : object
+            The other board.
+
+        Returns
+        -------
+        bool
+            Whether the boards decrypt every ciphertext the same.
+        """
+        if not isinstance(other, Board):
+            return NotImplemented
+
+        return self.canonical() == other.canonical()
+
+    def __hash__(self) -> int:
+        """
+        Get the hash of the board, equal for equivalent boards.
+
+        Returns
+        -------
+        int
+            The hash of the canonical form.
+        """
+        return hash(self.canonical())
+
+    def _compile(self) -> _Compiled:
+        """
+        The parse structure and translate table of the board, compiled once
+        on first use.
+
+        Returns
+        -------
+        _Compiled
+            The structure and table, see `_compile`.
+        """
+        if self._compiled is None:
+            single, (row_a, row_b) = self.decode_tables
+            self._compiled = _compile(single + row_a + row_b)
+
+        return self._compiled
 
     def invert(self) -> dict[str, str]:
         """
@@ -141,13 +341,34 @@ class Board:
         dict[str, str]
             Dictionary mapping characters to corresponding digits.
         """
-        out: dict[str, str] = dict()
-        for k, row in self._board.items():
-            c = "" if k is None else k
-            for i, j in enumerate(self._key):
-                if (s := row[i]) is not None:
-                    out[s] = c + str(j)
-        return out
+        if self._inverse is None:
+            self._inverse = {}
+            for k, row in self._board.items():
+                c = "" if k is None else k
+                for i, j in enumerate(self._key):
+                    if (s := row[i]) is not None:
+                        self._inverse[s] = c + str(j)
+
+        return dict(self._inverse)
+
+    @property
+    def encode_table(self) -> dict[int, str]:
+        """
+        The encode table of the board, compiled once on first use.
+
+        Returns
+        -------
+        dict[int, str]
+            The str.translate table mapping both cases of every letter, and
+            '.', to its code, and every other ASCII character to "". It is
+            shared, and must not be modified.
+        """
+        if self._encoding is None:
+            codes = {s: c for s, c in self.invert().items() if s != "/"}
+            codes |= {s.lower(): c for s, c in codes.items() if s.isalpha()}
+            self._encoding = {i: codes.get(chr(i), "") for i in range(128)}
+
+        return self._encoding
 
     def normalize(self) -> Board:
         """
@@ -227,33 +448,47 @@ class Board:
         return "\n".join((key_row, no_row, a_row, b_row))
 
     @staticmethod
-    def random() -> Board:
+    def random(rng: Random | None = None) -> Board:
         """
         Generate a randomized Board.
 
+        Parameters
+        ----------
+        rng : Random | None, default=None
+            Random number generator to draw from. If None, a new generator
+            seeded from system entropy is used.
+
         Returns
         -------
         Board
             A Board with random digits, key, and alphabet.
         """
-        a = randint(0, 9)
-        while (b := randint(0, 9)) == a:
+        rng = make_rng(rng)
+
+        a = rng.randint(0, 9)
+        while (b := rng.randint(0, 9)) == a:
             ...
 
         digs = (str(a), str(b))
 
         key = list(range(10))
-        shuffle(key)
+        rng.shuffle(key)
 
         alph = list(ascii_uppercase)
-        shuffle(alph)
+        rng.shuffle(alph)
 
         return Board(digs, key, keyword="".join(alph))
 
-    def random_mutation(self) -> Board:
+    def random_mutation(self, rng: Random | None = None) -> Board:
         """
         Get a random mutation of this board.
 
+        Parameters
+        ----------
+        rng : Random | None, default=None
+            Random number generator to draw from. If None, a new generator
+            seeded from system entropy is used.
+
         Returns
         -------
         Board
@@ -261,19 +496,21 @@ class Board:
 
         Notes
         -----
-        There are a total of 432 possible mutations:
-        * 9 digit mutations (8 replace, 1 swap)
+        There are a total of 440 possible mutations:
+        * 17 digit mutations (16 replace, 1 swap)
         * 45 key mutations
         * 378 alphabet mutations
         """
-        r = randint(0, 2)
+        rng = make_rng(rng)
+
+        r = rng.randint(0, 2)
         if r == 0:
-            r = randint(0, 2)
+            r = rng.randint(0, 2)
             a, b = self._digits
             if r == 0:  # swap digits
                 return Board((b, a), self.key, keyword=self._alphabet)
 
-            i = choice(tuple(set(map(str, range(10))) - set(self._digits)))
+            i = rng.choice([d for d in "0123456789" if d not in self._digits])
             if r == 1:  # replace first digit
                 return Board((i, b), self.key, keyword=self._alphabet)
 
@@ -281,20 +518,56 @@ class Board:
 
         if r == 1:
             key = self.key
-            a, b = choice(tuple(combinations(range(len(key)), 2)))
+            a, b = random_swap(len(key), rng)
             key[a], key[b] = key[b], key[a]
             return Board(self._digits, key, keyword=self._alphabet)
 
         # r == 2
         alph = list(self._alphabet)
-        a, b = choice(tuple(combinations(range(len(alph)), 2)))
+        a, b = random_swap(len(alph), rng)
         alph[a], alph[b] = alph[b], alph[a]
         return Board(self._digits, self.key, keyword="".join(alph))
 
-    def mutate(self) -> Iterator[Board]:
+    def crossover(self, other: Board, rng: Random) -> Board:
+        """
+        Combine this Board with another into a child Board.
+
+        The digits are taken from either parent at random, while the key and
+        the alphabet are combined with order crossover so they remain valid
+        permutations.
+
+        Parameters
+        ----------
+        other : Board
+            The other parent Board.
+
+        rng : Random
+            Random number generator to draw from.
+
+        Returns
+        -------
+        Board
+            The child Board.
+        """
+        digits = self._digits if rng.randint(0, 1) else other.digits
+        key = order_crossover(self._key, other.key, rng)
+        alph = order_crossover(self._alphabet, other.alphabet, rng)
+        return Board(digits, key, keyword="".join(alph))
+
+    # number of mutations of a Board, see mutate
+    MUTATIONS = 440
+
+    def mutate(self, rng: Random | None = None) -> Iterator[Board]:
         """
         Generate all mutations of this Board.
 
+        Parameters
+        ----------
+        rng : Random | None, default=None
+            If given, the mutations are generated lazily in a random order
+            drawn from it, for stochastic hill climbing. Otherwise they are
+            generated in a fixed order.
+
         Returns
         -------
         Iterator[Board]
@@ -302,27 +575,382 @@ class Board:
 
         Notes
         -----
-        There are a total of 432 possible mutations:
-        * 9 digit mutations (8 replace, 1 swap)
+        There are a total of 440 possible mutations:
+        * 17 digit mutations (16 replace, 1 swap)
         * 45 key mutations
         * 378 alphabet mutations
         """
+        if rng is None:
+            order = range(Board.MUTATIONS)
+        else:
+            order = shuffled_range(Board.MUTATIONS, rng)
+
+        for k in order:
+            yield self._mutation(k)
+
+    def _mutation(self, k: int) -> Board:
+        """
+        Get the k-th mutation of this Board.
+
+        Parameters
+        ----------
+        k : int
+            The index of the mutation, in range(Board.MUTATIONS).
+
+        Returns
+        -------
+        Board
+            A new Board with the mutation.
+        """
         a, b = self._digits
-        for i in map(str, range(10)):
-            if i not in self._digits:
-                yield Board((a, i), self.key, keyword=self._alphabet)
-                yield Board((i, b), self.key, keyword=self._alphabet)
-        yield Board((b, a), self.key, keyword=self._alphabet)
+        if k < 16:  # replace a digit
+            i = [d for d in "0123456789" if d not in self._digits][k // 2]
+            digits = (a, i) if k % 2 == 0 else (i, b)
+            return Board(digits, self.key, keyword=self._alphabet)
 
-        for a, b in combinations(range(len(self._alphabet)), 2):
+        if k == 16:  # swap digits
+            return Board((b, a), self.key, keyword=self._alphabet)
+
+        if k < 17 + 378:  # swap alphabet
+            i, j = unrank_pair(k - 17)
             alph = list(self._alphabet)
-            alph[a], alph[b] = alph[b], alph[a]
-            yield Board(self._digits, self.key, keyword="".join(alph))
+            alph[i], alph[j] = alph[j], alph[i]
+            return Board(self._digits, self.key, keyword="".join(alph))
 
-        for a, b in combinations(range(len(self._key)), 2):
-            key = self.key
-            key[a], key[b] = key[b], key[a]
-            yield Board(self._digits, key, keyword=self._alphabet)
+        # swap key
+        i, j = unrank_pair(k - 17 - 378)
+        key = self.key
+        key[i], key[j] = key[j], key[i]
+        return Board(self._digits, key, keyword=self._alphabet)
+
+
+class MutableBoard:
+    """
+    A straddling checkerboard that is changed in place by moves, for search
+    loops. Trying a neighbour applies a move and undoes it afterwards, so no
+    board is built per neighbour, and the decode tables of the board are
+    patched rather than rebuilt for alphabet swaps, the most common move.
+
+    Parameters
+    ----------
+    board : Board
+        The board to start from.
+
+    Examples
+    --------
+    >>> board = MutableBoard(Board(("1", "4"), keyword="ASINTOER"))
+    >>> board.apply(move := board.move(17))  # swap the first two symbols
+    >>> board.freeze().alphabet[:8]
+    'SAINTOER'
+    >>> board.undo(move)
+    >>> board.freeze().alphabet[:8]
+    'ASINTOER'
+    """
+
+    __slots__ = ("_alphabet", "_cells", "_compiled", "_digits", "_key", "_last")
+
+    def __init__(self, board: Board):
+        self._digits = [int(d) for d in board.digits]
+        self._key = board.key
+        self._alphabet = list(board.alphabet)
+
+        # compiled on first use, see _compile
+        self._compiled: _Compiled | None = None
+
+        # the code of each alphabet symbol, 0-9 for the single digits and
+        # 10 + 10 * r + d for digit d of row r, set when compiled
+        self._cells: list[int] = []
+
+        # the last move of random_mutation, see revert
+        self._last: Move | None = None
+
+    def copy(self) -> MutableBoard:
+        """
+        Get an independent copy of this board.
+
+        Returns
+        -------
+        MutableBoard
+            The copy.
+        """
+        out = MutableBoard.__new__(MutableBoard)
+        out._digits = self._digits.copy()
+        out._key = self._key.copy()
+        out._alphabet = self._alphabet.copy()
+        out._compiled = None
+        out._cells = []
+        out._last = None
+        return out
+
+    def freeze(self) -> Board:
+        """
+        Get the Board this board is currently equal to.
+
+        Returns
+        -------
+        Board
+            The Board.
+        """
+        a, b = self.digits
+        return Board((a, b), self._key.copy(), keyword="".join(self._alphabet))
+
+    @staticmethod
+    def random(rng: Random | None = None) -> MutableBoard:
+        """
+        Generate a randomized board. See `Board.random`.
+
+        Parameters
+        ----------
+        rng : Random | None, default=None
+            Random number generator to draw from. If None, a new generator
+            seeded from system entropy is used.
+
+        Returns
+        -------
+        MutableBoard
+            A board with random digits, key, and alphabet.
+        """
+        return MutableBoard(Board.random(rng))
+
+    @property
+    def digits(self) -> tuple[str, str]:
+        """
+        The digits that label the second and third rows of the board.
+
+        Returns
+        -------
+        tuple[str, str]
+            The digit labels.
+        """
+        a, b = self._digits
+        return str(a), str(b)
+
+    def canonical(self) -> bytes:
+        """
+        Get the canonical form of the board, equal to that of the current
+        Board (see `Board.canonical`) but read off the translate table.
+
+        Returns
+        -------
+        bytes
+            The canonical form.
+        """
+        _, table = self._compile()
+        top = table[_CODE_ID : _CODE_ID + 10]
+        row_a = table[_CODE_ID + 10 : _CODE_ID + 20]
+        row_b = table[_CODE_ID + 20 : _CODE_ID + 30]
+
+        a, b = self._digits
+        return bytes(top + row_a + row_b if a < b else top + row_b + row_a)
+
+    def move(self, k: int) -> Move:
+        """
+        Get the k-th move from the current state of this board, in the order
+        of `Board.mutate`.
+
+        Parameters
+        ----------
+        k : int
+            The index of the move, in range(Board.MUTATIONS).
+
+        Returns
+        -------
+        Move
+            The move, for `apply` and `undo`.
+        """
+        a, b = self._digits
+        if k < 16:  # replace a digit
+            i = [d for d in range(10) if d != a and d != b][k // 2]
+            return (_REPLACE_SECOND, b, i) if k % 2 == 0 else (_REPLACE_FIRST, a, i)
+
+        if k == 16:
+            return (_SWAP_DIGITS, 0, 1)
+
+        if k < 17 + 378:
+            return (_SWAP_ALPHABET, *unrank_pair(k - 17))
+
+        return (_SWAP_KEY, *unrank_pair(k - 17 - 378))
+
+    def random_move(self, rng: Random) -> Move:
+        """
+        Draw a random move from the current state of this board, with the
+        distribution of `Board.random_mutation`.
+
+        Parameters
+        ----------
+        rng : Random
+            Random number generator to draw from.
+
+        Returns
+        -------
+        Move
+            The move, for `apply` and `undo`.
+        """
+        r = rng.randint(0, 2)
+        if r == 0:
+            r = rng.randint(0, 2)
+            if r == 0:
+                return (_SWAP_DIGITS, 0, 1)
+
+            a, b = self._digits
+            i = rng.choice([d for d in range(10) if d != a and d != b])
+            return (_REPLACE_FIRST, a, i) if r == 1 else (_REPLACE_SECOND, b, i)
+
+        if r == 1:
+            return (_SWAP_KEY, *random_swap(len(self._key), rng))
+
+        return (_SWAP_ALPHABET, *random_swap(len(self._alphabet), rng))
+
+    def apply(self, move: Move):
+        """
+        Apply a move to this board, in place.
+
+        Parameters
+        ----------
+        move : Move
+            The move, from `move` or `random_move` on the current state.
+        """
+        kind, i, j = move
+        if kind == _SWAP_ALPHABET:
+            alph = self._alphabet
+            alph[i], alph[j] = alph[j], alph[i]
+            if self._compiled is not None:
+                self._patch(i, j)
+            return
+
+        if kind == _SWAP_KEY:
+            key = self._key
+            key[i], key[j] = key[j], key[i]
+        elif kind == _SWAP_DIGITS:
+            self._digits.reverse()
+        else:
+            self._digits[kind] = j
+
+        self._compiled = None
+
+    def undo(self, move: Move):
+        """
+        Undo a move applied to this board, in place.
+
+        Parameters
+        ----------
+        move : Move
+            The move that was last applied.
+        """
+        kind, i, j = move
+        if kind == _REPLACE_FIRST or kind == _REPLACE_SECOND:
+            self.apply((kind, j, i))
+        else:
+            self.apply(move)  # swaps undo themselves
+
+    def mutate(self, rng: Random | None = None) -> Iterator[MutableBoard]:
+        """
+        Generate all mutations of this board, in place: each yields this board
+        with one move applied, and the move is undone when the next is asked
+        for or the iteration is stopped. Copy a mutation to keep it.
+
+        Parameters
+        ----------
+        rng : Random | None, default=None
+            If given, the mutations are generated in a random order drawn from
+            it. Otherwise they are generated in the order of `Board.mutate`.
+
+        Returns
+        -------
+        Iterator[MutableBoard]
+            A generator yielding this board once per mutation.
+        """
+        if rng is None:
+            order = range(Board.MUTATIONS)
+        else:
+            order = shuffled_range(Board.MUTATIONS, rng)
+
+        for k in order:
+            move = self.move(k)
+            self.apply(move)
+            try:
+                yield self
+            finally:
+                self.undo(move)
+
+    def random_mutation(self, rng: Random | None = None) -> MutableBoard:
+        """
+        Apply a random move to this board, in place. It can be undone with
+        `revert`.
+
+        Parameters
+        ----------
+        rng : Random | None, default=None
+            Random number generator to draw from. If None, a new generator
+            seeded from system entropy is used.
+
+        Returns
+        -------
+        MutableBoard
+            This board.
+        """
+        self._last = self.random_move(make_rng(rng))
+        self.apply(self._last)
+        return self
+
+    def revert(self):
+        """
+        Undo the last move of `random_mutation`, if it was not undone yet.
+        """
+        if self._last is not None:
+            self.undo(self._last)
+            self._last = None
+
+    def _compile(self) -> _Compiled:
+        """
+        The parse structure and translate table of the board, compiled on
+        first use after a move that changes the parse. Alphabet swaps that do
+        not move '/' only patch the table.
+
+        Returns
+        -------
+        _Compiled
+            The structure and table, see `_compile`.
+        """
+        if self._compiled is not None:
+            return self._compiled
+
+        a, b = self._digits
+        cells = [j for j in self._key if j != a and j != b]
+        cells += [10 + 10 * r + j for r in (0, 1) for j in self._key]
+
+        codes = [0] * 30
+        for c, s in zip(cells, self._alphabet):
+            codes[c] = ord(s)
+
+        codes[a] = -1
+        codes[b] = -2
+
+        self._cells = cells
+        self._compiled = _compile(codes)
+        return self._compiled
+
+    def _patch(self, i: int, j: int):
+        """
+        Patch the compiled translate table after swapping two symbols. The
+        parse structure only changes if one of them is '/'.
+
+        Parameters
+        ----------
+        i : int
+            The alphabet position of the first symbol.
+
+        j : int
+            The alphabet position of the second symbol.
+        """
+        alph = self._alphabet
+        if alph[i] == "/" or alph[j] == "/":
+            self._compiled = None
+            return
+
+        _, table = self._compiled  # type: ignore[misc]
+        table[_CODE_ID + self._cells[i]] = ord(alph[i])
+        table[_CODE_ID + self._cells[j]] = ord(alph[j])
 
 
 def encrypt(plaintext: str, board: Board, *, digit_escape: str = "single") -> str:
@@ -332,7 +960,8 @@ def encrypt(plaintext: str, board: Board, *, digit_escape: str = "single") -> st
     Parameters
     ----------
     plaintext : str
-        Input plaintext. Characters that are not alphanumeric are skipped.
+        Input plaintext. Characters other than the letters A-Z and a-z, the
+        digits 0-9 and '.' are skipped.
 
     board : Board
         The board used for encoding.
@@ -362,35 +991,33 @@ def encrypt(plaintext: str, board: Board, *, digit_escape: str = "single") -> st
     '4460196510403164361965487136604116153648'
     """
 
-    inv_board = board.invert()
-
-    out = ""
-
-    i = 0
-    while i < len(plaintext):
-        c = plaintext[i]
-        if c.isnumeric():
-            if digit_escape == "single":
-                out += inv_board["/"]
-                out += c
-            elif digit_escape == "double" or digit_escape == "triple":
-                s = inv_board["/"]
-                if len(s) != 2:
-                    raise ValueError("cannot digit escape with given board")
-                out += s
-                mul = 2 if digit_escape == "double" else 3
-                while (c := plaintext[i]).isnumeric() and i < len(plaintext):
-                    out += str(c) * mul
-                    i += 1
-                out += s
-                i -= 1  # undo since plaintext[i] is not numeric
-            else:
-                raise ValueError(f"unsupported digit escape: {digit_escape}")
-        elif c.isalpha() or c == ".":
-            out += inv_board[c.upper()]
-        i += 1
+    if digit_escape not in ("single", "double", "triple"):
+        raise ValueError(f"unsupported digit escape: {digit_escape}")
+
+    # one pass, translating the text between the digit runs in one call each
+    table = board.encode_table
+    slash = ""
+    parts = _DIGIT_RUNS.split(plaintext)
+    out: list[str] = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            if not part.isascii():
+                part = part.encode("ascii", "ignore").decode("ascii")
+            out.append(part.translate(table))
+            continue
+
+        if not slash:
+            slash = board.invert()["/"]
+            if digit_escape != "single" and len(slash) != 2:
+                raise ValueError("cannot digit escape with given board")
+
+        if digit_escape == "single":
+            out.append(slash + slash.join(part))
+        else:
+            repeats = 2 if digit_escape == "double" else 3
+            out.append(slash + "".join(d * repeats for d in part) + slash)
 
-    return out
+    return "".join(out)
 
 
 def decrypt(ciphertext: str, board: Board, *, digit_escape: str = "single") -> str:
@@ -430,82 +1057,689 @@ def decrypt(ciphertext: str, board: Board, *, digit_escape: str = "single") -> s
     'WEAREDISCOVERED.FLEEATONCE.'
     """
 
-    out = ""
-
-    i = 0
-    while i < len(ciphertext):
-        c = ciphertext[i]
-        if c in board.digits:
-            i += 1
-            c += ciphertext[i]
-
-        d = board[c]
-
-        if d == "/":
-            i += 1
-            if digit_escape == "single":
-                out += ciphertext[i]
-                i += 1
-            elif digit_escape == "double" or digit_escape == "triple":
-                span = 2 if digit_escape == "double" else 3
-                while ciphertext[i] * span == ciphertext[i : i + span]:
-                    out += ciphertext[i]
-                    i += span
-                if ciphertext[i : i + 2] != c:
-                    raise ValueError("unterminated digit escape")
-                i += 2
-            else:
-                raise ValueError(f"unsupported digit escape: {digit_escape}")
+    if (out := try_decrypt(ciphertext, board, digit_escape=digit_escape)) is None:
+        raise ValueError("ciphertext does not decode with the given board")
+
+    return out
+
+
+def try_decrypt(
+    ciphertext: str, board: Board | MutableBoard, *, digit_escape: str = "single"
+) -> str | None:
+    """
+    Decrypt ciphertext with the given Board, returning None instead of raising
+    when the ciphertext does not decode. This is the form used by the search
+    loops, where most candidate boards fail to decode.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to decrypt.
+
+    board: Board | MutableBoard
+        The board to use for decryption.
+
+    digit_escape : str, default="single"
+        Must match what was used for encryption. See decrypt for more info.
+
+    Returns
+    -------
+    str | None
+        The resultant plaintext, or None if the ciphertext does not decode.
+
+    Raises
+    ------
+    ValueError
+       If `digit_escape` is not one of the supported modes.
+    """
+    if digit_escape not in ("single", "double", "triple"):
+        raise ValueError(f"unsupported digit escape: {digit_escape}")
+
+    return _decode(
+        ciphertext, board, digit_escape == "single", 2 + (digit_escape == "triple")
+    )
+
+
+def _compile(codes: Sequence[int]) -> _Compiled:
+    """
+    Compile the decode tables of a board into a parse structure and a
+    translate table.
+
+    The structure is all that parsing a ciphertext into codes depends on, so
+    boards that differ only in which symbols their codes stand for, e.g. after
+    swapping two symbols, share their parses. See `_parse`.
+
+    Parameters
+    ----------
+    codes : Sequence[int]
+        The single-digit decode table followed by the decode tables of the two
+        rows, 30 entries. See `Board.decode_tables`.
+
+    Returns
+    -------
+    _Compiled
+        The structure, which is for each code its code id, the row number (1
+        or 2) of a row digit, 47 ('/') for the code of '/', or 0 if it has no
+        symbol. And the bytes.translate table from code ids to symbols, which
+        keeps every other byte.
+    """
+    structure = bytearray(30)
+    table = bytearray(range(256))
+    table[_CODE_ID : _CODE_ID + 30] = bytes(30)
+
+    for c, s in enumerate(codes):
+        if s < 0:
+            structure[c] = -s
+        elif s > 0:
+            structure[c] = _SLASH if s == _SLASH else _CODE_ID + c
+            table[_CODE_ID + c] = s
+
+    return bytes(structure), table
+
+
+@lru_cache(maxsize=1024)
+def _parse(
+    ciphertext: str, structure: bytes, single_escape: bool, span: int
+) -> bytes | None:
+    """
+    Parse the ciphertext into code ids by walking its digits through the
+    structure of a board, writing them into a preallocated buffer. Parses
+    are cached, so boards with the same structure parse a ciphertext once.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to parse.
+
+    structure : bytes
+        The parse structure of the board, see `_compile`.
+
+    single_escape : bool
+        Whether digits are escaped singly. Otherwise they are repeated `span`
+        times between two escape codes.
+
+    span : int
+        The number of copies of each escaped digit, if not escaped singly.
+
+    Returns
+    -------
+    bytes | None
+        The code id of each code, with escaped digits kept as ASCII digits
+        and their escape codes dropped, or None if the ciphertext does not
+        parse.
+    """
+    # the structure indexed by digit byte, with 0 for every other byte
+    single = [0] * 256
+    rows = ([0] * 256, [0] * 256)
+    labels = [b"", b""]
+    escape = b""
+
+    for c, s in enumerate(structure):
+        r, d = divmod(c, 10)
+        if r == 0 and s in (1, 2):
+            single[48 + d] = -s
+            labels[s - 1] = b"%d" % d
+        else:
+            (rows[r - 1] if r else single)[48 + d] = s
+
+    if _SLASH in structure:
+        r, d = divmod(structure.index(_SLASH), 10)
+        escape = (labels[r - 1] if r else b"") + b"%d" % d
+
+    data = ciphertext.encode("ascii", "replace")
+
+    # the parse is never longer than the ciphertext
+    out = bytearray(len(data))
+    j = 0
+
+    digits = iter(data)
+    while True:
+        for d in digits:
+            s = single[d]
+            if s < 0:
+                s = rows[~s][next(digits, 0)]
+            if not s:
+                return None
+            if s == _SLASH:
+                break
+            out[j] = s
+            j += 1
         else:
-            out += d
-            i += 1
+            del out[j:]
+            return bytes(out)
+
+        if single_escape:
+            if (c := next(digits, None)) is None:
+                return None
+            out[j] = c
+            j += 1
+            continue
+
+        while (group := bytes(islice(digits, span))) and group[:1] * span == group:
+            out[j] = group[0]
+            j += 1
+
+        if group[: len(escape)] != escape:
+            return None  # unterminated digit escape
+
+        # give back what was read past the escape code
+        digits = chain(group[len(escape) :], digits)
+
+
+def _decode(
+    ciphertext: str, board: Board | MutableBoard, single_escape: bool, span: int
+) -> str | None:
+    """
+    Decode the ciphertext with a board: parse it into codes, which is cached
+    per parse structure, then translate the codes to symbols in one pass.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to decode.
+
+    board : Board | MutableBoard
+        The board to use for decryption.
 
+    single_escape : bool
+        Whether digits are escaped singly. See `_parse`.
+
+    span : int
+        The number of copies of each escaped digit. See `_parse`.
+
+    Returns
+    -------
+    str | None
+        The plaintext, or None if the ciphertext does not decode.
+    """
+    structure, table = board._compile()
+    if (codes := _parse(ciphertext, structure, single_escape, span)) is None:
+        return None
+
+    return codes.translate(table).decode("latin-1")
+
+
+@cache
+def _bytes_table(n: int) -> dict[bytes, float]:
+    """
+    Get the log probabilities of the ngram data of the given length, keyed by
+    the ASCII bytes of the ngrams. See `ngram_table`.
+
+    Parameters
+    ----------
+    n : int
+        The ngram length, 1 to 5.
+
+    Returns
+    -------
+    dict[bytes, float]
+        The mapping of each ngram to its log10 probability.
+    """
+    data, _ = ngram_table(n)
+    return {k.encode(): v for k, v in data.items()}
+
+
+def rank_mutations(
+    ciphertext: str,
+    board: Board | MutableBoard,
+    *,
+    n: int = 3,
+    digit_escape: str = "single",
+) -> list[tuple[int, float]]:
+    """
+    Score every mutation of the board by the ngram score of its decryption,
+    for steepest ascent, without decoding and scoring each one in turn.
+
+    Swapping two symbols of the board, the most common mutation, keeps the
+    parse of the ciphertext and swaps the two symbols in the plaintext. So
+    those mutations are scored together from the ngram counts of this
+    board's plaintext: only the ngrams containing either symbol change, and
+    they are rescored by a few map passes. Each other mutation changes the
+    parse, and is decoded and scored on its own.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to decrypt.
+
+    board : Board | MutableBoard
+        The board whose mutations are scored. It is not changed.
+
+    n : int, default=3
+        The ngram length of the score, 1 to 5. See `ngram_table`.
+
+    digit_escape : str, default="single"
+        Digit escape when decrypting. See decrypt for more info.
+
+    Raises
+    ------
+    ValueError
+        If `digit_escape` is not one of the supported modes, or there is no
+        ngram data of length n.
+
+    Returns
+    -------
+    list[tuple[int, float]]
+        The index of each mutation whose decryption succeeds, in the order of
+        `Board.mutate` (see `MutableBoard.move`), and its score, best first.
+
+    Examples
+    --------
+    >>> board = Board(("1", "4"), keyword="ASINTOER")
+    >>> enc = encrypt("ATTACKTHEEASTWALLOFTHECASTLEATDAWN", board)
+    >>> near = list(board.mutate())[17]  # A and S swapped
+    >>> decrypt(enc, near)
+    'STTSCKTHEESATWSLLOFTHECSATLESTDSWN'
+    >>> k, score = rank_mutations(enc, near)[0]
+    >>> decrypt(enc, list(near.mutate())[k])
+    'ATTACKTHEEASTWALLOFTHECASTLEATDAWN'
+    """
+    if digit_escape not in ("single", "double", "triple"):
+        raise ValueError(f"unsupported digit escape: {digit_escape}")
+
+    single_escape, span = digit_escape == "single", 2 + (digit_escape == "triple")
+    data, floor = ngram_table(n)
+
+    def ngrams_of(text: str) -> Iterator[str]:
+        """
+        Get the overlapping ngrams of the text.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+
+        Returns
+        -------
+        Iterator[str]
+            The ngrams, in order.
+        """
+        return map("".join, zip(*(text[i:] for i in range(n))))
+
+    def score(text: str) -> float:
+        """
+        Score the text by the sum of the log probabilities of its ngrams.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+
+        Returns
+        -------
+        float
+            The score.
+        """
+        return sum(map(data.get, ngrams_of(text), repeat(floor)), 0.0)
+
+    mutable = MutableBoard(board) if isinstance(board, Board) else board.copy()
+    symbols = "".join(mutable._alphabet).encode()
+
+    # the distinct ngrams of the plaintext that each symbol occurs in, as
+    # bytes, which are swapped by the fast bytes.translate
+    text = _decode(ciphertext, mutable, single_escape, span)
+    base = 0.0 if text is None else score(text)
+    data_bytes = _bytes_table(n)
+    counts = Counter(map(str.encode, ngrams_of(text or "")))
+    weighted = {g: c * data_bytes.get(g, floor) for g, c in counts.items()}
+    occurs: list[set[bytes]] = [set() for _ in range(256)]
+    for ngram in counts:
+        for s in ngram:
+            occurs[s].add(ngram)
+
+    out: list[tuple[int, float]] = []
+    for k in range(Board.MUTATIONS):
+        kind, i, j = move = mutable.move(k)
+        x, y = symbols[i], symbols[j]
+        if kind == _SWAP_ALPHABET and x != _SLASH and y != _SLASH:
+            if text is None:
+                continue  # the parse is the same, so it fails too
+
+            changed = occurs[x] | occurs[y]
+            table = bytes.maketrans(bytes((x, y)), bytes((y, x)))
+            swapped = map(bytes.translate, changed, repeat(table))
+            new = map(data_bytes.get, swapped, repeat(floor))
+            old = sum(map(weighted.__getitem__, changed))
+            out.append(
+                (k, base - old + sum(map(mul, map(counts.__getitem__, changed), new)))
+            )
+            continue
+
+        mutable.apply(move)
+        try:
+            if (plain := _decode(ciphertext, mutable, single_escape, span)) is not None:
+                out.append((k, score(plain)))
+        finally:
+            mutable.undo(move)
+
+    out.sort(key=lambda m: m[1], reverse=True)
     return out
 
 
+def _climb(
+    ciphertext: str,
+    score: Callable[[str], float],
+    digit_escape: str,
+    dedupe: bool,
+    steepest: bool,
+    seed: int,
+) -> tuple[float, str, Board, SearchStats]:
+    """
+    Run one restart of the first crack stage. This is module level so it can
+    be sent to worker processes.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    score : Callable[[str], float]
+        The scoring function.
+
+    digit_escape : str
+        Digit escape when decrypting. See decrypt for more info.
+
+    dedupe : bool
+        Whether to skip boards equivalent to one already scored.
+
+    steepest : bool
+        Whether to take the best mutation at each step rather than the first
+        that improves.
+
+    seed : int
+        The seed of the restart.
+
+    Returns
+    -------
+    tuple[float, str, Board, SearchStats]
+        The score, plaintext and Board found, and the counters of the search.
+    """
+    stats = SearchStats()
+    decrypt = partial(try_decrypt, digit_escape=digit_escape)
+
+    def ranked(board: MutableBoard) -> Iterator[MutableBoard]:
+        """
+        Generate the mutations of the board that improve its ngram score, best
+        first, in place like `MutableBoard.mutate`. They are ranked at once by
+        `rank_mutations`, so a steepest ascent step decodes only the few boards
+        it tries rather than every neighbour.
+
+        Parameters
+        ----------
+        board : MutableBoard
+            The board, which is changed in place.
+
+        Returns
+        -------
+        Iterator[MutableBoard]
+            A generator yielding the board once per improving mutation.
+        """
+        moves = rank_mutations(ciphertext, board, n=n, digit_escape=digit_escape)
+        stats.evaluations += len(moves)
+
+        current = score(text) if (text := decrypt(ciphertext, board)) else -inf
+        for k, sc in moves:
+            if sc <= current:
+                return
+
+            move = board.move(k)
+            board.apply(move)
+            try:
+                yield board
+            finally:
+                board.undo(move)
+
+    # the search moves a MutableBoard in place rather than building a Board
+    # per neighbour. The first ranked mutation that improves is the best one,
+    # so ranked steepest ascent needs no try_all
+    n = _NGRAM_LENGTHS.get(score) if steepest else None
+    text, board = hill_climb(
+        ciphertext,
+        MutableBoard.random,
+        MutableBoard.mutate if n is None else ranked,
+        decrypt,
+        score,
+        copy=MutableBoard.copy,
+        canonical=MutableBoard.canonical if dedupe else None,
+        restarts=1,
+        try_all=steepest and n is None,
+        rng=seed,
+        stats=stats,
+    )
+
+    return score(text), text, board.freeze(), stats
+
+
+def _refine(
+    ciphertext: str,
+    score: Callable[[str], float],
+    digit_escape: str,
+    timeout: float | None,
+    schedule: Callable[[], Schedule] | None,
+    start: tuple[Board, int],
+) -> tuple[float, str, Board]:
+    """
+    Run the second crack stage from a board found by the first. This is
+    module level so it can be sent to worker processes.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    score : Callable[[str], float]
+        The scoring function.
+
+    digit_escape : str
+        Digit escape when decrypting. See decrypt for more info.
+
+    timeout : float | None
+        Wall-clock seconds after which the annealing stops, or None.
+
+    schedule : Callable[[], Schedule] | None
+        The factory of the cooling schedule, or None for anneal's default.
+
+    start : tuple[Board, int]
+        The board to start from, and the seed of the annealing.
+
+    Returns
+    -------
+    tuple[float, str, Board]
+        The score, plaintext and Board found.
+    """
+    board, seed = start
+    text, key = anneal(
+        ciphertext,
+        lambda _: MutableBoard(board),
+        MutableBoard.random_mutation,
+        partial(try_decrypt, digit_escape=digit_escape),
+        score,
+        copy=MutableBoard.copy,
+        revert=MutableBoard.revert,
+        schedule=None if schedule is None else schedule(),
+        timeout=timeout,
+        rng=seed,
+    )
+
+    return score(text), text, key.freeze()
+
+
+def _run(
+    pool: ProcessPoolExecutor | None,
+    fn: Callable[[T], R],
+    args: list[T],
+    budget: float | None,
+) -> list[R]:
+    """
+    Call the function on each argument, in the pool if given, and stop
+    starting new calls once the wall-clock budget is spent. Calls that were
+    already started are finished, and at least one call always is.
+
+    Parameters
+    ----------
+    pool : ProcessPoolExecutor | None
+        The pool to run the calls in, or None to run them in this process.
+
+    fn : Callable[[T], R]
+        The function.
+
+    args : list[T]
+        The arguments of the calls.
+
+    budget : float | None
+        The budget in seconds, or None for no limit.
+
+    Returns
+    -------
+    list[R]
+        The results of the finished calls, in the order of their arguments.
+    """
+    start = monotonic()
+    if pool is None:
+        out: list[R] = []
+        for arg in args:
+            if out and budget is not None and monotonic() - start > budget:
+                break
+            out.append(fn(arg))
+        return out
+
+    futures = [pool.submit(fn, arg) for arg in args]
+    if budget is not None:
+        wait(futures, timeout=budget)
+        for future in futures[1:]:
+            future.cancel()  # only cancels calls that have not started
+
+    return [f.result() for f in futures if not f.cancelled()]
+
+
 def crack(
     ciphertext: str,
     *,
     score1: Callable[[str], float] = trigram_score,
     score2: Callable[[str], float] = word_score,
     digit_escape: str = "single",
+    dedupe: bool = True,
+    steepest: bool = False,
+    restarts: int = 50,
+    top: int = 1,
+    schedule: Callable[[], Schedule] | None = None,
+    workers: int = 1,
+    timeout: float | None = None,
+    rng: Seed = None,
+    stats: SearchStats | None = None,
 ) -> tuple[str, Board]:
     """
-    Crack the ciphertext by finding the best decryption Board via annealing.
+    Crack the ciphertext by finding the best decryption Board in two stages:
+    hill climbing from random boards, then annealing from the best of them.
 
     Parameters
     ----------
     ciphertext : str
         The ciphertext to crack.
 
-    score : Callable[[str], float],default=trigram_score
-        Scoring function to use.
+    score1 : Callable[[str], float],default=trigram_score
+        Scoring function of the first stage.
+
+    score2 : Callable[[str], float],default=word_score
+        Scoring function of the second stage, which picks the result.
 
     digit_escape : str,default="single"
         Digit escape when decrypting. See decrypt for more info.
 
+    dedupe : bool, default=True
+        Whether the first stage skips boards equivalent to one it already
+        scored. See `MutableBoard.canonical`.
+
+    steepest : bool, default=False
+        Whether each hill climb of the first stage takes the best mutation at
+        each step rather than the first that improves. With an ngram score1,
+        e.g. the default trigram_score, every step ranks all 440 mutations at
+        once with `rank_mutations` instead of decoding each one, which makes
+        steepest ascent cheaper than the default first improvement climb, but
+        it reaches worse local maxima from random boards more often.
+
+    restarts : int,default=50
+        Number of hill climbs of the first stage, each from a random board.
+
+    top : int,default=1
+        Number of the best distinct boards of the first stage that are each
+        annealed in the second stage.
+
+    schedule : Callable[[], Schedule] | None, default=None
+        Factory of the cooling schedule of each annealing of the second
+        stage, e.g. Reheating. See cryptolab.utils.schedules. It must be
+        picklable with more than one worker. If None, anneal's default
+        geometric cooling is used.
+
+    workers : int,default=1
+        Number of processes that the hill climbs, and then the annealings, are
+        spread over. The scoring data is loaded before the pool starts, so
+        where workers are forked they share it rather than each loading a
+        copy. The scoring functions must be picklable (e.g. module level
+        functions). The result does not depend on it, unless a timeout cuts
+        the search short.
+
+    timeout : float | None, default=None
+        Wall-clock budget in seconds. No hill climb is started after half of
+        it, and the annealings share the rest. If None, there is no limit.
+
+    rng : int | Random | None, default=None
+        Random number generator, or a seed for one, from which every search
+        draws its own seed. Passing the same seed reproduces a run.
+
+    stats : SearchStats | None, default=None
+        If given, the first stage's number of boards scored and of duplicate
+        boards skipped are added to it.
+
     Returns
     -------
     tuple[str, Board]
         The highest scoring plaintext and corresponding Board
     """
-    dec = partial(decrypt, digit_escape=digit_escape)
-
-    _, bkey = hill_climb(
-        ciphertext,
-        Board.random,
-        Board.mutate,
-        dec,
-        score1,
-    )
-
-    return anneal(
-        ciphertext,
-        lambda: bkey,
-        Board.random_mutation,
-        dec,
-        score2,
-    )
+    rng = make_rng(rng)
+    start = monotonic()
+
+    pool = None
+    if workers > 1:
+        score1("E"), score2("E")  # load the scoring data to share it
+        pool = ProcessPoolExecutor(workers)
+
+    try:
+        seeds = [rng.getrandbits(128) for _ in range(max(1, restarts))]
+        climbs = _run(
+            pool,
+            partial(_climb, ciphertext, score1, digit_escape, dedupe, steepest),
+            seeds,
+            None if timeout is None else timeout / 2,
+        )
+
+        for *_, climb_stats in climbs:
+            if stats is not None:
+                stats.evaluations += climb_stats.evaluations
+                stats.duplicates += climb_stats.duplicates
+
+        # equal boards are equivalent, see Board.canonical
+        ranked = sorted(climbs, key=lambda c: c[0], reverse=True)
+        boards = list(dict.fromkeys(board for _, _, board, _ in ranked))[:top]
+
+        budget = None
+        if timeout is not None:
+            # the annealings run in waves of at most `workers`
+            waves = -(-len(boards) // max(1, workers))
+            budget = max(0.0, timeout - (monotonic() - start)) / waves
+
+        finals = _run(
+            pool,
+            partial(_refine, ciphertext, score2, digit_escape, budget, schedule),
+            [(board, rng.getrandbits(128)) for board in boards],
+            None,
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    _, text, board = max(finals, key=lambda f: f[0])
+    return text, board
 
 
 if __name__ == "__main__":
@@ -526,7 +1760,9 @@ if __name__ == "__main__":
 
     assert dec == plaintext
 
-    dec, board = crack(enc, digit_escape="triple")
+    stats = SearchStats()
+    dec, board = crack(enc, digit_escape="triple", workers=4, stats=stats)
+    print(f"{stats.evaluations} boards scored, {stats.duplicates} duplicates skipped")
     print(dec)
     print(" ".join(word_segments(dec)))
     print(board.normalize())
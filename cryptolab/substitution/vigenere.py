@@ -2,9 +2,39 @@
 https://en.wikipedia.org/wiki/Vigen%C3%A8re_cipher
 """
 
-from itertools import cycle
+import re
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from statistics import fmean
+from typing import AnyStr
 
-from cryptolab.substitution import caesar
+from cryptolab.scoring.ngram import quadgram_score
+from cryptolab.substitution import caesar, polyalphabetic
+from cryptolab.utils.buffers import Buffer
+from cryptolab.utils.streaming import Readable
+
+_NONLETTERS = re.compile(r"[^A-Z]+")
+
+# The longest default key length crack considers, and the fewest letters per
+# column it derives the default from on shorter texts
+_MAX_PERIOD = 100
+_MIN_COLUMN = 10
+
+# The rows of text crack measures each key length's IC on, the IC of random
+# letters, and the fraction of the best IC's margin over it that a key length
+# needs to be solved and refined
+_IC_ROWS = 400
+_RANDOM_IC = 1 / 26
+_IC_KEEP = 0.6
+
+# The number of best histogram shifts of each column the refine step tries,
+# the rows of text it scores them on, and the letters either side of a column
+# letter whose ngrams depend on it (enough for quintgrams)
+_REFINE_SHIFTS = 6
+_REFINE_ROWS = 100
+_CONTEXT = 4
 
 
 def encrypt(
@@ -14,7 +44,8 @@ def encrypt(
     preserve_nonalpha: bool = False,
 ) -> str:
     """
-    Encrypt the plaintext using the Vigenère cipher.
+    Encrypt the plaintext using the Vigenère cipher. The key advances on
+    letters only.
 
     Parameters
     ----------
@@ -32,21 +63,18 @@ def encrypt(
     str
         The resultant ciphertext.
     """
-    ret = ""
-
-    for c, shift in zip(plaintext, cycle(key)):
-        ret += caesar.encrypt(
-            c,
-            shift,
-            preserve_nonalpha=preserve_nonalpha,
-        )
+    return polyalphabetic.encipher(plaintext, key, preserve_nonalpha=preserve_nonalpha)
 
-    return ret
 
-
-def decrypt(ciphertext: str, key: list[int]) -> str:
+def decrypt(
+    ciphertext: str,
+    key: list[int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> str:
     """
-    Decrypt the ciphertext using the Vigenère cipher.
+    Decrypt the ciphertext using the Vigenère cipher. The key advances on
+    letters only.
 
     Parameters
     ----------
@@ -56,17 +84,469 @@ def decrypt(ciphertext: str, key: list[int]) -> str:
     key : list[int]
         A list of shifts to use as the key.
 
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the plaintext.
+
     Returns
     -------
     str
         The resultant plaintext.
     """
-    ret = ""
+    return polyalphabetic.encipher(
+        ciphertext, key, decrypt=True, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def encrypt_bytes(
+    plaintext: Buffer,
+    key: list[int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Encrypt the ASCII letters of the plaintext bytes using the Vigenère cipher.
+
+    Parameters
+    ----------
+    plaintext : Buffer
+        The plaintext to encrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : list[int]
+        A list of shifts to use as the key.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the ciphertext.
+
+    Raises
+    ------
+    ValueError
+        If the key is empty.
+
+    Returns
+    -------
+    bytes
+        The resultant ciphertext.
+
+    Examples
+    --------
+    >>> encrypt_bytes(b"Attack at dawn!", [11, 4, 12, 14, 13], preserve_nonalpha=True)
+    b'Lxfopv ef rnhr!'
+    """
+    return polyalphabetic.encipher_bytes(
+        plaintext, key, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def decrypt_bytes(
+    ciphertext: Buffer,
+    key: list[int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> bytes:
+    """
+    Decrypt the ASCII letters of the ciphertext bytes using the Vigenère cipher.
+
+    Parameters
+    ----------
+    ciphertext : Buffer
+        The ciphertext to decrypt, e.g. bytes, a bytearray or a memoryview.
+
+    key : list[int]
+        A list of shifts to use as the key.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve bytes that are not ASCII letters in the plaintext.
+
+    Raises
+    ------
+    ValueError
+        If the key is empty.
+
+    Returns
+    -------
+    bytes
+        The resultant plaintext.
+    """
+    return polyalphabetic.encipher_bytes(
+        ciphertext, key, decrypt=True, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def encrypt_stream(
+    plaintext: Iterable[AnyStr] | Readable[AnyStr],
+    key: list[int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Encrypt a stream of plaintext using the Vigenère cipher. The position in
+    the key carries over from one chunk to the next.
+
+    Parameters
+    ----------
+    plaintext : Iterable[AnyStr] | Readable[AnyStr]
+        The plaintext to encrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : list[int]
+        A list of shifts to use as the key.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the ciphertext.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant ciphertext chunks.
+
+    Examples
+    --------
+    >>> "".join(encrypt_stream(["ATTA", "CKATDAWN"], [11, 4, 12, 14, 13]))
+    'LXFOPVEFRNHR'
+    """
+    return polyalphabetic.encipher_stream(
+        plaintext, key, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def decrypt_stream(
+    ciphertext: Iterable[AnyStr] | Readable[AnyStr],
+    key: list[int],
+    *,
+    preserve_nonalpha: bool = False,
+) -> Iterator[AnyStr]:
+    """
+    Decrypt a stream of ciphertext using the Vigenère cipher. The position in
+    the key carries over from one chunk to the next.
+
+    Parameters
+    ----------
+    ciphertext : Iterable[AnyStr] | Readable[AnyStr]
+        The ciphertext to decrypt, as an iterable of chunks or a file object.
+        Bytes chunks, e.g. from a binary file, give bytes chunks.
+
+    key : list[int]
+        A list of shifts to use as the key.
+
+    preserve_nonalpha : bool,default=False
+        Whether to preserve non-alphabeticals in the plaintext.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The resultant plaintext chunks.
+    """
+    return polyalphabetic.encipher_stream(
+        ciphertext, key, decrypt=True, preserve_nonalpha=preserve_nonalpha
+    )
+
+
+def periodic_index_of_coincidence(letters: str, period: int) -> float:
+    """
+    Compute the mean Index of Coincidence (IC) of the columns of the text when
+    it is written in rows of `period` letters.
 
-    for c, shift in zip(ciphertext, cycle(key)):
-        ret += caesar.decrypt(c, shift)
+    If `period` is a multiple of the key length, every column is a Caesar
+    cipher and the IC is close to that of English (about 0.066). Otherwise it
+    is closer to that of random letters (about 0.038).
 
-    return ret
+    Parameters
+    ----------
+    letters : str
+        The ciphertext letters, uppercase and without non-alphabeticals.
+
+    period : int
+        The number of columns.
+
+    Returns
+    -------
+    float
+        The mean IC of the columns with at least 2 letters, or 0.0 if there are
+        none.
+
+    Examples
+    --------
+    >>> enc = encrypt("DEFENDTHEEASTWALLOFTHECASTLE" * 4, [2, 8, 15])
+    >>> round(periodic_index_of_coincidence(enc, 3), 3)
+    0.094
+    """
+    ics: list[float] = []
+    for j in range(period):
+        column = letters[j::period]
+        n = len(column)
+        if n > 1:
+            freq_sum = sum(c * (c - 1) for c in Counter(column).values())
+            ics.append(freq_sum / (n * (n - 1)))
+
+    return fmean(ics) if ics else 0.0
+
+
+def _sampled_ic(letters: str, period: int) -> float:
+    """
+    Compute the periodic IC of the first `_IC_ROWS` rows of the text.
+
+    Parameters
+    ----------
+    letters : str
+        The ciphertext letters, uppercase and without non-alphabeticals.
+
+    period : int
+        The number of columns.
+
+    Returns
+    -------
+    float
+        The mean IC of the columns.
+    """
+    return periodic_index_of_coincidence(letters[: period * _IC_ROWS], period)
+
+
+def _solve_period(letters: str, period: int) -> list[int]:
+    """
+    Solve every column of the given period as a Caesar cipher.
+
+    Parameters
+    ----------
+    letters : str
+        The ciphertext letters, uppercase and without non-alphabeticals.
+
+    period : int
+        The key length.
+
+    Returns
+    -------
+    list[int]
+        The key, the best shift of each column by its letter histogram.
+    """
+    return [caesar.rank_keys(letters[j::period], top=1)[0][0] for j in range(period)]
+
+
+def _refine(letters: str, key: list[int], score: Callable[[str], float]) -> list[int]:
+    """
+    Refine a key column by column. Each column tries its best few shifts by
+    letter histogram, keeping a shift whenever it improves the score, until no
+    column changes.
+
+    Only the ngrams near a column's letters depend on its shift, so a shift is
+    scored on the text within `_CONTEXT` letters of them, joined by a
+    non-letter. For ngram scores this changes the score by a constant, and
+    ranks the shifts as the full text does.
+
+    Parameters
+    ----------
+    letters : str
+        The ciphertext letters, uppercase and without non-alphabeticals.
+
+    key : list[int]
+        The key to refine.
+
+    score : Callable[[str], float]
+        The score function which treats higher values as more likely to be a
+        valid decryption.
+
+    Returns
+    -------
+    list[int]
+        The refined key.
+    """
+    period = len(key)
+    letters = letters[: period * _REFINE_ROWS]
+    plain = list(decrypt(letters, key))
+    columns = [letters[j::period] for j in range(period)]
+    shifts = [[b for b, _ in caesar.rank_keys(c, top=_REFINE_SHIFTS)] for c in columns]
+
+    def _context(j: int) -> str:
+        """
+        Get the text that the score of column j's shift depends on.
+
+        Parameters
+        ----------
+        j : int
+            The column.
+
+        Returns
+        -------
+        str
+            The text.
+        """
+        if period <= 2 * _CONTEXT:
+            return "".join(plain)
+
+        return "|".join(
+            "".join(plain[max(0, k - _CONTEXT) : k + _CONTEXT + 1])
+            for k in range(j, len(plain), period)
+        )
+
+    key = key.copy()
+    changed = True
+    while changed:
+        changed = False
+        for j, column in enumerate(columns):
+            best = score(_context(j))
+            for shift in shifts[j]:
+                if shift == key[j]:
+                    continue
+
+                old = plain[j::period]
+                plain[j::period] = decrypt(column, [shift])
+                if (sc := score(_context(j))) > best:
+                    best, key[j], changed = sc, shift, True
+                else:
+                    plain[j::period] = old
+
+    return key
+
+
+def _shortest_period(key: list[int]) -> list[int]:
+    """
+    Reduce a key that repeats itself to a single repetition.
+
+    Parameters
+    ----------
+    key : list[int]
+        The key.
+
+    Returns
+    -------
+    list[int]
+        The shortest prefix of the key that repeats to the whole key.
+
+    Examples
+    --------
+    >>> _shortest_period([1, 2, 1, 2, 1, 2])
+    [1, 2]
+    """
+    for d in range(1, len(key)):
+        if len(key) % d == 0 and key == key[:d] * (len(key) // d):
+            return key[:d]
+    return key
+
+
+def crack(
+    ciphertext: str,
+    *,
+    max_period: int | None = None,
+    candidates: int = 3,
+    score: Callable[[str], float] = quadgram_score,
+    workers: int = 1,
+) -> tuple[str, list[int]]:
+    """
+    Crack the decryption of the ciphertext.
+
+    The key lengths 1 to `max_period` are ranked by their periodic IC over the
+    first 400 rows of text, and multiples of a shorter length with about the
+    same IC are folded into it. Lengths whose IC is less than 60% as far above
+    that of random letters as the best one are dropped. For each of the best
+    `candidates` lengths left, every column is solved as a Caesar cipher from
+    its letter histogram. Each key is then refined column by column, trying the
+    next best shifts of each column under the score, which corrects columns too
+    short for their histogram. The resulting keys are decrypted and scored over
+    the full text, and the best one is returned.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    max_period : int | None, default=None
+        The longest key length to consider. If None, it is 100, or fewer on
+        short texts so that every column has at least 10 letters.
+
+    candidates : int, default=3
+        The most key lengths to solve and score.
+
+    score : Callable[[str], float], default=quadgram_score
+        The score function which treats higher values as more likely to be a
+        valid decryption.
+
+    workers : int, default=1
+        Number of processes used to evaluate the key lengths. The result does
+        not depend on it.
+
+    Returns
+    -------
+    tuple[str, list[int]]
+        The best scoring decryption paired with its key.
+
+    Examples
+    --------
+    >>> text = (
+    ...     "It was the best of times, it was the worst of times, it was the age of"
+    ...     " wisdom, it was the age of foolishness, it was the epoch of belief, it"
+    ...     " was the epoch of incredulity, it was the season of light, it was the"
+    ...     " season of darkness, it was the spring of hope, it was the winter of"
+    ...     " despair."
+    ... )
+    >>> crack(encrypt(text, [11, 4, 12, 14, 13]))[1]
+    [11, 4, 12, 14, 13]
+    """
+    letters = _NONLETTERS.sub("", ciphertext.upper())
+    if max_period is None:
+        max_period = max(1, min(_MAX_PERIOD, len(letters) // _MIN_COLUMN))
+    periods = range(1, min(max_period, max(1, len(letters) // 2)) + 1)
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        if pool is None:
+            ics = list(map(partial(_sampled_ic, letters), periods))
+        else:
+            chunksize = max(1, len(periods) // (4 * workers))
+            ics = list(
+                pool.map(
+                    partial(_sampled_ic, letters),
+                    periods,
+                    chunksize=chunksize,
+                )
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    def _fold(period: int) -> int:
+        """
+        Get the smallest divisor of the period with about the same IC.
+
+        Every multiple of the key length has an English-like IC, but its
+        columns are shorter and solve less reliably.
+
+        Parameters
+        ----------
+        period : int
+            The key length.
+
+        Returns
+        -------
+        int
+            The folded key length.
+        """
+        return min(
+            d
+            for d in range(1, period + 1)
+            if period % d == 0 and ics[d - 1] >= 0.9 * ics[period - 1]
+        )
+
+    ranked = sorted(periods, key=lambda p: ics[p - 1], reverse=True)
+    folded = list(dict.fromkeys(map(_fold, ranked)))
+    # lengths with a random-like IC are not worth refining next to the best
+    margin = _IC_KEEP * (ics[folded[0] - 1] - _RANDOM_IC)
+    folded = [p for p in folded if ics[p - 1] - _RANDOM_IC >= margin]
+
+    # different lengths can still solve to the same key
+    keys = {
+        tuple(
+            _shortest_period(_refine(letters, _solve_period(letters, p), score))
+        ): None
+        for p in folded[:candidates]
+    }
+
+    top: tuple[str, list[int], float] = ("", [], -float("inf"))
+    for key in map(list, keys):
+        text = decrypt(ciphertext, key)
+        sc = score(text)
+        if sc > top[2]:
+            top = (text, key, sc)
+
+    return top[0], top[1]
 
 
 if __name__ == "__main__":
@@ -85,7 +565,19 @@ if __name__ == "__main__":
     enc = encrypt(plaintext, key, preserve_nonalpha=True)
     print(enc, "\n")
 
-    dec = decrypt(enc, key)
+    dec = decrypt(enc, key, preserve_nonalpha=True)
     print(dec, "\n")
 
     assert plaintext == dec
+
+    plaintext = (
+        "It was the best of times, it was the worst of times, it was the age of"
+        " wisdom, it was the age of foolishness, it was the epoch of belief, it"
+        " was the epoch of incredulity, it was the season of light, it was the"
+        " season of darkness, it was the spring of hope, it was the winter of"
+        " despair."
+    )
+    cracked = crack(encrypt(plaintext, key))
+    print(cracked, "\n")
+
+    assert cracked[1] == key
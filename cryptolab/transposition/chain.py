@@ -0,0 +1,285 @@
+"""
+Compiled chains of transposition steps.
+
+Every transposition step, e.g. a columnar transposition or a VIC disrupted
+transposition, moves the characters of a text by a permutation that depends
+only on its keys and the text length. `compile_chain` works out the
+permutation of each step of a chain for a length and composes them into a
+single TranspositionPlan, so a multi-stage transposition such as the double
+transposition of the VIC cipher is applied by one gather, and undone by the
+gather of the inverse. Compiled chains are kept in an LRU cache, so messages
+of the same length share a plan.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+from cryptolab.transposition import columnar, route
+from cryptolab.transposition.columnar import TranspositionPlan
+from cryptolab.transposition.disrupted import VIC, Filler
+
+# The first code point of the surrogates, which trace skips, and their count
+_SURROGATES = 0xD800
+_SURROGATE_COUNT = 0x800
+
+
+def _probe(length: int) -> str:
+    """
+    Get a text of distinct characters, none of them "\\0".
+
+    Parameters
+    ----------
+    length : int
+        The length of the text.
+
+    Returns
+    -------
+    str
+        The text, whose character i is the one `_index` maps to i.
+    """
+    return "".join(map(chr, range(1, min(length + 1, _SURROGATES)))) + "".join(
+        map(chr, range(_SURROGATES + _SURROGATE_COUNT, length + 1 + _SURROGATE_COUNT))
+    )
+
+
+def _index(c: str) -> int:
+    """
+    Get the position of a character in the probe text. See `_probe`.
+
+    Parameters
+    ----------
+    c : str
+        The character.
+
+    Returns
+    -------
+    int
+        The position.
+    """
+    i = ord(c)
+    return i - 1 if i < _SURROGATES else i - 1 - _SURROGATE_COUNT
+
+
+def trace(transpose: Callable[[str], str], length: int) -> TranspositionPlan:
+    """
+    Get the plan of a transposition of texts of the given length, by
+    transposing a text of distinct characters once.
+
+    Parameters
+    ----------
+    transpose : Callable[[str], str]
+        The transposition. It must only move the characters of its text,
+        except that "\\0" padding in its output is dropped.
+
+    length : int
+        The length of the texts.
+
+    Raises
+    ------
+    ValueError
+        If the transposition does not move every character exactly once.
+
+    Returns
+    -------
+    TranspositionPlan
+        The plan.
+
+    Examples
+    --------
+    >>> trace(lambda text: text[::-1], 4)
+    TranspositionPlan([3, 2, 1, 0])
+    """
+    out = transpose(_probe(length)).replace("\0", "")
+    return TranspositionPlan(list(map(_index, out)))
+
+
+@dataclass(frozen=True)
+class ColumnarStep:
+    """
+    A columnar transposition step. See `columnar.encrypt`.
+
+    Parameters
+    ----------
+    key : tuple[int, ...]
+        The columnar transposition key.
+    """
+
+    key: tuple[int, ...]
+
+    def plan(self, length: int) -> TranspositionPlan:
+        """
+        Get the plan of the step for texts of the given length.
+
+        Parameters
+        ----------
+        length : int
+            The length of the texts.
+
+        Returns
+        -------
+        TranspositionPlan
+            The plan.
+        """
+        return columnar.plan(self.key, length)
+
+
+@dataclass(frozen=True)
+class DisruptedStep:
+    """
+    A disrupted transposition step. See `disrupted.encrypt`.
+
+    Parameters
+    ----------
+    key : tuple[int, ...]
+        The disrupted transposition key.
+
+    filler : Filler, default=VIC
+        The fill algorithm.
+    """
+
+    key: tuple[int, ...]
+    filler: Filler = VIC
+
+    def plan(self, length: int) -> TranspositionPlan:
+        """
+        Get the plan of the step for texts of the given length.
+
+        Parameters
+        ----------
+        length : int
+            The length of the texts.
+
+        Returns
+        -------
+        TranspositionPlan
+            The plan.
+        """
+        fill = trace(lambda text: self.filler.fill(list(self.key), text), length)
+        return fill.compose(columnar.plan(self.key, length))
+
+
+@dataclass(frozen=True)
+class RouteStep:
+    """
+    A route transposition step. See `route.encrypt`. Unlike route.encrypt,
+    the cells of the route's grid past the end of the text are skipped rather
+    than padded, so the step keeps the length of the text.
+
+    Parameters
+    ----------
+    route : route.Route
+        The route algorithm.
+    """
+
+    route: route.Route
+
+    def plan(self, length: int) -> TranspositionPlan:
+        """
+        Get the plan of the step for texts of the given length.
+
+        Parameters
+        ----------
+        length : int
+            The length of the texts.
+
+        Returns
+        -------
+        TranspositionPlan
+            The plan.
+        """
+        return trace(lambda text: route.encrypt(text, self.route, pad="\0"), length)
+
+
+Step = ColumnarStep | DisruptedStep | RouteStep
+
+
+def compile_chain(steps: Sequence[Step], length: int) -> TranspositionPlan:
+    """
+    Compile a chain of transposition steps for texts of the given length
+    into one plan. Compiled chains are cached by their steps and length.
+
+    Parameters
+    ----------
+    steps : Sequence[Step]
+        The steps, in the order they transpose the text.
+
+    length : int
+        The length of the texts.
+
+    Returns
+    -------
+    TranspositionPlan
+        The plan of the whole chain. Its inverse undoes the chain.
+
+    Examples
+    --------
+    >>> steps = (ColumnarStep((1, 0)), ColumnarStep((2, 0, 1)))
+    >>> chain = compile_chain(steps, 6)
+    >>> chain.apply("ABCDEF")
+    'DCFEBA'
+    >>> columnar.encrypt([2, 0, 1], columnar.encrypt([1, 0], "ABCDEF"))
+    'DCFEBA'
+    """
+    return _compile_chain(tuple(steps), length)
+
+
+@lru_cache(maxsize=256)
+def _compile_chain(steps: tuple[Step, ...], length: int) -> TranspositionPlan:
+    """
+    Compile a chain of transposition steps. See `compile_chain`.
+
+    Parameters
+    ----------
+    steps : tuple[Step, ...]
+        The steps, in the order they transpose the text.
+
+    length : int
+        The length of the texts.
+
+    Returns
+    -------
+    TranspositionPlan
+        The plan of the whole chain.
+    """
+    out = TranspositionPlan(range(length))
+    for step in steps:
+        out = out.compose(step.plan(length))
+
+    return out
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from cryptolab.transposition import disrupted
+    from cryptolab.transposition.routes import spirals
+
+    key1 = [8, 12, 0, 1, 9, 14, 2, 11, 5, 16, 6, 7, 15, 10, 13, 17, 3, 4, 18]
+    key2 = [15, 3, 17, 11, 16, 4, 12, 13, 0, 6, 14, 18, 10, 1, 5, 7, 8, 2, 9, 19]
+    text = "WEAREDISCOVEREDFLEEATONCE" * 4
+
+    steps = (ColumnarStep(tuple(key1)), DisruptedStep(tuple(key2)))
+    chain = compile_chain(steps, len(text))
+
+    enc = chain.apply(text)
+    print(enc)
+
+    assert enc == disrupted.encrypt(key2, columnar.encrypt(key1, text), VIC)
+    assert chain.invert().apply(enc) == text
+
+    routed = compile_chain((RouteStep(spirals.ccw_in), *steps), len(text))
+    assert routed.invert().apply(routed.apply(text)) == text
+
+    n = 10_000
+    start = perf_counter()
+    for _ in range(n):
+        disrupted.encrypt(key2, columnar.encrypt(key1, text), VIC)
+    staged = perf_counter() - start
+
+    start = perf_counter()
+    for _ in range(n):
+        compile_chain(steps, len(text)).apply(text)
+    chained = perf_counter() - start
+
+    print(f"stages: {staged / n * 1e6:.1f} us, chain: {chained / n * 1e6:.1f} us")
@@ -1,11 +1,274 @@
 """
 https://en.wikipedia.org/wiki/Transposition_cipher
+
+A transposition of texts of one length is fixed by the index permutation it
+gathers by. `plan` precomputes it once per key and length as a
+TranspositionPlan, so that crack loops, which transpose many texts of the same
+length, apply each key with a single gather. Plans can be inverted and
+composed, e.g. to chain the stages of a double transposition into one.
 """
 
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import accumulate, repeat
 from math import ceil
+from operator import itemgetter
+from random import Random
+from typing import AnyStr
+
+from cryptolab.scoring.ngram import ngram_table
+from cryptolab.utils.moves import (
+    block_move,
+    random_block_move,
+    random_reversal,
+    random_rotation,
+    random_swap,
+    reverse,
+    rotate,
+    swap,
+)
+from cryptolab.utils.seeding import Seed, make_rng
+
+# The longest text that decrypt transposes by a plan. Longer texts are
+# transposed by slices, which is faster for them, and their plans would make
+# the cache large. encrypt always uses slices, which already gather a whole
+# column at a time
+_PLAN_LIMIT = 256
+
+
+class TranspositionPlan:
+    """
+    A transposition of texts of a fixed length, precomputed as the index
+    permutation it gathers by.
+
+    Parameters
+    ----------
+    perm : Sequence[int]
+        The permutation: character i of the output is character perm[i] of
+        the input.
+
+    Raises
+    ------
+    ValueError
+        If perm is not a permutation of range(len(perm)).
+
+    Examples
+    --------
+    >>> p = TranspositionPlan([2, 0, 1])
+    >>> p.apply("abc")
+    'cab'
+    >>> p.invert().apply("cab")
+    'abc'
+    >>> p.compose(p).apply("abc")
+    'bca'
+    """
+
+    __slots__ = ("_gather", "_inverse", "_perm")
+
+    def __init__(self, perm: Sequence[int]):
+        self._perm = tuple(perm)
+        if sorted(self._perm) != list(range(len(self._perm))):
+            raise ValueError("expected a permutation of range(len(perm))")
+
+        # itemgetter gathers in one call, but returns a bare item for one index
+        self._gather = itemgetter(*self._perm) if len(self._perm) > 1 else None
+
+        # computed on first use, see invert
+        self._inverse: TranspositionPlan | None = None
+
+    @property
+    def perm(self) -> tuple[int, ...]:
+        """
+        The permutation of the plan.
+
+        Returns
+        -------
+        tuple[int, ...]
+            The index of the input character of each output character.
+        """
+        return self._perm
+
+    def __len__(self) -> int:
+        """
+        Get the length of the texts that the plan transposes.
+
+        Returns
+        -------
+        int
+            The length.
+        """
+        return len(self._perm)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Check if two plans are equal, i.e. transpose alike.
+
+        Parameters
+        ----------
+        other : object
+            The object to compare against.
+
+        Returns
+        -------
+        bool
+            Whether the plans have the same permutation.
+        """
+        if not isinstance(other, TranspositionPlan):
+            return NotImplemented
+
+        return self._perm == other._perm
+
+    def __hash__(self) -> int:
+        """
+        Get the hash of the plan.
+
+        Returns
+        -------
+        int
+            The hash of the permutation.
+        """
+        return hash(self._perm)
+
+    def __repr__(self) -> str:
+        """
+        Get a string representation of the plan.
+
+        Returns
+        -------
+        str
+            The representation of the plan.
+        """
+        return f"TranspositionPlan({list(self._perm)})"
+
+    def apply(self, text: AnyStr) -> AnyStr:
+        """
+        Transpose the text by a single gather.
+
+        Parameters
+        ----------
+        text : AnyStr
+            The text to transpose, as str or bytes.
+
+        Raises
+        ------
+        ValueError
+            If the text is not of the length of the plan.
+
+        Returns
+        -------
+        AnyStr
+            The transposed text.
+        """
+        if len(text) != len(self._perm):
+            raise ValueError(f"expected a text of length {len(self._perm)}")
+
+        if self._gather is None:
+            return text  # the permutations of at most one index are identities
+
+        chars = self._gather(text)
+        return "".join(chars) if isinstance(text, str) else bytes(chars)
+
+    def invert(self) -> TranspositionPlan:
+        """
+        Get the plan that undoes this one. It is computed once.
+
+        Returns
+        -------
+        TranspositionPlan
+            The inverse plan.
+        """
+        if self._inverse is None:
+            inverse = [0] * len(self._perm)
+            for i, j in enumerate(self._perm):
+                inverse[j] = i
+
+            self._inverse = TranspositionPlan(inverse)
+            self._inverse._inverse = self
 
+        return self._inverse
 
-def encrypt(key: list[int], plaintext: str) -> str:
+    def compose(self, other: TranspositionPlan) -> TranspositionPlan:
+        """
+        Get the plan that transposes by this plan, then by the other.
+
+        Parameters
+        ----------
+        other : TranspositionPlan
+            The plan to apply second.
+
+        Raises
+        ------
+        ValueError
+            If the plans are not of the same length.
+
+        Returns
+        -------
+        TranspositionPlan
+            The composed plan.
+        """
+        if len(other) != len(self):
+            raise ValueError("cannot compose plans of different lengths")
+
+        return TranspositionPlan(list(map(self._perm.__getitem__, other._perm)))
+
+
+def plan(key: Sequence[int], length: int) -> TranspositionPlan:
+    """
+    Get the plan of the columnar transposition keyed by key of texts of the
+    given length, i.e. of `encrypt`. Plans are cached, so crack loops get
+    the same plan for a key and length from a lookup.
+
+    Parameters
+    ----------
+    key : Sequence[int]
+        A permutation of range(len(key)) to reorder the columns.
+
+    length : int
+        The length of the texts.
+
+    Returns
+    -------
+    TranspositionPlan
+        The plan. Its inverse is the plan of `decrypt`.
+
+    Examples
+    --------
+    >>> plan([1, 0], 5)
+    TranspositionPlan([1, 3, 0, 2, 4])
+    """
+    return _plan(tuple(key), length)
+
+
+@lru_cache(maxsize=1024)
+def _plan(key: tuple[int, ...], length: int) -> TranspositionPlan:
+    """
+    Compute the plan of a columnar transposition. See `plan`.
+
+    Parameters
+    ----------
+    key : tuple[int, ...]
+        A permutation of range(len(key)) to reorder the columns.
+
+    length : int
+        The length of the texts.
+
+    Returns
+    -------
+    TranspositionPlan
+        The plan.
+    """
+    # column i of the text is read out at position key[i]
+    columns = [0] * len(key)
+    for i, j in enumerate(key):
+        columns[j] = i
+
+    return TranspositionPlan([k for c in columns for k in range(c, length, len(key))])
+
+
+def encrypt(key: list[int], plaintext: AnyStr) -> AnyStr:
     """
     Encrypt the plaintext by columnar transposition keyed by key.
 
@@ -14,25 +277,27 @@ def encrypt(key: list[int], plaintext: str) -> str:
     key : list[int]
         A list of indices to reorder the columns.
 
-    plaintext : str
-        The plaintext to encrypt.
+    plaintext : AnyStr
+        The plaintext to encrypt, as str or bytes.
 
     Returns
     -------
-    str
+    AnyStr
         The resultant ciphertext.
 
     Examples
     --------
     >>> encrypt(sequence("zebras"), "we are discovered. flee at once.")
     'rcden irl edeft.aseeoeo. cw v ae'
-    """
 
+    >>> encrypt(sequence("zebras"), b"we are discovered. flee at once.")
+    b'rcden irl edeft.aseeoeo. cw v ae'
+    """
     paired = {j: plaintext[i :: len(key)] for i, j in enumerate(key)}
-    return "".join(paired[i] for i in range(len(key)))
+    return plaintext[:0].join(paired[i] for i in range(len(key)))
 
 
-def decrypt(key: list[int], ciphertext: str) -> str:
+def decrypt(key: list[int], ciphertext: AnyStr) -> AnyStr:
     """
     Decrypt the given ciphertext by columnar transposition keyed by key.
 
@@ -41,12 +306,12 @@ def decrypt(key: list[int], ciphertext: str) -> str:
     key : list[int]
         A list of indices to reorder the columns.
 
-    ciphertext : str
-        The ciphertext to decrypt.
+    ciphertext : AnyStr
+        The ciphertext to decrypt, as str or bytes.
 
     Returns
     -------
-    str
+    AnyStr
         The resultant plaintext.
 
     Examples
@@ -54,23 +319,315 @@ def decrypt(key: list[int], ciphertext: str) -> str:
     >>> decrypt(sequence("zebras"), "rcden irl edeft.aseeoeo. cw v ae")
     'we are discovered. flee at once.'
     """
+    if len(ciphertext) <= _PLAN_LIMIT:
+        return plan(key, len(ciphertext)).invert().apply(ciphertext)
 
-    rows = int(ceil(len(ciphertext) / len(key)))
-    fill = rows * len(key)
-    pads = len(key) - (fill - len(ciphertext))
+    n = len(ciphertext)
+    rows = int(ceil(n / len(key)))
 
-    cols = [""] * len(key)
+    # the first `long` columns have a character in the last row
+    long = n - (rows - 1) * len(key)
     paired = {j: i for i, j in enumerate(key)}
 
-    it = iter(ciphertext)
+    # write each column of the ciphertext into its stride of the plaintext
+    out = [""] * n if isinstance(ciphertext, str) else bytearray(n)
+    start = 0
     for i in range(len(key)):
         j = paired[i]
-        if j >= pads:
-            cols[j] = "".join(next(it) for _ in range(rows - 1)) + "."
-        else:
-            cols[j] = "".join(next(it) for _ in range(rows))
+        end = start + (rows if j < long else rows - 1)
+        out[j :: len(key)] = ciphertext[start:end]
+        start = end
+
+    return "".join(out) if isinstance(ciphertext, str) else bytes(out)
+
+
+# A climb over keys of width w stops after _PATIENCE * w * w moves in a row
+# without improvement
+_PATIENCE = 5
+
+# The number of climbs per width that rank the widths, see crack
+_SCREEN = 2
+
 
-    return "".join(c[i] for i in range(rows) for c in cols)[: len(ciphertext)]
+class _WindowScores(dict[tuple[int, ...], float]):
+    """
+    Memo of the ngram scores of the windows of a columnar decryption, for
+    `_Search`. A window is n consecutive plaintext columns, each given as the
+    span of the ciphertext it reads, and its score is the sum of the scores
+    of the ngrams read across it, one per row. Scores are computed the first
+    time a window is looked up.
+
+    Parameters
+    ----------
+    text : str
+        The uppercase ciphertext.
+
+    rows : int
+        The number of rows of the grid. Spans are encoded as
+        start * (rows + 1) + length.
+
+    n : int
+        The ngram length.
+    """
+
+    def __init__(self, text: str, rows: int, n: int):
+        super().__init__()
+        self._text = text
+        self._base = rows + 1
+        self._data, self._floor = ngram_table(n)
+
+    def __missing__(self, window: tuple[int, ...]) -> float:
+        columns = []
+        for span in window:
+            start, length = divmod(span, self._base)
+            columns.append(self._text[start : start + length])
+
+        # zip stops at the shortest column, which is where the text ends
+        ngrams = map("".join, zip(*columns))
+        score = self[window] = sum(map(self._data.get, ngrams, repeat(self._floor)))
+        return score
+
+
+class _Search:
+    """
+    Hill climbing over the column orders of one width, scored window by
+    window. A move only changes the windows across the columns whose spans
+    changed, so only those are scored anew, and the rest are looked up.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    width : int
+        The number of columns, at least 2 and at most the text length.
+
+    n : int
+        The ngram length of the score, 1 to 5. See `ngram_table`.
+    """
+
+    def __init__(self, ciphertext: str, width: int, n: int):
+        self._width = width
+        self._n = n
+        self._rows = -(-len(ciphertext) // width)
+
+        # the first `long` columns have a character in the last row
+        self._long = len(ciphertext) - (self._rows - 1) * width
+        self._windows = _WindowScores(ciphertext.upper(), self._rows, n)
+
+    def score(self, key: list[int]) -> float:
+        """
+        Score the decryption by a key.
+
+        Parameters
+        ----------
+        key : list[int]
+            The key, see `decrypt`.
+
+        Returns
+        -------
+        float
+            The ngram score of the decryption, as the ngram scorer of length
+            n would score the text.
+        """
+        width, rows, long = self._width, self._rows, self._long
+
+        # the length of the column read at each position of the ciphertext
+        lengths = [rows - 1] * width
+        for i in range(long):
+            lengths[key[i]] = rows
+        starts = list(accumulate(lengths, initial=0))
+
+        # the spans of the columns, then again shifted down one row for each
+        # time the windows wrap around to the next row
+        spans = [starts[j] * (rows + 1) + lengths[j] for j in key]
+        spans += [
+            spans[c % width] + c // width * rows
+            for c in range(width, width + self._n - 1)
+        ]
+
+        windows = zip(*(spans[i:] for i in range(self._n)))
+        return sum(map(self._windows.__getitem__, windows))
+
+    def climb(
+        self, key: list[int], rng: Random, patience: int
+    ) -> tuple[float, list[int]]:
+        """
+        Hill climb from a key by random column swaps, block moves, rotations
+        and slice reversals, until none of `patience` moves in a row improves.
+
+        Parameters
+        ----------
+        key : list[int]
+            The key to start from.
+
+        rng : Random
+            Random number generator to draw moves from.
+
+        patience : int
+            The number of moves without improvement to stop after.
+
+        Returns
+        -------
+        tuple[float, list[int]]
+            The score of the best key, and the key.
+        """
+        width = self._width
+        best = self.score(key)
+        fails = 0
+        while fails < patience:
+            r = rng.randrange(4)
+            if r == 0:
+                new = swap(key, *random_swap(width, rng))
+            elif r == 1:
+                new = block_move(key, *random_block_move(width, rng))
+            elif r == 2:
+                # the block moves of whole rows, which are otherwise rarely
+                # drawn, fix solutions read from the wrong column
+                new = rotate(key, random_rotation(width, rng))
+            else:
+                new = reverse(key, *random_reversal(width, rng))
+
+            if (score := self.score(new)) > best:
+                key, best, fails = new, score, 0
+            else:
+                fails += 1
+
+        return best, key
+
+
+def _search(
+    ciphertext: str, n: int, restarts: int, start: tuple[int, list[int] | None, int]
+) -> tuple[float, list[int]]:
+    """
+    Search the keys of one width. This is module level so it can be sent to
+    worker processes.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    n : int
+        The ngram length of the score.
+
+    restarts : int
+        The number of climbs from random keys.
+
+    start : tuple[int, list[int] | None, int]
+        The width, a key to climb from as well or None, and the seed of the
+        search.
+
+    Returns
+    -------
+    tuple[float, list[int]]
+        The score of the best key found, and the key.
+    """
+    width, key, seed = start
+    rng = make_rng(seed)
+    search = _Search(ciphertext, width, n)
+    patience = _PATIENCE * width * width
+
+    keys = [] if key is None else [key]
+    for _ in range(restarts):
+        keys.append(rng.sample(range(width), width))
+
+    return max(search.climb(k, rng, patience) for k in keys)
+
+
+def crack(
+    ciphertext: str,
+    *,
+    max_width: int = 20,
+    candidates: int = 2,
+    n: int = 4,
+    restarts: int = 4,
+    workers: int = 1,
+    rng: Seed = None,
+) -> tuple[str, list[int]]:
+    """
+    Crack the decryption of the ciphertext.
+
+    Every width from 2 to `max_width` that leaves at least two rows is
+    searched by a few hill climbs of the column order under a bigram score,
+    and the widths are ranked by their best bigram score. For each of the
+    best `candidates` widths, the column order is then hill climbed under the
+    ngram score of length n, from the bigram solution and from random
+    orders, and the best decryption is returned.
+
+    The climbs move columns by swaps, block moves, rotations and reversals.
+    The score is kept per window of n adjacent columns, so a move only
+    rescores the ngrams across the columns it changed.
+
+    Non-letters, e.g. spaces, score as unknown ngrams, so the cipher is best
+    cracked on letters-only text, as it is traditionally used.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to crack.
+
+    max_width : int, default=20
+        The largest key width to consider.
+
+    candidates : int, default=2
+        The number of widths to search under the ngram score.
+
+    n : int, default=4
+        The ngram length of the final score, 1 to 5. See `ngram_table`.
+
+    restarts : int, default=4
+        The number of climbs from random column orders per width searched
+        under the ngram score.
+
+    workers : int, default=1
+        Number of processes used to search the widths. The result does not
+        depend on it.
+
+    rng : int | Random | None, default=None
+        Random number generator, or a seed for one, from which the search of
+        each width draws its own seed. Passing the same seed reproduces a run.
+
+    Returns
+    -------
+    tuple[str, list[int]]
+        The best scoring decryption paired with its key.
+
+    Examples
+    --------
+    >>> text = (
+    ...     "ITWASTHEBESTOFTIMESITWASTHEWORSTOFTIMESITWASTHEAGEOFWISDOMITWASTHEAGE"
+    ...     "OFFOOLISHNESSITWASTHEEPOCHOFBELIEFITWASTHEEPOCHOFINCREDULITYITWASTHE"
+    ...     "SEASONOFLIGHTITWASTHESEASONOFDARKNESSITWASTHESPRINGOFHOPE"
+    ... )
+    >>> crack(encrypt([4, 0, 6, 2, 5, 1, 3], text), max_width=10, rng=1)[1]
+    [4, 0, 6, 2, 5, 1, 3]
+    """
+    rng = make_rng(rng)
+    widths = range(2, min(max_width, len(ciphertext) // 2) + 1)
+    if not widths:
+        return ciphertext, [0]
+
+    pool = None
+    if workers > 1:
+        ngram_table(2), ngram_table(n)  # load the scoring data to share it
+        pool = ProcessPoolExecutor(workers)
+
+    try:
+        run = map if pool is None else pool.map
+        starts = [(w, None, rng.getrandbits(128)) for w in widths]
+        ranked = sorted(
+            zip(run(partial(_search, ciphertext, 2, _SCREEN), starts), widths),
+            reverse=True,
+        )
+
+        starts = [(w, key, rng.getrandbits(128)) for (_, key), w in ranked[:candidates]]
+        _, key = max(run(partial(_search, ciphertext, n, restarts), starts))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return decrypt(key, ciphertext), key
 
 
 if __name__ == "__main__":
@@ -89,3 +646,10 @@ if __name__ == "__main__":
     print(dec)
 
     assert input == dec
+
+    # both stages of a double transposition as one plan
+    p = plan(key, len(input))
+    double = p.compose(p)
+    print(double.apply(input))
+
+    assert double.invert().apply(encrypt(key, enc)) == input
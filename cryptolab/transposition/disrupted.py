@@ -14,7 +14,7 @@ from cryptolab.transposition.columnar import (
 )
 
 
-@dataclass
+@dataclass(frozen=True)
 class Filler:
     """
     A Filler is a pair of fill and unfill functions.
@@ -1,5 +1,6 @@
 from collections import Counter
 from math import log2
+from string import ascii_uppercase
 
 # Default frequencies used when computing chi-squared statistic
 DEFAULT_FREQUENCIES: dict[str, float] = {
@@ -55,6 +56,30 @@ def frequency_counts(text: str) -> Counter[str]:
     return Counter(text)
 
 
+def letter_counts(text: str) -> list[int]:
+    """
+    Count the occurences of each letter A-Z in the given text, case-insensitive.
+
+    Parameters
+    ----------
+    text : str
+        The subject text
+
+    Returns
+    -------
+    list[int]
+        The 26 letter counts, indexed by letter (A=0, ..., Z=25)
+
+    Examples
+    --------
+    >>> letter_counts("Defend the east wall of the castle")[:5]
+    [3, 0, 1, 2, 6]
+    """
+
+    upper = text.upper()
+    return [upper.count(c) for c in ascii_uppercase]
+
+
 def index_of_coincidence(text: str) -> float:
     """
     Compute the Index of Coincidence (IC) for a given text.
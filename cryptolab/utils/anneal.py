@@ -2,23 +2,32 @@
 
 from collections.abc import Callable
 from math import exp
-from random import random
+from random import Random
+from time import monotonic
 from typing import TypeVar
 
+from cryptolab.utils.schedules import Geometric, Schedule
+from cryptolab.utils.seeding import Seed, make_rng
+
 KeyType = TypeVar("KeyType")
 
 
 def anneal(
     ciphertext: str,
-    key_gen: Callable[[], KeyType],
-    mutate: Callable[[KeyType], KeyType],
-    decrypt: Callable[[str, KeyType], str],
+    key_gen: Callable[[Random], KeyType],
+    mutate: Callable[[KeyType, Random], KeyType],
+    decrypt: Callable[[str, KeyType], str | None],
     score: Callable[[str], float],
     *,
+    copy: Callable[[KeyType], KeyType] | None = None,
+    revert: Callable[[KeyType], None] | None = None,
     temp: float = 1000.0,
     rate: float = 0.999,
     limit: float = 1e-6,
     max_steps: int = 1_000_000,
+    schedule: Schedule | None = None,
+    timeout: float | None = None,
+    rng: Seed = None,
 ) -> tuple[str, KeyType]:
     """
     Perform simulated annealing to optimize a decryption key for a ciphertext.
@@ -33,23 +42,39 @@ def anneal(
     ciphertext : str
         The encrypted text to decrypt and evaluate.
 
-    key_gen : Callable[[], KeyType]
-        Function that returns an initial random key or state.
+    key_gen : Callable[[Random], KeyType]
+        Function that returns an initial random key or state, drawing from the
+        given random number generator.
 
-    mutate : Callable[[KeyType], KeyType]
-        Function that produces a small random modification (neighbor) of a given key.
+    mutate : Callable[[KeyType, Random], KeyType]
+        Function that produces a small random modification (neighbor) of a
+        given key, drawing from the given random number generator.
 
-    decrypt : Callable[[str, KeyType], str]
-        Function that decrypts the ciphertext using the provided key.
+    decrypt : Callable[[str, KeyType], str | None]
+        Function that decrypts the ciphertext using the provided key. It may
+        return None to signal that the key cannot decrypt the ciphertext, in
+        which case the key is skipped. Exceptions it raises are not caught
+        and stop the search, so a decrypt that fails on some keys should
+        return None for them instead, e.g. straddling_checkerboard.try_decrypt.
 
     score : Callable[[str], float]
         Function that evaluates the fitness or likelihood of a decrypted text.
 
+    copy : Callable[[KeyType], KeyType] | None, default=None
+        If mutate changes the key in place (e.g. MutableBoard.random_mutation),
+        a function to copy a key. It is used to keep the best key.
+
+    revert : Callable[[KeyType], None] | None, default=None
+        If mutate changes the key in place, a function that undoes its last
+        change, used when a neighbour is rejected. Must be given with copy.
+
     temp : float, default=1000.0
         Initial temperature controlling the acceptance of worse solutions.
+        Only used if no schedule is given.
 
     rate : float, default=0.999
         Multiplicative cooling rate applied to the temperature each iteration.
+        Only used if no schedule is given.
 
     limit : float, default=1e-6
         Temperature threshold at which the algorithm stops.
@@ -57,68 +82,96 @@ def anneal(
     max_steps : int, default=1_000_000
         Maximum number of iterations before termination.
 
+    schedule : Schedule | None, default=None
+        The cooling schedule, see cryptolab.utils.schedules. It is updated in
+        place. If None, geometric cooling from `temp` at `rate` is used.
+        Schedules that calibrate themselves (e.g. Adaptive) are given the
+        score deltas of random moves away from the initial key first.
+
+    timeout : float | None, default=None
+        Wall-clock seconds after which the search stops, whatever the
+        temperature. If None, there is no time limit.
+
+    rng : int | Random | None, default=None
+        Random number generator, or a seed for one, used for every random
+        decision of the search. Passing the same seed reproduces a run.
+
     Returns
     -------
     tuple[str, KeyType]
         The best decrypted text and its corresponding key.
     """
-    key = key_gen()
-
-    text = ""
-    while text == "":
-        try:
-            text = decrypt(ciphertext, key)
-        except Exception:
-            key = key_gen()
-
-    best = (score(text), text, key)
-    current = best
-
-    for i in range(max_steps):
-        new_key = mutate(current[-1])
-        try:
-            text = decrypt(ciphertext, new_key)
-        except Exception:
+
+    rng = make_rng(rng)
+    deadline = None if timeout is None else monotonic() + timeout
+
+    key = key_gen(rng)
+    while (text := decrypt(ciphertext, key)) is None:
+        key = key_gen(rng)
+
+    current = (score(text), text, key)
+    best = current if copy is None else (current[0], text, copy(key))
+
+    if schedule is None:
+        schedule = Geometric(temp, rate)
+
+    if schedule.samples > 0:
+        deltas: list[float] = []
+        for _ in range(schedule.samples):
+            if (text := decrypt(ciphertext, mutate(key, rng))) is not None:
+                deltas.append(score(text) - current[0])
+            if revert is not None:
+                revert(key)
+        schedule.calibrate(deltas)
+
+    for _ in range(max_steps):
+        if (temp_i := schedule.temp) < limit:
+            break
+
+        if deadline is not None and monotonic() > deadline:
+            break
+
+        new_key = mutate(current[-1], rng)
+        if (text := decrypt(ciphertext, new_key)) is None:
+            if revert is not None:
+                revert(new_key)
+            schedule.update(False)
             continue
 
         sc = score(text)
-
-        temp_i = temp * (rate**i)
         bound = exp(min((sc - current[0]) / temp_i, 700))
 
-        if sc > current[0] or random() < bound:
+        accepted = sc > current[0] or rng.random() < bound
+        if accepted:
             current = (sc, text, new_key)
             if sc > best[0]:
-                best = current
+                best = current if copy is None else (sc, text, copy(new_key))
+        elif revert is not None:
+            revert(new_key)
 
-        if temp_i < limit:
-            break
+        schedule.update(accepted)
 
     return best[1], best[2]
 
 
 if __name__ == "__main__":
-    from itertools import combinations
-    from random import choice, shuffle
     from string import ascii_uppercase
 
     from cryptolab.scoring.ngram import trigram_score
     from cryptolab.substitution import simple
+    from cryptolab.utils.moves import random_swap, swap
 
     plaintext = "Simulated annealing is a probabilistic technique for approximating the global optimum of a given function. Specifically, it is a metaheuristic to approximate global optimization in a large search space for an optimization problem."
 
-    def gen_key() -> str:
+    def gen_key(rng: Random) -> str:
         key = list(ascii_uppercase)
-        shuffle(key)
+        rng.shuffle(key)
         return "".join(key)
 
-    def mutate(key: str) -> str:
-        lkey = list(key)
-        a, b = choice(tuple(combinations(range(len(lkey)), 2)))
-        lkey[a], lkey[b] = lkey[b], lkey[a]
-        return "".join(lkey)
+    def mutate(key: str, rng: Random) -> str:
+        return "".join(swap(key, *random_swap(len(key), rng)))
 
-    key = gen_key()
+    key = gen_key(Random())
 
     print(plaintext)
     print(key, "\n")
@@ -0,0 +1,194 @@
+"""
+Reproducible crack benchmarks.
+
+Every run is driven by a Random seeded from a fixed list of seeds, so the
+time-to-solution distribution of a solver can be compared across changes.
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from random import Random
+from statistics import fmean, median, quantiles
+from time import perf_counter
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Outcome of a benchmark over fixed seeds.
+
+    Parameters
+    ----------
+    name : str
+        Name of the benchmarked solver.
+
+    seeds : list[int]
+        The seed of each run.
+
+    times : list[float]
+        Wall-clock seconds of each run.
+
+    solved : list[bool]
+        Whether each run found the solution.
+    """
+
+    name: str
+    seeds: list[int] = field(default_factory=list[int])
+    times: list[float] = field(default_factory=list[float])
+    solved: list[bool] = field(default_factory=list[bool])
+
+    @property
+    def success_rate(self) -> float:
+        """
+        The fraction of runs that found the solution.
+
+        Returns
+        -------
+        float
+            The success rate, or 0.0 if there were no runs.
+        """
+        return sum(self.solved) / len(self.solved) if self.solved else 0.0
+
+    @property
+    def solve_times(self) -> list[float]:
+        """
+        The wall-clock seconds of the runs that found the solution.
+
+        Returns
+        -------
+        list[float]
+            The time-to-solution of each successful run.
+        """
+        return [t for t, ok in zip(self.times, self.solved) if ok]
+
+    def __str__(self) -> str:
+        """
+        Get a summary of the time-to-solution distribution.
+
+        Returns
+        -------
+        str
+            The summary.
+        """
+        head = f"{self.name}: {sum(self.solved)}/{len(self.solved)} solved"
+        if not (times := self.solve_times):
+            return head
+
+        p90 = quantiles(times, n=10)[-1] if len(times) > 1 else times[0]
+        return (
+            f"{head}, time-to-solution "
+            f"min={min(times):.3f}s median={median(times):.3f}s "
+            f"mean={fmean(times):.3f}s p90={p90:.3f}s max={max(times):.3f}s"
+        )
+
+
+def benchmark(
+    name: str,
+    solve: Callable[[Random], T],
+    check: Callable[[T], bool],
+    seeds: Iterable[int] = range(10),
+) -> BenchmarkResult:
+    """
+    Time a solver over fixed seeds.
+
+    Parameters
+    ----------
+    name : str
+        Name of the solver, used in the report.
+
+    solve : Callable[[Random], T]
+        Runs the solver with all of its randomness drawn from the given
+        generator, e.g. by passing it as the `rng` of a search.
+
+    check : Callable[[T], bool]
+        Whether the solver's result is the correct solution.
+
+    seeds : Iterable[int], default=range(10)
+        The seeds to run.
+
+    Returns
+    -------
+    BenchmarkResult
+        The time and outcome of each run.
+    """
+    result = BenchmarkResult(name)
+
+    for seed in seeds:
+        start = perf_counter()
+        out = solve(Random(seed))
+        result.times.append(perf_counter() - start)
+        result.seeds.append(seed)
+        result.solved.append(check(out))
+
+    return result
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+    from itertools import combinations
+    from string import ascii_uppercase
+
+    from cryptolab.scoring.ngram import quadgram_score
+    from cryptolab.substitution import simple
+    from cryptolab.utils.anneal import anneal
+    from cryptolab.utils.hill_climb import hill_climb
+    from cryptolab.utils.moves import random_swap, swap
+
+    parser = ArgumentParser()
+    parser.add_argument("-n", "--runs", type=int, default=10, help="number of seeds")
+    parser.add_argument("-s", "--first-seed", type=int, default=0, help="first seed")
+    ns = parser.parse_args()
+
+    seeds = range(ns.first_seed, ns.first_seed + ns.runs)
+
+    plaintext = "Simulated annealing is a probabilistic technique for approximating the global optimum of a given function. Specifically, it is a metaheuristic to approximate global optimization in a large search space for an optimization problem."
+    letters = "".join(c for c in plaintext if c.isalpha())
+
+    def gen_key(rng: Random) -> str:
+        key = list(ascii_uppercase)
+        rng.shuffle(key)
+        return "".join(key)
+
+    def mutate(key: str, rng: Random) -> str:
+        return "".join(swap(key, *random_swap(len(key), rng)))
+
+    def neighbours(key: str):
+        for a, b in combinations(range(len(key)), 2):
+            lkey = list(key)
+            lkey[a], lkey[b] = lkey[b], lkey[a]
+            yield "".join(lkey)
+
+    enc = simple.encrypt(plaintext, gen_key(Random("cryptolab")))
+
+    def solved(result: tuple[str, str]) -> bool:
+        return result[0] == letters
+
+    print(
+        benchmark(
+            "anneal",
+            lambda rng: anneal(
+                enc, gen_key, mutate, simple.decrypt, quadgram_score, rng=rng
+            ),
+            solved,
+            seeds,
+        )
+    )
+    print(
+        benchmark(
+            "hill_climb",
+            lambda rng: hill_climb(
+                enc,
+                gen_key,
+                neighbours,
+                simple.decrypt,
+                quadgram_score,
+                restarts=10,
+                rng=rng,
+            ),
+            solved,
+            seeds,
+        )
+    )
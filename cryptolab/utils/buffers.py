@@ -0,0 +1,79 @@
+"""
+Helpers for the bytes-native cipher functions.
+
+The bytes functions of the ciphers take any bytes-like buffer and work on the
+ASCII letters A-Z and a-z directly, without decoding to `str`. Their `_into`
+variants write into a caller's buffer, so a bulk job can gather the output of
+many messages in one preallocated bytearray, mmap or memoryview.
+"""
+
+from mmap import mmap
+
+# A read-only input buffer
+Buffer = bytes | bytearray | memoryview | mmap
+
+# An output buffer that can be written in place
+WritableBuffer = bytearray | memoryview | mmap
+
+
+def as_bytes(data: Buffer) -> bytes | bytearray:
+    """
+    Get the data as an object with the bytes methods, e.g. translate.
+
+    Parameters
+    ----------
+    data : Buffer
+        The data.
+
+    Returns
+    -------
+    bytes | bytearray
+        The data itself if it is bytes or a bytearray. Other buffers are
+        copied once.
+
+    Examples
+    --------
+    >>> as_bytes(memoryview(b"abcdef")[1:4])
+    b'bcd'
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+
+    return bytes(data)
+
+
+def write_into(out: WritableBuffer, data: Buffer) -> int:
+    """
+    Write the data at the start of the output buffer.
+
+    Parameters
+    ----------
+    out : WritableBuffer
+        The buffer to write into. Use a memoryview slice to write elsewhere
+        than the start.
+
+    data : Buffer
+        The data to write.
+
+    Raises
+    ------
+    ValueError
+        If the output buffer is too small. Nothing is written.
+
+    Returns
+    -------
+    int
+        The number of bytes written.
+
+    Examples
+    --------
+    >>> out = bytearray(8)
+    >>> write_into(memoryview(out)[2:], b"abc"), out
+    (3, bytearray(b'\\x00\\x00abc\\x00\\x00\\x00'))
+    """
+    n = len(data)
+    if n > len(out):
+        raise ValueError(f"Output buffer is too small: {len(out)} < {n}")
+
+    out[:n] = data
+    return n
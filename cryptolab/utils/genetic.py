@@ -0,0 +1,328 @@
+"""
+https://en.wikipedia.org/wiki/Genetic_algorithm
+"""
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from random import Random
+from typing import TypeVar
+
+from cryptolab.utils.seeding import Seed, make_rng
+
+KeyType = TypeVar("KeyType")
+T = TypeVar("T")
+
+
+def order_crossover(a: Sequence[T], b: Sequence[T], rng: Random) -> list[T]:
+    """
+    Order crossover (OX1) of two permutations of the same elements.
+
+    A random slice of `a` is copied into the child in place, and the remaining
+    positions are filled with the missing elements in the order they appear
+    in `b`, starting after the slice. The child is always a permutation.
+
+    Parameters
+    ----------
+    a : Sequence[T]
+        The first parent permutation.
+
+    b : Sequence[T]
+        The second parent permutation.
+
+    rng : Random
+        Random number generator used to pick the slice.
+
+    Returns
+    -------
+    list[T]
+        The child permutation.
+
+    Raises
+    ------
+    ValueError
+        If the parents are of different lengths.
+    """
+    n = len(a)
+    if n != len(b):
+        raise ValueError("parents must be the same length")
+    if n < 2:
+        return list(a)
+
+    i = rng.randrange(n)
+    j = rng.randrange(i + 1, n + 1)
+
+    kept = set(a[i:j])
+    rest = [b[(j + k) % n] for k in range(n)]
+    fill = iter(x for x in rest if x not in kept)
+
+    child = list(a)
+    for k in range(n - (j - i)):
+        child[(j + k) % n] = next(fill)
+
+    return child
+
+
+def alphabet_crossover(a: str, b: str, rng: Random) -> str:
+    """
+    Order crossover of two alphabet keys, such as simple substitution keys.
+
+    Parameters
+    ----------
+    a : str
+        The first parent alphabet.
+
+    b : str
+        The second parent alphabet.
+
+    rng : Random
+        Random number generator used to pick the slice.
+
+    Returns
+    -------
+    str
+        The child alphabet.
+    """
+    return "".join(order_crossover(a, b, rng))
+
+
+def _fitness(
+    ciphertext: str,
+    decrypt: Callable[[str, KeyType], str | None],
+    score: Callable[[str], float],
+    key: KeyType,
+) -> tuple[float, str]:
+    """
+    Evaluate a single key. This is module level so it can be sent to worker
+    processes.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The ciphertext to decrypt.
+
+    decrypt : Callable[[str, KeyType], str | None]
+        The decryption function.
+
+    score : Callable[[str], float]
+        The scoring function.
+
+    key : KeyType
+        The key to evaluate.
+
+    Returns
+    -------
+    tuple[float, str]
+        The (score, text) of the key. Invalid keys score -inf.
+    """
+    if (text := decrypt(ciphertext, key)) is None:
+        return -float("inf"), ""
+    return score(text), text
+
+
+def evolve(
+    ciphertext: str,
+    key_gen: Callable[[Random], KeyType],
+    crossover: Callable[[KeyType, KeyType, Random], KeyType],
+    mutate: Callable[[KeyType, Random], KeyType],
+    decrypt: Callable[[str, KeyType], str | None],
+    score: Callable[[str], float],
+    *,
+    population: int = 100,
+    generations: int = 500,
+    elite: int = 2,
+    tournament: int = 3,
+    mutation_rate: float = 0.5,
+    patience: int = 50,
+    workers: int = 1,
+    rng: Seed = None,
+) -> tuple[str, KeyType]:
+    """
+    Perform a genetic search to optimize a decryption key for a ciphertext.
+
+    Each generation is evaluated as one batch, either in this process or
+    across a pool of `workers` processes. The next generation keeps the
+    `elite` best keys unchanged and fills the rest with children of parents
+    picked by tournament selection, crossed over and then mutated.
+
+    Parameters
+    ----------
+    ciphertext : str
+        The encrypted text to decrypt and evaluate.
+
+    key_gen : Callable[[Random], KeyType]
+        Function that returns a random key, used for the initial population.
+
+    crossover : Callable[[KeyType, KeyType, Random], KeyType]
+        Function that combines two parent keys into a child key, e.g.
+        alphabet_crossover, order_crossover or Board.crossover.
+
+    mutate : Callable[[KeyType, Random], KeyType]
+        Function that produces a small random modification of a given key.
+
+    decrypt : Callable[[str, KeyType], str | None]
+        Function that decrypts the ciphertext using the provided key. It may
+        return None to signal that the key cannot decrypt the ciphertext, in
+        which case the key scores -inf. Exceptions it raises are not caught
+        and stop the search, so a decrypt that fails on some keys should
+        return None for them instead, e.g. straddling_checkerboard.try_decrypt.
+
+    score : Callable[[str], float]
+        Function that evaluates the fitness or likelihood of a decrypted text.
+
+    population : int, default=100
+        Number of keys in each generation.
+
+    generations : int, default=500
+        Maximum number of generations.
+
+    elite : int, default=2
+        Number of best keys copied unchanged into the next generation.
+
+    tournament : int, default=3
+        Number of keys competing in each tournament selection.
+
+    mutation_rate : float, default=0.5
+        Probability that a child is mutated after crossover.
+
+    patience : int, default=50
+        Stop after this many generations without improving the best score.
+
+    workers : int, default=1
+        Number of processes used to evaluate each generation. With more than
+        one worker, the keys and the decrypt and score callables
+        must be picklable (e.g. module level functions or partials of them).
+        Evaluation is deterministic, so the result does not depend on it.
+
+    rng : int | Random | None, default=None
+        Random number generator, or a seed for one, used for every random
+        decision of the search. Passing the same seed reproduces a run.
+
+    Raises
+    ------
+    ValueError
+        If the tournament size is not between 1 and the population size, or
+        the number of elite keys is not between 0 and the population size.
+
+    Returns
+    -------
+    tuple[str, KeyType]
+        The best decrypted text and its corresponding key.
+    """
+    if not 1 <= tournament <= population:
+        raise ValueError(
+            f"tournament must be between 1 and the population size {population}"
+        )
+    if not 0 <= elite <= population:
+        raise ValueError(
+            f"elite must be between 0 and the population size {population}"
+        )
+
+    rng = make_rng(rng)
+    fitness = partial(_fitness, ciphertext, decrypt, score)
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    chunksize = max(1, population // (4 * workers))
+
+    def _evaluate(keys: list[KeyType]) -> list[tuple[float, str, KeyType]]:
+        """
+        Evaluate the new keys of a generation as one batch.
+
+        Parameters
+        ----------
+        keys : list[KeyType]
+            The keys to evaluate.
+
+        Returns
+        -------
+        list[tuple[float, str, KeyType]]
+            The (score, text, key) of each key, in order.
+        """
+        if pool is None:
+            results = map(fitness, keys)
+        else:
+            results = pool.map(fitness, keys, chunksize=chunksize)
+
+        return [(sc, text, key) for (sc, text), key in zip(results, keys)]
+
+    def _select(scored: list[tuple[float, str, KeyType]]) -> KeyType:
+        """
+        Tournament selection over a scored generation.
+
+        Parameters
+        ----------
+        scored : list[tuple[float, str, KeyType]]
+            The scored generation, best first.
+
+        Returns
+        -------
+        KeyType
+            The winning key.
+        """
+        return scored[min(rng.sample(range(len(scored)), tournament))][2]
+
+    try:
+        scored = _evaluate([key_gen(rng) for _ in range(population)])
+        scored.sort(key=lambda x: x[0], reverse=True)
+        best = scored[0]
+        stale = 0
+
+        for _ in range(generations):
+            children: list[KeyType] = []
+            while len(children) < population - elite:
+                child = crossover(_select(scored), _select(scored), rng)
+                if rng.random() < mutation_rate:
+                    child = mutate(child, rng)
+                children.append(child)
+
+            # the elite keep their scores, so only the children are evaluated
+            scored = scored[:elite] + _evaluate(children)
+            scored.sort(key=lambda x: x[0], reverse=True)
+
+            if scored[0][0] > best[0]:
+                best = scored[0]
+                stale = 0
+            elif (stale := stale + 1) >= patience:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return best[1], best[2]
+
+
+if __name__ == "__main__":
+    from string import ascii_uppercase
+
+    from cryptolab.scoring.ngram import quadgram_score
+    from cryptolab.substitution import simple
+    from cryptolab.utils.moves import random_swap, swap
+
+    plaintext = "Genetic algorithms are commonly used to generate high-quality solutions to optimization and search problems by relying on biologically inspired operators such as mutation, crossover and selection."
+
+    def gen_key(rng: Random) -> str:
+        key = list(ascii_uppercase)
+        rng.shuffle(key)
+        return "".join(key)
+
+    def mutate(key: str, rng: Random) -> str:
+        return "".join(swap(key, *random_swap(len(key), rng)))
+
+    key = gen_key(Random())
+
+    print(plaintext)
+    print(key, "\n")
+
+    enc = simple.encrypt(plaintext, key)
+    print(enc, "\n")
+
+    dec, bkey = evolve(
+        enc,
+        gen_key,
+        alphabet_crossover,
+        mutate,
+        simple.decrypt,
+        quadgram_score,
+    )
+
+    print(dec)
+    print(bkey)
@@ -2,22 +2,49 @@
 https://en.wikipedia.org/wiki/Hill_climbing
 """
 
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Hashable, Iterator
+from dataclasses import dataclass
+from random import Random
 from typing import TypeVar
 
+from cryptolab.utils.seeding import Seed, make_rng, spawn
+
 KeyType = TypeVar("KeyType")
 
 
+@dataclass
+class SearchStats:
+    """
+    Counters of a search, updated in place.
+
+    Parameters
+    ----------
+    evaluations : int
+        The number of keys decrypted, and scored if they decrypt.
+
+    duplicates : int
+        The number of keys skipped without decrypting or scoring, because an
+        equivalent key was already scored.
+    """
+
+    evaluations: int = 0
+    duplicates: int = 0
+
+
 def hill_climb(
     ciphertext: str,
-    gen_key: Callable[[], KeyType],
+    gen_key: Callable[[Random], KeyType],
     mutate: Callable[[KeyType], Iterator[KeyType]],
-    decrypt: Callable[[str, KeyType], str],
+    decrypt: Callable[[str, KeyType], str | None],
     score: Callable[[str], float],
     *,
+    copy: Callable[[KeyType], KeyType] | None = None,
+    canonical: Callable[[KeyType], Hashable] | None = None,
     restarts: int = 50,
     try_all: bool = False,
     iterations: int = 1_000,
+    rng: Seed = None,
+    stats: SearchStats | None = None,
 ) -> tuple[str, KeyType]:
     """
     Generic hill climb algorithm.
@@ -29,22 +56,41 @@ def hill_climb(
     ciphertext : str
         The ciphertext to decrypt.
 
-    gen_key : Callable[[], KeyType]
+    gen_key : Callable[[Random], KeyType]
         The function to generate a new key. This is used at the beginning of
-        each restart and should be random.
+        each restart and should be random, drawing from the given random
+        number generator.
 
     mutate : Callable[[KeyType], Iterator[KeyType]]
         A function to generate new keys from the current key. For steepest
         ascent, the generator should be exhaustable, otherwise the algorithm
         will run indefinitely. The algorithm becomes stochastic if the
-        generator is randomized in some way (e.g. random order combinations).
+        generator is randomized in some way (e.g. random order combinations),
+        in which case it should draw from its own seeded Random to keep runs
+        reproducible.
 
-    decrypt : Callable[[str, KeyType], str]
+    decrypt : Callable[[str, KeyType], str | None]
         The decryption function to decrypt the ciphertext with the new keys.
+        It may return None to signal that a key cannot decrypt the
+        ciphertext, in which case the key is skipped. Exceptions it raises are not caught
+        and stop the search, so a decrypt that fails on some keys should
+        return None for them instead, e.g. straddling_checkerboard.try_decrypt.
 
     score : Callable[[str], float]
         A scoring function to determine if a new key is a better key.
 
+    copy : Callable[[KeyType], KeyType] | None, default=None
+        If mutate changes the key in place and yields it once per move (e.g.
+        MutableBoard.mutate), a function to copy a key. Only keys that
+        improve the score are copied, so no key is allocated per neighbour.
+
+    canonical : Callable[[KeyType], Hashable] | None, default=None
+        A function giving equal values for equivalent keys, i.e. keys that
+        decrypt every ciphertext the same (e.g. MutableBoard.canonical). If
+        given, a key equivalent to one already scored in the same restart is
+        skipped. Such a key cannot improve on the current best, so the search
+        is unchanged, only cheaper.
+
     restarts : int,default=50
         Number of restarts to run of the algorithm. For random-restart hill
         climbing, this should be greater than 1.
@@ -58,44 +104,79 @@ def hill_climb(
         equivalent to the maximum number of times that mutate may be called.
         Exiting early is still possible if an iteration does not improve the
         overall score.
+
+    rng : int | Random | None, default=None
+        Random number generator, or a seed for one. Each restart draws from
+        its own independent stream derived from it, so passing the same seed
+        reproduces a run.
+
+    stats : SearchStats | None, default=None
+        If given, the number of keys scored and of duplicate keys skipped are
+        added to it.
     """
+    streams = spawn(make_rng(rng), max(1, restarts))
+    if stats is None:
+        stats = SearchStats()
 
-    def _single_restart(_: int) -> tuple[float, str, KeyType]:
+    def _decrypt(key: KeyType) -> str | None:
+        """
+        Decrypt the ciphertext with the key, counting the evaluation.
+
+        Parameters
+        ----------
+        key : KeyType
+            The key to decrypt with.
+
+        Returns
+        -------
+        str | None
+            The decrypted text, or None if the key cannot decrypt it.
+        """
+        stats.evaluations += 1
+        return decrypt(ciphertext, key)
+
+    def _single_restart(index: int) -> tuple[float, str, KeyType]:
         """
         Run a single restart of the hill climb algorithm.
 
         Parameters
         ----------
         index : int
-            The index of this restart. Unused.
+            The index of this restart, selecting its random stream.
 
         Returns
         -------
         tuple[float, str, KeyType]
             A tuple of the best (score, text, key) for this restart.
         """
-        key = gen_key()
+        stream = streams[index]
 
-        text = ""
-        while text == "":
-            try:
-                text = decrypt(ciphertext, key)
-            except Exception:
-                key = gen_key()
+        key = gen_key(stream)
+        while (text := _decrypt(key)) is None:
+            key = gen_key(stream)
 
         best = (score(text), text, key)
 
+        # the canonical forms of the keys tried in this restart
+        seen = set[Hashable]() if canonical is None else {canonical(key)}
+
         for _ in range(iterations):
             best_i = best
 
             for new_key in mutate(key):
-                try:
-                    text = decrypt(ciphertext, new_key)
-                    sc = score(text)
-                except Exception:
+                if canonical is not None:
+                    if (form := canonical(new_key)) in seen:
+                        stats.duplicates += 1
+                        continue
+                    seen.add(form)
+
+                if (text := _decrypt(new_key)) is None:
                     continue
 
+                sc = score(text)
                 if sc > best_i[0]:
+                    if copy is not None:
+                        new_key = copy(new_key)
                     best_i = (sc, text, new_key)
                     key = new_key
                     if not try_all:
@@ -119,11 +200,11 @@ def hill_climb(
 
 if __name__ == "__main__":
     from itertools import combinations
-    from random import shuffle
     from string import ascii_uppercase
 
     from cryptolab.scoring.ngram import quadgram_score
     from cryptolab.substitution import simple
+    from cryptolab.utils.moves import swap_neighbours
 
     plaintext = """In simple hill climbing, the first closer node is chosen,
     whereas in steepest ascent hill climbing all successors are compared and
@@ -136,12 +217,14 @@ if __name__ == "__main__":
     # make plaintext print ok
     plaintext = "\n".join(plaintext.split("\n    "))
 
-    def gen_key() -> str:
+    rng = Random(0)
+
+    def gen_key(rng: Random) -> str:
         alph = list(ascii_uppercase)
-        shuffle(alph)
+        rng.shuffle(alph)
         return "".join(alph)
 
-    key = gen_key()
+    key = gen_key(rng)
 
     print(plaintext, "\n")
     print(ascii_uppercase)
@@ -157,9 +240,8 @@ if __name__ == "__main__":
             yield "".join(alph)
 
     def stochastic_mutate(key: str) -> Iterator[str]:
-        keys = list(mutate(key))
-        shuffle(keys)
-        yield from keys
+        for alph in swap_neighbours(key, rng):
+            yield "".join(alph)
 
     for name, mut, kwargs in (
         ("simple", mutate, {"restarts": 1}),
@@ -175,6 +257,7 @@ if __name__ == "__main__":
             mut,
             simple.decrypt,
             quadgram_score,
+            rng=rng,
             **kwargs,  # type:ignore
         )
         print(f"{name}:")
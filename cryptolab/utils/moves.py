@@ -0,0 +1,445 @@
+"""
+Constant time random move samplers and lazy, randomized, exhaustive
+neighbourhood iterators for permutation keys.
+
+The samplers draw a move without materializing the set of possible moves,
+and the iterators visit every move exactly once in a random order without
+building or shuffling a list of neighbours.
+"""
+
+from collections.abc import Iterator, Sequence
+from math import comb, isqrt
+from random import Random
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def random_swap(n: int, rng: Random) -> tuple[int, int]:
+    """
+    Draw two distinct positions to swap, uniformly over all pairs.
+
+    Parameters
+    ----------
+    n : int
+        The length of the sequence. Must be at least 2.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    tuple[int, int]
+        The positions (i, j) with i < j.
+    """
+    i = rng.randrange(n)
+    j = rng.randrange(n - 1)
+    if j >= i:
+        j += 1
+    return (i, j) if i < j else (j, i)
+
+
+def random_reversal(n: int, rng: Random) -> tuple[int, int]:
+    """
+    Draw a slice to reverse, of at least two elements.
+
+    Parameters
+    ----------
+    n : int
+        The length of the sequence. Must be at least 2.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    tuple[int, int]
+        The slice bounds (i, j) such that seq[i:j] is reversed.
+    """
+    i, j = random_swap(n, rng)
+    return i, j + 1
+
+
+def random_rotation(n: int, rng: Random) -> int:
+    """
+    Draw a non-trivial rotation amount.
+
+    Parameters
+    ----------
+    n : int
+        The length of the sequence. Must be at least 2.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    int
+        The amount to rotate left by, in 1..n-1.
+    """
+    return rng.randrange(1, n)
+
+
+def random_column_move(n: int, rng: Random) -> tuple[int, int]:
+    """
+    Draw a single element move: take the element at one position and insert
+    it at another.
+
+    Parameters
+    ----------
+    n : int
+        The length of the sequence. Must be at least 2.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    tuple[int, int]
+        The source and destination positions, which are distinct.
+    """
+    i = rng.randrange(n)
+    j = rng.randrange(n - 1)
+    return i, j + 1 if j >= i else j
+
+
+def random_block_move(n: int, rng: Random) -> tuple[int, int, int]:
+    """
+    Draw a block move: take a slice and insert it elsewhere, which is the
+    same as exchanging two adjacent slices.
+
+    Parameters
+    ----------
+    n : int
+        The length of the sequence. Must be at least 2.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        The bounds (i, j, k) with i < j < k, such that seq[i:j] and seq[j:k]
+        are exchanged.
+    """
+    i, k = random_swap(n + 1, rng)
+    while k - i < 2:
+        i, k = random_swap(n + 1, rng)
+    return i, rng.randrange(i + 1, k), k
+
+
+def swap(seq: Sequence[T], i: int, j: int) -> list[T]:
+    """
+    Swap two elements.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The sequence.
+
+    i : int
+        The first position.
+
+    j : int
+        The second position.
+
+    Returns
+    -------
+    list[T]
+        A new list with the elements at i and j swapped.
+
+    Examples
+    --------
+    >>> swap("ABCD", 0, 2)
+    ['C', 'B', 'A', 'D']
+    """
+    out = list(seq)
+    out[i], out[j] = out[j], out[i]
+    return out
+
+
+def reverse(seq: Sequence[T], i: int, j: int) -> list[T]:
+    """
+    Reverse a slice.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The sequence.
+
+    i : int
+        The start of the slice.
+
+    j : int
+        The end of the slice, exclusive.
+
+    Returns
+    -------
+    list[T]
+        A new list with seq[i:j] reversed.
+
+    Examples
+    --------
+    >>> reverse("ABCDE", 1, 4)
+    ['A', 'D', 'C', 'B', 'E']
+    """
+    out = list(seq)
+    out[i:j] = out[i:j][::-1]
+    return out
+
+
+def rotate(seq: Sequence[T], k: int) -> list[T]:
+    """
+    Rotate left.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The sequence.
+
+    k : int
+        The amount to rotate by.
+
+    Returns
+    -------
+    list[T]
+        A new list rotated left by k.
+
+    Examples
+    --------
+    >>> rotate("ABCDE", 2)
+    ['C', 'D', 'E', 'A', 'B']
+    """
+    out = list(seq)
+    return out[k:] + out[:k]
+
+
+def move(seq: Sequence[T], i: int, j: int) -> list[T]:
+    """
+    Move one element to another position, shifting the ones in between.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The sequence.
+
+    i : int
+        The position of the element to move.
+
+    j : int
+        The position of the element after the move.
+
+    Returns
+    -------
+    list[T]
+        A new list with the element moved.
+
+    Examples
+    --------
+    >>> move("ABCDE", 0, 3)
+    ['B', 'C', 'D', 'A', 'E']
+    """
+    out = list(seq)
+    out.insert(j, out.pop(i))
+    return out
+
+
+def block_move(seq: Sequence[T], i: int, j: int, k: int) -> list[T]:
+    """
+    Exchange two adjacent slices.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The sequence.
+
+    i : int
+        The start of the first slice.
+
+    j : int
+        The end of the first slice and start of the second.
+
+    k : int
+        The end of the second slice, exclusive.
+
+    Returns
+    -------
+    list[T]
+        A new list with seq[i:j] and seq[j:k] exchanged.
+
+    Examples
+    --------
+    >>> block_move("ABCDEF", 1, 3, 5)
+    ['A', 'D', 'E', 'B', 'C', 'F']
+    """
+    out = list(seq)
+    out[i:k] = out[j:k] + out[i:j]
+    return out
+
+
+def shuffled_range(n: int, rng: Random) -> Iterator[int]:
+    """
+    Lazily iterate over range(n) in a uniformly random order.
+
+    This is a Fisher-Yates shuffle that only remembers the positions it has
+    displaced, in a dict, so stopping after k elements costs O(k) time and
+    memory rather than building the whole list of n elements.
+
+    Parameters
+    ----------
+    n : int
+        The size of the range.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    Iterator[int]
+        Every integer in range(n) exactly once.
+
+    Examples
+    --------
+    >>> sorted(shuffled_range(10, Random(0)))
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    """
+    displaced: dict[int, int] = {}
+    for i in range(n):
+        j = rng.randrange(i, n)
+        yield displaced.get(j, j)
+        displaced[j] = displaced.pop(i, i)
+
+
+def unrank_pair(k: int) -> tuple[int, int]:
+    """
+    Get the k-th pair (i, j) with i < j, in colexicographic order.
+
+    Parameters
+    ----------
+    k : int
+        The rank of the pair.
+
+    Returns
+    -------
+    tuple[int, int]
+        The pair.
+
+    Examples
+    --------
+    >>> [unrank_pair(k) for k in range(4)]
+    [(0, 1), (0, 2), (1, 2), (0, 3)]
+    """
+    j = (1 + isqrt(1 + 8 * k)) // 2
+    return k - j * (j - 1) // 2, j
+
+
+def random_pairs(n: int, rng: Random) -> Iterator[tuple[int, int]]:
+    """
+    Lazily iterate over every pair of distinct positions in a random order.
+
+    Parameters
+    ----------
+    n : int
+        The length of the sequence.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    Iterator[tuple[int, int]]
+        Every pair (i, j) with i < j exactly once.
+    """
+    return map(unrank_pair, shuffled_range(comb(n, 2), rng))
+
+
+def swap_neighbours(seq: Sequence[T], rng: Random) -> Iterator[list[T]]:
+    """
+    Lazily iterate over every single swap neighbour in a random order.
+
+    This is the stochastic hill climbing counterpart of iterating over
+    itertools.combinations of the positions.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The key to generate neighbours of.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    Iterator[list[T]]
+        Every swap neighbour exactly once.
+    """
+    for i, j in random_pairs(len(seq), rng):
+        yield swap(seq, i, j)
+
+
+def reversal_neighbours(seq: Sequence[T], rng: Random) -> Iterator[list[T]]:
+    """
+    Lazily iterate over every slice reversal neighbour in a random order.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The key to generate neighbours of.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    Iterator[list[T]]
+        Every reversal of a slice of at least two elements exactly once.
+    """
+    for i, j in random_pairs(len(seq), rng):
+        yield reverse(seq, i, j + 1)
+
+
+def rotation_neighbours(seq: Sequence[T], rng: Random) -> Iterator[list[T]]:
+    """
+    Lazily iterate over every non-trivial rotation in a random order.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The key to generate neighbours of.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    Iterator[list[T]]
+        Every rotation by 1..n-1 exactly once.
+    """
+    for k in shuffled_range(len(seq) - 1, rng):
+        yield rotate(seq, k + 1)
+
+
+def move_neighbours(seq: Sequence[T], rng: Random) -> Iterator[list[T]]:
+    """
+    Lazily iterate over every single element move in a random order.
+
+    Moves between adjacent positions are the same as swaps, so each such
+    neighbour is produced twice.
+
+    Parameters
+    ----------
+    seq : Sequence[T]
+        The key to generate neighbours of.
+
+    rng : Random
+        Random number generator to draw from.
+
+    Returns
+    -------
+    Iterator[list[T]]
+        Every move of one element to a different position.
+    """
+    n = len(seq)
+    for k in shuffled_range(n * (n - 1), rng):
+        i, j = divmod(k, n - 1)
+        yield move(seq, i, j + 1 if j >= i else j)
@@ -0,0 +1,370 @@
+"""
+https://en.wikipedia.org/wiki/Simulated_annealing#Annealing_schedule
+
+Cooling schedules for `anneal`. A schedule holds the current temperature and
+is told after every step whether the proposed key was accepted, so it can
+cool on a fixed plan or adapt to how the search is going.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from math import exp, log
+from statistics import fmean
+
+
+@dataclass
+class Schedule(ABC):
+    """
+    Base cooling schedule.
+
+    Parameters
+    ----------
+    temp : float
+        The current temperature.
+    """
+
+    temp: float
+
+    @property
+    def samples(self) -> int:
+        """
+        Number of score deltas the schedule wants sampled before the search
+        starts. See calibrate.
+
+        Returns
+        -------
+        int
+            The number of samples. 0 disables calibration.
+        """
+        return 0
+
+    def calibrate(self, deltas: list[float]) -> None:
+        """
+        Calibrate the schedule from the score deltas of random moves away
+        from the initial key.
+
+        Parameters
+        ----------
+        deltas : list[float]
+            The sampled score deltas (new score - current score).
+        """
+
+    @abstractmethod
+    def update(self, accepted: bool) -> None:
+        """
+        Advance the schedule by one step.
+
+        Parameters
+        ----------
+        accepted : bool
+            Whether the key proposed at this step was accepted.
+        """
+
+
+@dataclass
+class Geometric(Schedule):
+    """
+    Geometric cooling, T <- T * rate.
+
+    Parameters
+    ----------
+    temp : float, default=1000.0
+        The initial temperature.
+
+    rate : float, default=0.999
+        Multiplicative cooling rate applied each step.
+    """
+
+    temp: float = 1000.0
+    rate: float = 0.999
+
+    def update(self, accepted: bool) -> None:
+        self.temp *= self.rate
+
+
+@dataclass
+class Linear(Schedule):
+    """
+    Linear cooling, T <- T - decrement, reaching 0 after `steps` steps.
+
+    Parameters
+    ----------
+    temp : float, default=100.0
+        The initial temperature.
+
+    steps : int, default=100_000
+        The number of steps until the temperature reaches 0.
+    """
+
+    temp: float = 100.0
+    steps: int = 100_000
+    _decrement: float = field(init=False, default=0.0)
+
+    def __post_init__(self):
+        self._decrement = self.temp / self.steps
+
+    def update(self, accepted: bool) -> None:
+        self.temp = max(self.temp - self._decrement, 0.0)
+
+
+@dataclass
+class LundyMees(Schedule):
+    """
+    Lundy-Mees cooling, T <- T / (1 + beta * T). It cools fast while hot and
+    slowly once cold.
+
+    Parameters
+    ----------
+    temp : float, default=100.0
+        The initial temperature.
+
+    beta : float, default=1e-3
+        The cooling coefficient.
+    """
+
+    temp: float = 100.0
+    beta: float = 1e-3
+
+    def update(self, accepted: bool) -> None:
+        self.temp /= 1 + self.beta * self.temp
+
+
+@dataclass
+class Reheating(Schedule):
+    """
+    Wraps another schedule and reheats it when the search is stuck, i.e. when
+    no key was accepted for `patience` consecutive steps.
+
+    Parameters
+    ----------
+    schedule : Schedule
+        The schedule to wrap.
+
+    patience : int, default=1000
+        The number of steps without an accepted key before reheating.
+
+    factor : float, default=10.0
+        The temperature is multiplied by this factor when reheating.
+
+    reheats : int, default=3
+        The maximum number of times to reheat.
+    """
+
+    temp: float = field(init=False, default=0.0)
+    schedule: Schedule = field(default_factory=Geometric)
+    patience: int = 1000
+    factor: float = 10.0
+    reheats: int = 3
+    _stuck: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        self.temp = self.schedule.temp
+
+    @property
+    def samples(self) -> int:
+        return self.schedule.samples
+
+    def calibrate(self, deltas: list[float]) -> None:
+        self.schedule.calibrate(deltas)
+        self.temp = self.schedule.temp
+
+    def update(self, accepted: bool) -> None:
+        self.schedule.update(accepted)
+
+        self._stuck = 0 if accepted else self._stuck + 1
+        if self._stuck >= self.patience and self.reheats > 0:
+            self.schedule.temp *= self.factor
+            self.reheats -= 1
+            self._stuck = 0
+
+        self.temp = self.schedule.temp
+
+
+@dataclass
+class Adaptive(Schedule):
+    """
+    Adaptive cooling that needs no tuning to the score scale.
+
+    The initial temperature is set from sampled score deltas so that a typical
+    worse move is accepted with probability `initial_acceptance`. From then
+    on, every `window` steps the temperature is steered so the observed
+    acceptance ratio follows a target that decays geometrically from
+    `initial_acceptance` to `final_acceptance` over `steps` steps, after which
+    the temperature drops to 0 and the search stops.
+
+    Parameters
+    ----------
+    initial_acceptance : float, default=0.15
+        Acceptance probability of a typical worse move at the start.
+
+    final_acceptance : float, default=0.01
+        The target acceptance ratio at the end of the run.
+
+    steps : int, default=20_000
+        The number of steps of the run.
+
+    window : int, default=100
+        Number of steps between adjustments.
+
+    gain : float, default=5.0
+        How strongly each adjustment follows the acceptance ratio.
+
+    calibration : int, default=100
+        Number of score deltas to sample for the initial temperature.
+    """
+
+    temp: float = field(init=False, default=1.0)
+    initial_acceptance: float = 0.15
+    final_acceptance: float = 0.01
+    steps: int = 20_000
+    window: int = 100
+    gain: float = 5.0
+    calibration: int = 100
+    _step: int = field(init=False, default=0)
+    _accepted: int = field(init=False, default=0)
+
+    @property
+    def samples(self) -> int:
+        return self.calibration
+
+    def calibrate(self, deltas: list[float]) -> None:
+        worse = [-d for d in deltas if d < 0]
+        if worse:
+            self.temp = -fmean(worse) / log(self.initial_acceptance)
+
+    def update(self, accepted: bool) -> None:
+        self._accepted += accepted
+        self._step += 1
+
+        if self._step >= self.steps:
+            self.temp = 0.0
+        elif self._step % self.window == 0:
+            p0, p1 = self.initial_acceptance, self.final_acceptance
+            target = p0 * (p1 / p0) ** (self._step / self.steps)
+            ratio = self._accepted / self.window
+            self.temp *= exp(self.gain * (target - ratio))
+            self._accepted = 0
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+    from collections.abc import Callable
+    from functools import partial
+    from random import Random
+    from statistics import median
+    from string import ascii_uppercase
+    from typing import Any
+
+    from cryptolab.scoring.ngram import quadgram_score
+    from cryptolab.substitution import simple
+    from cryptolab.substitution import straddling_checkerboard as sc
+    from cryptolab.utils.anneal import anneal
+    from cryptolab.utils.moves import random_swap, swap
+
+    parser = ArgumentParser(
+        description="steps to the correct key for each schedule over fixed seeds"
+    )
+    parser.add_argument("-n", "--runs", type=int, default=10, help="number of seeds")
+    parser.add_argument(
+        "demos",
+        nargs="*",
+        default=["substitution", "checkerboard"],
+        help="demos to run",
+    )
+    ns = parser.parse_args()
+
+    schedules: dict[str, Callable[[], Schedule]] = {
+        "geometric": Geometric,
+        "linear": partial(Linear, 20.0, 20_000),
+        "lundy-mees": partial(LundyMees, 20.0, 5e-4),
+        "reheating": lambda: Reheating(Geometric(), patience=2000),
+        "adaptive": Adaptive,
+    }
+
+    def report(
+        name: str,
+        plaintext: str,
+        key_gen: Callable[[Random], Any],
+        mutate: Callable[[Any, Random], Any],
+        decrypt: Callable[[str, Any], str | None],
+        enc: str,
+    ):
+        print(f"{name}:")
+        for sched_name, make in schedules.items():
+            found: list[int] = []
+            total = 0
+            for seed in range(ns.runs):
+                steps = 0
+                first = 0
+
+                def score(text: str) -> float:
+                    nonlocal steps, first
+                    steps += 1
+                    if not first and text == plaintext:
+                        first = steps
+                    return quadgram_score(text)
+
+                anneal(
+                    enc,
+                    key_gen,
+                    mutate,
+                    decrypt,
+                    score,
+                    max_steps=50_000,
+                    schedule=make(),
+                    rng=seed,
+                )
+                total += steps
+                if first:
+                    found.append(first)
+
+            med = f"{median(found):.0f}" if found else "-"
+            print(
+                f"\t{sched_name:<12} solved {len(found)}/{ns.runs}"
+                f"  median steps to key {med:>6}"
+                f"  steps per solve {total / len(found) if found else float('inf'):>9.0f}"
+            )
+
+    # substitution demo, see cryptolab.utils.anneal
+    plaintext = "SIMULATEDANNEALINGISAPROBABILISTICTECHNIQUEFORAPPROXIMATINGTHEGLOBALOPTIMUMOFAGIVENFUNCTIONSPECIFICALLYITISAMETAHEURISTICTOAPPROXIMATEGLOBALOPTIMIZATIONINALARGESEARCHSPACEFORANOPTIMIZATIONPROBLEM"
+
+    def gen_key(rng: Random) -> str:
+        key = list(ascii_uppercase)
+        rng.shuffle(key)
+        return "".join(key)
+
+    def mutate(key: str, rng: Random) -> str:
+        return "".join(swap(key, *random_swap(len(key), rng)))
+
+    enc = simple.encrypt(plaintext, gen_key(Random("cryptolab")))
+    if "substitution" in ns.demos:
+        report("simple substitution", plaintext, gen_key, mutate, simple.decrypt, enc)
+
+    # checkerboard demo, see cryptolab.substitution.straddling_checkerboard.
+    # This is the second stage of its crack, which starts from the board
+    # found by the first stage, modelled here as the answer with 8 random
+    # mutations applied. The message is longer than the module's own demo,
+    # whose quadgram landscape traps every schedule short of the key.
+    plaintext = (
+        "INCASEYOUMANAGETOCRACKTHISTHEPRIVATEKEYSBELONGTOHALFANDBETTERHALFAND"
+        "THEYALSONEEDFUNDSTOLIVEANDTHEYWILLMEETYOUATTHEUSUALPLACEONMONDAYAT"
+        "NOONBRINGTHEPAPERS"
+    )
+    board = sc.Board(("1", "4"), keyword="FUBCDORA.LETHINGKYMVPS/JQZXW")
+    enc = sc.encrypt(plaintext, board)
+
+    def near_board(rng: Random) -> sc.Board:
+        out = board
+        for _ in range(8):
+            out = out.random_mutation(rng)
+        return out
+
+    if "checkerboard" in ns.demos:
+        report(
+            "straddling checkerboard",
+            plaintext,
+            near_board,
+            sc.Board.random_mutation,
+            sc.try_decrypt,
+            enc,
+        )
@@ -0,0 +1,83 @@
+"""
+Helpers for the chunked encrypt/decrypt streams of the ciphers.
+
+A stream takes its input either as an iterable of chunks or as a file object,
+which is read a fixed number of characters at a time, so arbitrarily large
+inputs are processed with constant memory.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import AnyStr, Protocol, TypeVar, runtime_checkable
+
+T_co = TypeVar("T_co", covariant=True)
+
+# Number of characters read from a file object at a time
+CHUNK_SIZE = 1 << 20
+
+
+@runtime_checkable
+class Readable(Protocol[T_co]):
+    """
+    A file object, or anything else with a read(size) method.
+    """
+
+    def read(self, size: int = -1, /) -> T_co: ...
+
+
+def read_chunks(file: Readable[AnyStr], size: int = CHUNK_SIZE) -> Iterator[AnyStr]:
+    """
+    Read a file object in chunks.
+
+    Parameters
+    ----------
+    file : Readable[AnyStr]
+        The file object to read, in text or binary mode.
+
+    size : int, default=CHUNK_SIZE
+        The maximum size of a chunk.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The chunks, until the end of the file.
+
+    Examples
+    --------
+    >>> from io import StringIO
+    >>> list(read_chunks(StringIO("abcdefg"), 3))
+    ['abc', 'def', 'g']
+    """
+    while chunk := file.read(size):
+        yield chunk
+
+
+def iter_chunks(
+    source: Iterable[AnyStr] | Readable[AnyStr], size: int = CHUNK_SIZE
+) -> Iterator[AnyStr]:
+    """
+    Iterate over the chunks of a stream input.
+
+    Parameters
+    ----------
+    source : Iterable[AnyStr] | Readable[AnyStr]
+        An iterable of chunks, or a file object which is read in chunks of
+        `size`. File objects are read in chunks rather than lines, so a file
+        without newlines is not loaded at once.
+
+    size : int, default=CHUNK_SIZE
+        The maximum size of a chunk read from a file object.
+
+    Returns
+    -------
+    Iterator[AnyStr]
+        The chunks.
+
+    Examples
+    --------
+    >>> list(iter_chunks(["ab", "cd"]))
+    ['ab', 'cd']
+    """
+    if isinstance(source, Readable):
+        return read_chunks(source, size)
+
+    return iter(source)
@@ -15,20 +15,11 @@ from cryptolab.substitution.straddling_checkerboard import (
 from cryptolab.substitution.straddling_checkerboard import (
     encrypt as sad_encrypt,
 )
-from cryptolab.transposition.columnar import (
-    decrypt as col_decrypt,
-)
-from cryptolab.transposition.columnar import (
-    encrypt as col_encrypt,
-)
-from cryptolab.transposition.disrupted import (
-    VIC,
-)
-from cryptolab.transposition.disrupted import (
-    decrypt as dis_decrypt,
-)
-from cryptolab.transposition.disrupted import (
-    encrypt as dis_encrypt,
+from cryptolab.transposition.chain import (
+    ColumnarStep,
+    DisruptedStep,
+    Step,
+    compile_chain,
 )
 from cryptolab.utils.sequencing import sequence
 
@@ -255,6 +246,27 @@ def inject_keygroup(ciphertext: str, date: date, keygroup: str) -> str:
     return "".join(groups)
 
 
+def _steps(trans_key1: list[int], trans_key2: list[int]) -> tuple[Step, ...]:
+    """
+    Get the transposition steps of the VIC algorithm, which are compiled into
+    one plan per message length.
+
+    Parameters
+    ----------
+    trans_key1 : list[int]
+        The columnar transposition key.
+
+    trans_key2 : list[int]
+        The disrupted transposition key.
+
+    Returns
+    -------
+    tuple[Step, ...]
+        The columnar step, then the disrupted step with the VIC fill.
+    """
+    return ColumnarStep(tuple(trans_key1)), DisruptedStep(tuple(trans_key2))
+
+
 def encrypt(
     plaintext: str,
     board: Board,
@@ -292,9 +304,7 @@ def encrypt(
 
     out = sad_encrypt(plaintext, board, digit_escape="triple")
     out += null_fill * (-len(out) % 5)
-    out = col_encrypt(trans_key1, out)
-    out = dis_encrypt(trans_key2, out, VIC)
-    return out
+    return compile_chain(_steps(trans_key1, trans_key2), len(out)).apply(out)
 
 
 def decrypt(
@@ -322,8 +332,8 @@ def decrypt(
     str
         The resultant plaintext.
     """
-    out = dis_decrypt(trans_key2, ciphertext, VIC)
-    out = col_decrypt(trans_key1, out)
+    chain = compile_chain(_steps(trans_key1, trans_key2), len(ciphertext))
+    out = chain.invert().apply(ciphertext)
     out = sad_decrypt(out, board, digit_escape="triple")
     return out
 